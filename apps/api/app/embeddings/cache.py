@@ -1,19 +1,97 @@
 import hashlib
 import json
-from typing import List
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
 
-from sqlalchemy import Column, Integer, String, Text, select
+import numpy as np
+from sqlalchemy import (
+    Column,
+    Float,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    bindparam,
+    inspect,
+    insert,
+    select,
+    text,
+)
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from ..db import Base, get_engine, get_session
-from .provider import get_embedding
+from ..lru import LRUCache
+from . import provider
+from .provider import get_embeddings
+
+logger = logging.getLogger(__name__)
+
+# Storage format for new rows: "float32" (default), "float16" or "int8".
+STORAGE_DTYPE = os.environ.get("EMBEDDING_CACHE_DTYPE", "float32").lower()
+
+_CODES = {"float32": "f4", "float16": "f2", "int8": "i1"}
+
+# Byte budget of the in-process tier in front of SQL (64 MiB by default).
+LRU_BYTES = int(os.environ.get("EMBEDDING_LRU_BYTES", str(64 * 1024 * 1024)))
+
+lru = LRUCache(LRU_BYTES)
+
+MIGRATIONS_PATH = Path(__file__).with_name("migrations")
+# kept apart from the application schema's alembic_version
+VERSION_TABLE = "embedding_cache_version"
+# the cache's table name before it moved off the application's ``embeddings``
+_LEGACY_TABLE = "embeddings"
+_LEGACY_COLUMNS = {"text_hash", "embedding"}
 
 
 class Embedding(Base):
-    __tablename__ = "embeddings"
+    """A cached vector; the schema is owned by the revisions in ``migrations/``."""
+
+    __tablename__ = "embedding_cache"
+    __table_args__ = (
+        Index("ix_embedding_cache_text_hash_model", "text_hash", "model", unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
-    text_hash = Column(String, unique=True, index=True, nullable=False)
-    embedding = Column(Text, nullable=False)
+    text_hash = Column(String, nullable=False)
+    # provider.model_name() of the vector; hashes repeat across models
+    model = Column(String, nullable=False)
+    # legacy JSON payload; emptied once a row is migrated to ``vector``
+    embedding = Column(Text, nullable=False, default="")
+    vector = Column(LargeBinary, nullable=True)
+    dtype = Column(String(2), nullable=True)
+    scale = Column(Float, nullable=True)
+
+
+_engine = None
+_initialized: Set[str] = set()
+
+
+def encode_vector(
+    vec, dtype: Optional[str] = None
+) -> Tuple[bytes, str, Optional[float]]:
+    """Pack ``vec`` as little-endian bytes; int8 rows carry a per-vector scale."""
+    code = _CODES[dtype or STORAGE_DTYPE]
+    arr = np.asarray(vec, dtype="<f4")
+    if code == "i1":
+        peak = float(np.abs(arr).max()) if arr.size else 0.0
+        scale = peak / 127.0 or 1.0
+        return np.round(arr / scale).astype("i1").tobytes(), code, scale
+    return arr.astype("<" + code).tobytes(), code, None
+
+
+def decode_vector(blob: bytes, code: str, scale: Optional[float]) -> np.ndarray:
+    """Unpack a stored vector; float32 rows are a zero-copy view of ``blob``."""
+    if code == "f4":
+        return np.frombuffer(blob, dtype="<f4")
+    if code == "f2":
+        return np.frombuffer(blob, dtype="<f2").astype(np.float32)
+    if code == "i1":
+        return np.frombuffer(blob, dtype="i1").astype(np.float32) * np.float32(scale)
+    raise ValueError(f"Unknown embedding dtype: {code}")
 
 
 def chunk_text(text: str, max_tokens: int = 700) -> List[str]:
@@ -22,21 +100,168 @@ def chunk_text(text: str, max_tokens: int = 700) -> List[str]:
     return chunks or [""]
 
 
-def embed_text(text: str, engine=None) -> List[List[float]]:
-    engine = engine or get_engine()
-    Base.metadata.create_all(bind=engine)
+def _adopt_legacy_table(conn) -> None:
+    """Rename a cache table created as ``embeddings`` to the cache's own name.
+
+    Only a table with the cache's columns is taken; the application's
+    document ``embeddings`` table has neither.
+    """
+    insp = inspect(conn)
+    tables = insp.get_table_names()
+    if _LEGACY_TABLE not in tables or Embedding.__tablename__ in tables:
+        return
+    if not _LEGACY_COLUMNS <= {c["name"] for c in insp.get_columns(_LEGACY_TABLE)}:
+        return
+    indexes = insp.get_indexes(_LEGACY_TABLE)
+    table = Embedding.__tablename__
+    conn.execute(text(f"ALTER TABLE {_LEGACY_TABLE} RENAME TO {table}"))
+    for ix in indexes:
+        name = ix["name"].replace("ix_embeddings_", "ix_embedding_cache_", 1)
+        unique = "UNIQUE " if ix["unique"] else ""
+        conn.execute(text(f"DROP INDEX {ix['name']}"))
+        conn.execute(
+            text(f"CREATE {unique}INDEX {name} ON {table} ({', '.join(ix['column_names'])})")
+        )
+
+
+def _migrate(engine) -> None:
+    """Bring the cache schema to the latest revision under ``migrations/``.
+
+    Tables created before the cache had revisions are stamped with the
+    latest revision their columns match.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_PATH))
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        config.attributes["version_table"] = VERSION_TABLE
+        config.attributes["model"] = provider.model_name()
+        _adopt_legacy_table(conn)
+        insp = inspect(conn)
+        tables = insp.get_table_names()
+        if Embedding.__tablename__ in tables and VERSION_TABLE not in tables:
+            columns = {c["name"] for c in insp.get_columns(Embedding.__tablename__)}
+            if "model" in columns:
+                revision = "0003_model_key"
+            elif "vector" in columns:
+                revision = "0002_binary_vectors"
+            else:
+                revision = "0001_embeddings_cache"
+            command.stamp(config, revision)
+        command.upgrade(config, "head")
+
+
+def init_db(engine=None):
+    """Migrate the cache schema once per engine; safe to call at every startup."""
+    engine = engine or _default_engine()
+    key = str(engine.url)
+    if key not in _initialized:
+        _migrate(engine)
+        _initialized.add(key)
+    return engine
+
+
+def _default_engine():
+    global _engine
+    if _engine is None:
+        _engine = get_engine()
+    return _engine
+
+
+def embed_texts(texts: List[str], engine=None) -> List[np.ndarray]:
+    """Embed ``texts`` through the in-process LRU, then SQL, then the provider."""
+    model = provider.model_name()
+    digests = [hashlib.sha256(t.encode("utf-8")).hexdigest() for t in texts]
+    found: Dict[str, np.ndarray] = {}
+    for digest in set(digests):
+        vec = lru.get((digest, model))
+        if vec is not None:
+            found[digest] = vec
+    pending = {d: t for d, t in zip(digests, texts) if d not in found}
+    if pending:
+        try:
+            fetched = _embed_sql(pending, model, engine)
+        except SQLAlchemyError:
+            # the SQL tier only saves provider calls; keep working without it
+            logger.warning("embedding cache database unavailable", exc_info=True)
+            embs = get_embeddings(list(pending.values()))
+            fetched = {d: np.asarray(e, dtype=np.float32) for d, e in zip(pending, embs)}
+        for digest, vec in fetched.items():
+            vec.setflags(write=False)
+            lru.put((digest, model), vec)
+            found[digest] = vec
+    return [found[d] for d in digests]
+
+
+def embed_text(text: str, engine=None) -> List[np.ndarray]:
+    return embed_texts(chunk_text(text), engine=engine)
+
+
+def _embed_sql(pending: Dict[str, str], model: str, engine=None) -> Dict[str, np.ndarray]:
+    engine = init_db(engine)
     session = get_session(engine)
+    try:
+        rows = session.execute(
+            select(
+                Embedding.id,
+                Embedding.text_hash,
+                Embedding.vector,
+                Embedding.dtype,
+                Embedding.scale,
+                Embedding.embedding,
+            ).where(Embedding.model == model, Embedding.text_hash.in_(list(pending)))
+        ).all()
+        found: Dict[str, np.ndarray] = {}
+        legacy: List[Dict[str, object]] = []
+        for row_id, digest, blob, code, scale, payload in rows:
+            if blob is None:
+                blob, code, scale = encode_vector(json.loads(payload))
+                legacy.append(
+                    {"row_id": row_id, "b_vector": blob, "b_dtype": code, "b_scale": scale}
+                )
+            found[digest] = decode_vector(blob, code, scale)
+
+        table = Embedding.__table__
+        if legacy:
+            # committed on its own so a conflicting insert below cannot roll it back
+            session.execute(
+                table.update()
+                .where(table.c.id == bindparam("row_id"))
+                .values(
+                    vector=bindparam("b_vector"),
+                    dtype=bindparam("b_dtype"),
+                    scale=bindparam("b_scale"),
+                    embedding="",
+                ),
+                legacy,
+            )
+            session.commit()
 
-    results: List[List[float]] = []
-    for chunk in chunk_text(text):
-        digest = hashlib.sha256(chunk.encode("utf-8")).hexdigest()
-        record = session.execute(select(Embedding).where(Embedding.text_hash == digest)).scalar_one_or_none()
-        if record:
-            results.append(json.loads(record.embedding))
-            continue
-        emb = get_embedding(chunk)
-        session.add(Embedding(text_hash=digest, embedding=json.dumps(emb)))
-        session.commit()
-        results.append(emb)
-    session.close()
-    return results
+        missing = {d: t for d, t in pending.items() if d not in found}
+        if missing:
+            embs = get_embeddings(list(missing.values()))
+            records = []
+            for digest, emb in zip(missing, embs):
+                blob, code, scale = encode_vector(emb)
+                records.append(
+                    {
+                        "text_hash": digest,
+                        "model": model,
+                        "vector": blob,
+                        "dtype": code,
+                        "scale": scale,
+                    }
+                )
+                found[digest] = decode_vector(blob, code, scale)
+            try:
+                session.execute(insert(table), records)
+                session.commit()
+            except IntegrityError:
+                # another worker cached the same chunk first; its row is as good as ours
+                session.rollback()
+    finally:
+        session.close()
+    return found
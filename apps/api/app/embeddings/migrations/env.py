@@ -0,0 +1,20 @@
+"""Migration environment for the embedding cache.
+
+The cache can live in its own database (SQLite by default), so its schema
+has its own revision history and version table. ``cache.init_db`` runs it
+on the engine it is given, passing the connection and version table name in
+``config.attributes``.
+"""
+
+from alembic import context
+
+attributes = context.config.attributes
+# batch mode rebuilds tables where SQLite cannot ALTER them in place
+context.configure(
+    connection=attributes["connection"],
+    version_table=attributes["version_table"],
+    render_as_batch=True,
+)
+
+with context.begin_transaction():
+    context.run_migrations()
@@ -0,0 +1,27 @@
+"""embedding cache with JSON payloads
+
+Revision ID: 0001_embeddings_cache
+Revises:
+Create Date: 2024-06-01
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001_embeddings_cache"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "embedding_cache",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("text_hash", sa.String, nullable=False),
+        sa.Column("embedding", sa.Text, nullable=False),
+    )
+    op.create_index("ix_embedding_cache_text_hash", "embedding_cache", ["text_hash"], unique=True)
+
+def downgrade() -> None:
+    op.drop_index("ix_embedding_cache_text_hash", table_name="embedding_cache")
+    op.drop_table("embedding_cache")
@@ -0,0 +1,26 @@
+"""packed binary vectors
+
+Revision ID: 0002_binary_vectors
+Revises: 0001_embeddings_cache
+Create Date: 2024-07-01
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_binary_vectors"
+down_revision = "0001_embeddings_cache"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    with op.batch_alter_table("embedding_cache") as batch:
+        batch.add_column(sa.Column("vector", sa.LargeBinary, nullable=True))
+        batch.add_column(sa.Column("dtype", sa.String(2), nullable=True))
+        batch.add_column(sa.Column("scale", sa.Float, nullable=True))
+
+def downgrade() -> None:
+    with op.batch_alter_table("embedding_cache") as batch:
+        batch.drop_column("scale")
+        batch.drop_column("dtype")
+        batch.drop_column("vector")
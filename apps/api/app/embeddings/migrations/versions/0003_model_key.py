@@ -0,0 +1,45 @@
+"""key cached vectors by text hash and model
+
+Existing rows carry no model. They are attributed to the model the cache
+is migrated under (``config.attributes["model"]``), which is the one that
+wrote them unless the provider was switched before this revision; without
+that attribute they are dropped.
+
+Revision ID: 0003_model_key
+Revises: 0002_binary_vectors
+Create Date: 2024-07-15
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0003_model_key"
+down_revision = "0002_binary_vectors"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    model = context.config.attributes.get("model")
+    if model is None:
+        op.execute("DELETE FROM embedding_cache")
+    indexes = {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes("embedding_cache")}
+    with op.batch_alter_table("embedding_cache") as batch:
+        batch.add_column(
+            sa.Column("model", sa.String, nullable=False, server_default=model or "")
+        )
+        if "ix_embedding_cache_text_hash" in indexes:
+            batch.drop_index("ix_embedding_cache_text_hash")
+        batch.create_index("ix_embedding_cache_text_hash_model", ["text_hash", "model"], unique=True)
+    with op.batch_alter_table("embedding_cache") as batch:
+        batch.alter_column("model", server_default=None)
+
+def downgrade() -> None:
+    with op.batch_alter_table("embedding_cache") as batch:
+        batch.drop_index("ix_embedding_cache_text_hash_model")
+        batch.drop_column("model")
+    # one row per text hash again; keep the oldest
+    op.execute(
+        "DELETE FROM embedding_cache WHERE id NOT IN (SELECT MIN(id) FROM embedding_cache GROUP BY text_hash)"
+    )
+    with op.batch_alter_table("embedding_cache") as batch:
+        batch.create_index("ix_embedding_cache_text_hash", ["text_hash"], unique=True)
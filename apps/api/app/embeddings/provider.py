@@ -1,36 +1,92 @@
 import os
 import time
-from typing import List
+from typing import Iterator, List
 
 PROVIDER = os.environ.get("EMBEDDING_PROVIDER", "openai").lower()
 
+OPENAI_MODEL = "text-embedding-3-small"
+LOCAL_MODEL = "all-MiniLM-L6-v2"
 
-def _openai_embedding(text: str) -> List[float]:
-    from openai import OpenAI, APIError, RateLimitError
+# OpenAI rejects requests with more than 2048 inputs or ~300k tokens in total.
+OPENAI_MAX_INPUTS = 2048
+OPENAI_MAX_TOKENS = 300_000
 
-    client = OpenAI()
-    for attempt in range(3):
-        try:
-            resp = client.embeddings.create(model="text-embedding-3-small", input=text)
-            return resp.data[0].embedding
-        except (RateLimitError, APIError):
-            time.sleep(2 ** attempt)
-    raise RuntimeError("Failed to obtain embedding from OpenAI")
+_client = None
+
+
+def _get_client():
+    global _client
+    if _client is None:
+        from openai import OpenAI
+
+        _client = OpenAI()
+    return _client
+
+
+def _approx_tokens(text: str) -> int:
+    # ~4 characters per token for English; errs on the large side for safety
+    return len(text) // 3 + 1
+
+
+def _openai_batches(texts: List[str]) -> Iterator[List[str]]:
+    batch: List[str] = []
+    tokens = 0
+    for text in texts:
+        cost = _approx_tokens(text)
+        if batch and (len(batch) >= OPENAI_MAX_INPUTS or tokens + cost > OPENAI_MAX_TOKENS):
+            yield batch
+            batch, tokens = [], 0
+        batch.append(text)
+        tokens += cost
+    if batch:
+        yield batch
+
+
+def _openai_embeddings(texts: List[str]) -> List[List[float]]:
+    from openai import APIError, RateLimitError
+
+    client = _get_client()
+    out: List[List[float]] = []
+    for batch in _openai_batches(texts):
+        for attempt in range(3):
+            try:
+                resp = client.embeddings.create(model=OPENAI_MODEL, input=batch)
+                break
+            except (RateLimitError, APIError):
+                time.sleep(2 ** attempt)
+        else:
+            raise RuntimeError("Failed to obtain embedding from OpenAI")
+        out.extend(d.embedding for d in sorted(resp.data, key=lambda d: d.index))
+    return out
 
 
 _local_model = None
 
 
-def _local_embedding(text: str) -> List[float]:
+def _local_embeddings(texts: List[str]) -> List[List[float]]:
     global _local_model
     if _local_model is None:
         from sentence_transformers import SentenceTransformer
 
-        _local_model = SentenceTransformer("all-MiniLM-L6-v2")
-    return _local_model.encode([text])[0].tolist()
+        _local_model = SentenceTransformer(LOCAL_MODEL)
+    return _local_model.encode(texts).tolist()
 
 
-def get_embedding(text: str) -> List[float]:
+def model_name() -> str:
+    """Identify the provider and model so cached vectors never mix spaces."""
+    if PROVIDER == "local":
+        return f"local:{LOCAL_MODEL}"
+    return f"openai:{OPENAI_MODEL}"
+
+
+def get_embeddings(texts: List[str]) -> List[List[float]]:
+    """Embed ``texts`` in as few provider calls as possible, preserving order."""
+    if not texts:
+        return []
     if PROVIDER == "local":
-        return _local_embedding(text)
-    return _openai_embedding(text)
+        return _local_embeddings(list(texts))
+    return _openai_embeddings(list(texts))
+
+
+def get_embedding(text: str) -> List[float]:
+    return get_embeddings([text])[0]
@@ -1,27 +1,59 @@
+import asyncio
 import itertools
 import logging
 import os
-import threading
 import time
-from collections import defaultdict
-from pathlib import Path
-from typing import Any, Dict, Iterable
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import Any, Dict, List
 
-import yaml
-from fastapi import Body, FastAPI, Header, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from . import workers
 from .config import settings
+from .embeddings import cache as embedding_cache
 from .llm.rewrites import get_model_usage, suggest_rewrites
+from .parsing.cache import job_key, parse_cache
+from .parsing.fetch import JobFetcher, extract_text
 from .parsing.job_parser import parse_job
 from .parsing.resume_parser import parse_resume
-from .schemas import DocumentResponse, MatchRequest, MatchResponse, ParseJobRequest
-from .scoring import engine, explain, vectors
+from .parsing.upload import Upload, UploadError, receive_upload
+from .schemas import (
+    BatchMatchRequest,
+    BatchMatchResponse,
+    DocumentResponse,
+    MatchRequest,
+    MatchResponse,
+    ParseJobRequest,
+    RecommendRequest,
+    RecommendResponse,
+)
+from .scoring import batch, explain, features
+from .scoring.features import Features
+from .scoring.job_index import JobIndex
+from .store import Document, DocumentStore
+from .taxonomy import embedding_index
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # migrate the embedding cache schema before serving, so errors surface here
+    await asyncio.to_thread(embedding_cache.init_db)
+    # build a missing taxonomy embedding index now, not on the first unmatched skill
+    await asyncio.to_thread(embedding_index.startup_check)
+    yield
+    _STORE.close()
+    await fetcher.aclose()
+    workers.shutdown()
+    parse_cache.close()
+
+
+app = FastAPI(lifespan=lifespan)
 app.state.settings = settings
 
 allowed = os.getenv(
@@ -35,40 +67,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-_RESUMES: Dict[int, Dict[str, Any]] = {}
-_JOBS: Dict[int, Dict[str, Any]] = {}
-_MATCHES: Dict[int, Dict[str, Any]] = {}
-_DOC_OWNERS: Dict[int, str] = {}
 _counter = itertools.count(1)
+_JOB_INDEX = JobIndex()
+# documents kept without X-Consent-Save are dropped this long after use
+UNSAVED_TTL = float(os.getenv("UNSAVED_DOC_TTL", "600"))
+
+
+def _on_remove(doc_id: int, doc: Document) -> None:
+    if doc.kind == "job":
+        _JOB_INDEX.remove(doc_id)
+    if doc.key is not None:
+        parse_cache.release(doc.key, doc.owner)
 
-# load taxonomy mapping
-_SKILL_CLUSTER: Dict[str, str] = {}
-_data_path = Path(__file__).resolve().parent / "taxonomy" / "skills.yaml"
-if _data_path.exists():
-    data = yaml.safe_load(_data_path.read_text())
-    for cluster, skills in data.items():
-        for item in skills:
-            name = item["name"].lower()
-            _SKILL_CLUSTER[name] = cluster
-            for alias in item.get("aliases", []):
-                _SKILL_CLUSTER[alias.lower()] = cluster
-
-
-def _cluster_map(job_vec: Dict[str, float], resume_vec: Dict[str, float]):
-    clusters: Dict[str, Dict[str, Any]] = defaultdict(
-        lambda: {"job": {}, "resume": {}, "weight": 0.0}
-    )
-    for skill, w in job_vec.items():
-        cl = _SKILL_CLUSTER.get(skill.lower(), "Other")
-        clusters[cl]["job"][skill] = w
-        clusters[cl]["weight"] += w
-    for skill, w in resume_vec.items():
-        cl = _SKILL_CLUSTER.get(skill.lower(), "Other")
-        clusters[cl]["resume"][skill] = w
-    total = sum(job_vec.values()) or 1.0
-    for c in clusters.values():
-        c["weight"] = c["weight"] / total
-    return clusters
+
+_STORE = DocumentStore(on_remove=_on_remove)
+fetcher = JobFetcher(extract=lambda html: workers.parse_pool.run(extract_text, html))
+MAX_BATCH = 2000
 
 
 def _score_bucket(score: float) -> str:
@@ -81,25 +95,67 @@ def _score_bucket(score: float) -> str:
     return "0.75-1.0"
 
 
+@app.exception_handler(workers.Overloaded)
+async def overloaded_handler(request: Request, exc: workers.Overloaded):
+    logger.warning("rejecting request: %s", exc)
+    return JSONResponse(
+        status_code=503, content={"detail": "Server busy"}, headers={"Retry-After": "1"}
+    )
+
+
+@app.exception_handler(workers.WorkerCrashed)
+async def worker_crashed_handler(request: Request, exc: workers.WorkerCrashed):
+    logger.error("parser crashed on %s: %s", request.url.path, exc)
+    return JSONResponse(status_code=422, content={"detail": "Could not parse document"})
+
+
 @app.get("/healthz")
 async def healthz():
-    return {"status": "ok"}
+    return {"status": "ok", "queues": workers.stats()}
+
+
+async def _parse_upload(upload: Upload) -> Dict[str, Any]:
+    try:
+        return await workers.parse_pool.run(parse_resume, upload.path, upload.filename)
+    finally:
+        upload.close()
 
 
 @app.post("/v1/parse/resume", response_model=DocumentResponse)
 async def parse_resume_ep(
-    data: bytes = Body(...), x_client_id: str = Header(..., alias="X-Client-Id")
+    request: Request,
+    x_client_id: str = Header(..., alias="X-Client-Id"),
+    consent_save: bool = Header(False, alias="X-Consent-Save"),
 ):
-    if len(data) > 2_000_000:
-        raise HTTPException(status_code=400, detail="File too large")
     try:
-        parsed = parse_resume(data, "resume.pdf")
+        upload = await receive_upload(request)
+    except UploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    started = []
+
+    def parse():
+        # the parse task owns the spooled file now; it can outlive this request
+        started.append(True)
+        return _parse_upload(upload)
+
+    try:
+        # resumes reach the persistent cache tier only with consent
+        parsed = await parse_cache.get_or_parse(
+            upload.key, parse, owner=x_client_id, persist=consent_save
+        )
+    except (workers.Overloaded, workers.WorkerCrashed):
+        raise
     except Exception as e:  # pragma: no cover - defensive
         logger.exception("resume parse failed")
         raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        if not started:
+            upload.close()
+    resume_features = await workers.score_pool.run(
+        features.resume_features, parsed, reference=date.today()
+    )
     doc_id = next(_counter)
-    _RESUMES[doc_id] = parsed
-    _DOC_OWNERS[doc_id] = x_client_id
+    _STORE.add(doc_id, "resume", parsed, x_client_id, resume_features, key=upload.key)
     return {"doc_id": doc_id, "data": parsed}
 
 
@@ -110,26 +166,29 @@ async def parse_job_ep(
     if len(req.source) > 1_000_000:
         raise HTTPException(status_code=400, detail="Input too large")
     try:
-        parsed = parse_job(req.source)
+        source = req.source
+        if source.strip().startswith("http"):
+            source = await fetcher.fetch_text(source.strip())
+        parsed = await parse_cache.get_or_parse(
+            job_key(source), lambda: workers.parse_pool.run(parse_job, source, fetch=False)
+        )
+    except (workers.Overloaded, workers.WorkerCrashed):
+        raise
     except Exception as e:  # pragma: no cover - defensive
         logger.exception("job parse failed")
         raise HTTPException(status_code=400, detail=str(e))
+    job_features = await workers.score_pool.run(features.job_features, parsed)
     doc_id = next(_counter)
-    _JOBS[doc_id] = parsed
-    _DOC_OWNERS[doc_id] = x_client_id
+    _JOB_INDEX.add(doc_id, job_features.vector, job_features.required)
+    _STORE.add(doc_id, "job", parsed, x_client_id, job_features)
     return {"doc_id": doc_id, "data": parsed}
 
 
-def _schedule_delete(doc_ids: Iterable[int]) -> None:
-    def _worker():
-        time.sleep(600)
-        for doc_id in doc_ids:
-            _RESUMES.pop(doc_id, None)
-            _JOBS.pop(doc_id, None)
-            _MATCHES.pop(doc_id, None)
-            _DOC_OWNERS.pop(doc_id, None)
-
-    threading.Thread(target=_worker, daemon=True).start()
+def _explain_match(resume: Features, job: Features):
+    result = features.run(resume, job)
+    return result.score, explain.render(
+        result, resume.evidence, labels=features.labels(resume, job)
+    )
 
 
 @app.post("/v1/match", response_model=MatchResponse)
@@ -141,38 +200,13 @@ async def match_ep(
     start = time.time()
     if settings.analytics_enabled:
         logger.info("match_requested")
-    resume = _RESUMES.get(req.resume_doc_id)
-    job = _JOBS.get(req.job_doc_id)
+    resume = _STORE.get(req.resume_doc_id, "resume")
+    job = _STORE.get(req.job_doc_id, "job")
     if not resume or not job:
         raise HTTPException(status_code=404, detail="Documents not found")
 
-    resume_instances = [{"name": s} for s in resume.get("skills", [])]
-    posting_text = (
-        job.get("title", "")
-        + "\n"
-        + "\n".join(
-            job.get("responsibilities", [])
-            + job.get("required_skills", [])
-            + job.get("preferred_skills", [])
-        )
-    )
-    job_vec, resume_vec, evidence = vectors.build_vectors(
-        posting_text,
-        job.get("required_skills", []),
-        job.get("preferred_skills", []),
-        resume_instances,
-    )
-    clusters = _cluster_map(job_vec, resume_vec)
-    score, terms = engine.score_pair(
-        resume_vec, job_vec, job.get("required_skills", []), 0.0, clusters
-    )
-    explanation = explain.build_explanation(
-        job_vec,
-        resume_vec,
-        job.get("required_skills", []),
-        (score, terms),
-        evidence,
-        clusters,
+    score, explanation = await workers.score_pool.run(
+        _explain_match, resume.features, job.features
     )
     bullets = []
     rewrites = suggest_rewrites(
@@ -180,10 +214,9 @@ async def match_ep(
     )
     explanation["rewrites"] = rewrites
     doc_id = next(_counter)
-    _MATCHES[doc_id] = explanation
-    _DOC_OWNERS[doc_id] = x_client_id
+    _STORE.add(doc_id, "match", explanation, x_client_id)
     if not consent_save:
-        _schedule_delete([req.resume_doc_id, req.job_doc_id, doc_id])
+        _STORE.expire([req.resume_doc_id, req.job_doc_id, doc_id], UNSAVED_TTL)
     if settings.analytics_enabled:
         bucket = _score_bucket(score)
         duration = time.time() - start
@@ -196,14 +229,109 @@ async def match_ep(
     return explanation
 
 
+def _score_batch(
+    resumes: List[int],
+    resume_feats: List[Features],
+    jobs: List[int],
+    job_feats: List[Features],
+    with_explanations: bool,
+) -> List[Dict[str, Any]]:
+    scores = batch.score_many(
+        [f.vector for f in resume_feats],
+        [f.vector for f in job_feats],
+        [f.required for f in job_feats],
+    )
+
+    rows: List[Dict[str, Any]] = []
+    for ri, resume_id in enumerate(resumes):
+        for ji, job_id in enumerate(jobs):
+            score = float(scores.score[ri, ji])
+            row: Dict[str, Any] = {
+                "resume_doc_id": resume_id,
+                "job_doc_id": job_id,
+                "score": score,
+                "label": explain._label(score),
+            }
+            if with_explanations:
+                result = features.run(resume_feats[ri], job_feats[ji])
+                row["explanation"] = explain.render(
+                    result,
+                    resume_feats[ri].evidence,
+                    labels=features.labels(resume_feats[ri], job_feats[ji]),
+                )
+            rows.append(row)
+    rows.sort(key=lambda r: r["score"], reverse=True)
+    return rows
+
+
+@app.post("/v1/match/batch", response_model=BatchMatchResponse)
+async def match_batch_ep(
+    req: BatchMatchRequest,
+    x_client_id: str = Header(..., alias="X-Client-Id"),
+    consent_save: bool = Header(False, alias="X-Consent-Save"),
+):
+    if (req.resume_doc_id is None) == (req.job_doc_id is None):
+        raise HTTPException(
+            status_code=400, detail="Provide exactly one of resume_doc_id or job_doc_id"
+        )
+    if req.resume_doc_id is not None:
+        resume_ids, job_ids = [req.resume_doc_id], list(req.job_doc_ids)
+    else:
+        resume_ids, job_ids = list(req.resume_doc_ids), [req.job_doc_id]
+    if len(resume_ids) * len(job_ids) > MAX_BATCH:
+        raise HTTPException(status_code=400, detail="Batch too large")
+
+    start = time.time()
+    resume_docs = {i: _STORE.get(i, "resume") for i in resume_ids}
+    job_docs = {i: _STORE.get(i, "job") for i in job_ids}
+    missing = [i for i in resume_ids if resume_docs[i] is None]
+    missing += [i for i in job_ids if job_docs[i] is None]
+    anchor = req.resume_doc_id if req.resume_doc_id is not None else req.job_doc_id
+    if anchor in missing:
+        raise HTTPException(status_code=404, detail="Documents not found")
+    resumes = [i for i in resume_ids if resume_docs[i] is not None]
+    jobs = [i for i in job_ids if job_docs[i] is not None]
+    rows = await workers.score_pool.run(
+        _score_batch,
+        resumes,
+        [resume_docs[i].features for i in resumes],
+        jobs,
+        [job_docs[i].features for i in jobs],
+        req.explain,
+    )
+
+    if not consent_save:
+        _STORE.expire(resumes + jobs, UNSAVED_TTL)
+    if settings.analytics_enabled:
+        logger.info(
+            "batch_match_completed pairs=%d duration=%.2f", len(rows), time.time() - start
+        )
+    return {"results": rows, "missing": missing}
+
+
+@app.post("/v1/recommend", response_model=RecommendResponse)
+async def recommend_ep(
+    req: RecommendRequest, x_client_id: str = Header(..., alias="X-Client-Id")
+):
+    resume = _STORE.get(req.resume_doc_id, "resume")
+    if resume is None:
+        raise HTTPException(status_code=404, detail="Documents not found")
+    if not 1 <= req.k <= 100:
+        raise HTTPException(status_code=400, detail="k must be between 1 and 100")
+    top = await workers.score_pool.run(_JOB_INDEX.top_k, resume.features.vector, req.k)
+    results = [
+        {"job_doc_id": job_id, "score": score, "label": explain._label(score)}
+        for job_id, score in top
+        if job_id in _STORE
+    ]
+    return {"results": results}
+
+
 @app.delete("/v1/user/data")
 async def delete_user_data(x_client_id: str = Header(..., alias="X-Client-Id")):
-    for doc_id, owner in list(_DOC_OWNERS.items()):
-        if owner == x_client_id:
-            _RESUMES.pop(doc_id, None)
-            _JOBS.pop(doc_id, None)
-            _MATCHES.pop(doc_id, None)
-            _DOC_OWNERS.pop(doc_id, None)
+    _STORE.remove_owner(x_client_id)
+    # also keys whose documents were never stored or are already gone
+    parse_cache.drop_owner(x_client_id)
     return {"status": "deleted"}
 
 
@@ -1,80 +1,107 @@
-import math
-from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
 
-import yaml
+import numpy as np
 
-from ..embeddings import provider
+from ..embeddings import cache, provider
+from ..taxonomy import embedding_index
+from ..taxonomy.automaton import SkillAutomaton, build_automaton, get_automaton
+from ..taxonomy.index import TaxonomyIndex, get_index
+
+MATCH_THRESHOLD = 0.72
 
 
 class SkillMatcher:
-    def __init__(self, embedding_fn=provider.get_embedding):
-        data = yaml.safe_load((Path(__file__).resolve().parents[1] / "taxonomy" / "skills.yaml").read_text())
-        self.skills: List[Dict[str, Any]] = []
-        self.alias_map: Dict[str, int] = {}
-        sid = 1
-        for items in data.values():
-            for item in items:
-                name = item["name"]
-                self.skills.append({"id": sid, "name": name})
-                self.alias_map[name.lower()] = sid
-                for alias in item.get("aliases", []):
-                    self.alias_map[alias.lower()] = sid
-                sid += 1
-        self._embeddings: Dict[int, List[float]] = {}
-        self.embedding_fn = embedding_fn
+    def __init__(self, embeddings_fn=None, taxonomy: Optional[TaxonomyIndex] = None):
+        self.taxonomy = taxonomy or get_index()
+        self.automaton: SkillAutomaton = (
+            get_automaton() if taxonomy is None else build_automaton(taxonomy)
+        )
+        # skill ids reported by the matcher are 1-based, like the skills table
+        self._names = np.array(self.taxonomy.names, dtype=object)
+        self._matrix: Optional[np.ndarray] = None
+        # the persisted index is only valid for the configured provider's vectors
+        self._index_key = None
+        if embeddings_fn is None:
+            embeddings_fn = cache.embed_texts
+            self._index_key = (provider.model_name(), self.taxonomy.yaml_hash)
+        # called with every text of a batch at once, never one text at a time
+        self.embeddings_fn = embeddings_fn
+        if self._index_key is not None:
+            self._matrix = embedding_index.load_index(self.taxonomy.names, *self._index_key)
 
-    def _skill_embedding(self, skill_id: int) -> List[float]:
-        if skill_id not in self._embeddings:
-            name = next(s["name"] for s in self.skills if s["id"] == skill_id)
-            self._embeddings[skill_id] = self.embedding_fn(name)
-        return self._embeddings[skill_id]
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.embeddings_fn(texts), dtype=np.float64)
 
     @staticmethod
-    def _cosine(a: List[float], b: List[float]) -> float:
-        if not a or not b:
-            return 0.0
-        dot = sum(x * y for x, y in zip(a, b))
-        na = math.sqrt(sum(x * x for x in a))
-        nb = math.sqrt(sum(y * y for y in b))
-        if na == 0 or nb == 0:
-            return 0.0
-        return dot / (na * nb)
+    def _normalize(mat: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(mat, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return np.ascontiguousarray(mat / norms)
+
+    def _skill_matrix(self) -> np.ndarray:
+        """Return the row-normalized taxonomy embedding matrix, building it once."""
+        if self._matrix is None:
+            names = self.taxonomy.names
+            if self._index_key is not None:
+                self._matrix = embedding_index.ensure_index(
+                    names, self.embeddings_fn, *self._index_key
+                )
+            else:
+                self._matrix = self._normalize(self._embed(names))
+        return self._matrix
+
+    def _resolve(self, texts: List[str]) -> List[Optional[tuple]]:
+        """Map free-text skills to ``(skill_id, similarity)`` by nearest embedding."""
+        if not texts:
+            return []
+        matrix = self._skill_matrix()
+        emb = self._normalize(self._embed(texts)).astype(matrix.dtype, copy=False)
+        sims = emb @ matrix.T
+        best = sims.argmax(axis=1)
+        best_sims = sims[np.arange(len(texts)), best]
+        out: List[Optional[tuple]] = []
+        for idx, sim in zip(best.tolist(), best_sims.tolist()):
+            if sim < MATCH_THRESHOLD:
+                out.append(None)
+            else:
+                out.append((idx + 1, sim))
+        return out
 
     def match(self, candidates: Iterable[Dict[str, Any]], source: str) -> List[Dict[str, Any]]:
+        cands = list(candidates)
+        texts = [cand.get("text", "").strip() for cand in cands]
+        # exact alias, then taxonomy mentions inside the text, then embeddings
+        resolved: List[List[tuple]] = [[] for _ in cands]
+        pending: List[int] = []
+        for i, text in enumerate(texts):
+            skill_id = self.taxonomy.lookup(text)
+            if skill_id is not None:
+                resolved[i] = [(skill_id + 1, 1.0)]
+                continue
+            mentioned = self.automaton.skill_ids(text)
+            if mentioned:
+                resolved[i] = [(sid + 1, 1.0) for sid in mentioned]
+            else:
+                pending.append(i)
+        hits = self._resolve([texts[i].lower() for i in pending])
+        for i, hit in zip(pending, hits):
+            if hit is not None:
+                resolved[i] = [hit]
+
         results: List[Dict[str, Any]] = []
-        for cand in candidates:
-            text = cand.get("text", "").strip()
-            norm = text.lower()
-            skill_id = self.alias_map.get(norm)
-            confidence = 1.0
-            if skill_id is None:
-                emb = self.embedding_fn(norm)
-                best_id = None
-                best_sim = 0.0
-                for s in self.skills:
-                    se = self._skill_embedding(s["id"])
-                    sim = self._cosine(emb, se)
-                    if sim > best_sim:
-                        best_sim = sim
-                        best_id = s["id"]
-                if best_id is None or best_sim < 0.72:
-                    continue
-                skill_id = best_id
-                confidence = best_sim
-            name = next(s["name"] for s in self.skills if s["id"] == skill_id)
-            evidence = {"snippet": cand.get("snippet", text)}
-            if cand.get("start") or cand.get("end"):
-                evidence["start"] = cand.get("start")
-                evidence["end"] = cand.get("end")
-            results.append(
-                {
-                    "skill_id": skill_id,
-                    "name": name,
-                    "source": source,
-                    "confidence": confidence,
-                    "evidence": evidence,
-                }
-            )
+        for cand, text, hits in zip(cands, texts, resolved):
+            for skill_id, confidence in hits:
+                evidence = {"snippet": cand.get("snippet", text)}
+                if cand.get("start") or cand.get("end"):
+                    evidence["start"] = cand.get("start")
+                    evidence["end"] = cand.get("end")
+                results.append(
+                    {
+                        "skill_id": skill_id,
+                        "name": self._names[skill_id - 1],
+                        "source": source,
+                        "confidence": confidence,
+                        "evidence": evidence,
+                    }
+                )
         return results
-
@@ -0,0 +1,267 @@
+"""Content-addressed cache of parser output.
+
+Parsed payloads are keyed by a sha256 over :data:`PARSER_VERSION`, the
+taxonomy hash (skill extraction depends on it), the document kind (for
+PDFs including the layout mode and page cap, which change the extracted
+text) and the input: raw bytes for resumes, normalized text for pasted job postings.
+Entries live in a byte-bounded in-memory LRU and, when ``PARSE_CACHE_PATH``
+is set and the payload may be kept (jobs, or resumes whose owner consented),
+in a SQLite table that survives restarts. Every entry expires after
+``PARSE_CACHE_TTL`` seconds, and each key remembers the clients holding it so
+their deletion or document expiry drops it. Cached payloads are shared
+between documents and must be treated as read-only.
+
+Bump :data:`PARSER_VERSION` whenever parser output changes.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from ..lru import LRUCache
+from ..taxonomy.index import get_index
+from . import pdf
+
+PARSER_VERSION = "4"
+CACHE_BYTES = int(os.getenv("PARSE_CACHE_BYTES", str(32 * 1024 * 1024)))
+CACHE_PATH = os.getenv("PARSE_CACHE_PATH") or None
+# seconds an entry is served after it was cached
+CACHE_TTL = float(os.getenv("PARSE_CACHE_TTL", "3600"))
+
+
+def normalize_job_text(text: str) -> str:
+    """The only view of a posting ``parse_job`` depends on: stripped, non-empty lines."""
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def key_hasher(kind: str) -> "hashlib._Hash":
+    """A sha256 primed with the key prefix; feed it the input to build a key incrementally."""
+    digest = hashlib.sha256()
+    for part in (PARSER_VERSION, get_index().yaml_hash, kind):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest
+
+
+def cache_key(kind: str, data: bytes) -> str:
+    digest = key_hasher(kind)
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def resume_kind(fmt: str) -> str:
+    """Key kind for a resume in format ``fmt``."""
+    if fmt == "pdf":
+        return f"resume:pdf:{pdf.LAYOUT}:{pdf.MAX_PAGES}"
+    return "resume:" + fmt
+
+
+def resume_key(data: bytes, filename: str) -> str:
+    return cache_key(resume_kind(filename.lower().rsplit(".", 1)[-1]), data)
+
+
+def job_key(text: str) -> str:
+    return cache_key("job", normalize_job_text(text).encode())
+
+
+def _entry_size(entry: Tuple[float, Dict[str, Any]]) -> int:
+    return len(json.dumps(entry[1]))
+
+
+class ParseCache:
+    """Parsed payloads with a TTL, remembering which clients each key belongs to.
+
+    Only payloads :meth:`put` with ``persist=True`` reach SQLite; resumes are
+    persisted only with the client's consent. :meth:`release` and
+    :meth:`drop_owner` remove a key once no client holds it any more.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = CACHE_BYTES,
+        path: Optional[str] = CACHE_PATH,
+        ttl: float = CACHE_TTL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.lru = LRUCache(max_bytes, sizeof=_entry_size)
+        self.ttl = ttl
+        self._clock = clock
+        self._owners: Dict[str, Set[str]] = {}
+        self._owners_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._inflight: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._db:
+                # the unversioned table had no owners or deadlines and may hold
+                # resumes stored without consent
+                self._db.execute("DROP TABLE IF EXISTS parse_cache")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS parse_entries"
+                    " (key TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS parse_owners"
+                    " (key TEXT NOT NULL, owner TEXT NOT NULL, PRIMARY KEY (key, owner))"
+                )
+                self._purge_expired()
+
+    def _purge_expired(self) -> None:
+        self._db.execute("DELETE FROM parse_entries WHERE expires_at <= ?", (self._clock(),))
+        self._db.execute(
+            "DELETE FROM parse_owners WHERE key NOT IN (SELECT key FROM parse_entries)"
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = self._clock()
+        entry = self.lru.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                return entry[1]
+            self.lru.pop(key)
+        if self._db is None:
+            return None
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT payload, expires_at FROM parse_entries WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        if row is None:
+            return None
+        payload = json.loads(row[0])
+        self.lru.put(key, (row[1], payload))
+        return payload
+
+    def put(
+        self,
+        key: str,
+        payload: Dict[str, Any],
+        owner: Optional[str] = None,
+        persist: bool = True,
+    ) -> None:
+        """Cache ``payload`` for ``ttl`` seconds, held by ``owner`` if given.
+
+        With ``persist`` it is also written to SQLite (when configured).
+        """
+        expires_at = self._clock() + self.ttl
+        self.lru.put(key, (expires_at, payload))
+        self._claim(key, payload, owner, persist, expires_at)
+
+    def _claim(
+        self,
+        key: str,
+        payload: Dict[str, Any],
+        owner: Optional[str],
+        persist: bool,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        if owner is not None:
+            with self._owners_lock:
+                self._owners.setdefault(key, set()).add(owner)
+        if not persist or self._db is None:
+            return
+        if expires_at is None:
+            expires_at = self._clock() + self.ttl
+        with self._db_lock, self._db:
+            self._db.execute(
+                "INSERT INTO parse_entries (key, payload, expires_at) VALUES (?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET expires_at = MAX(expires_at, excluded.expires_at)",
+                (key, json.dumps(payload), expires_at),
+            )
+            if owner is not None:
+                self._db.execute(
+                    "INSERT OR IGNORE INTO parse_owners (key, owner) VALUES (?, ?)", (key, owner)
+                )
+
+    def release(self, key: str, owner: str) -> bool:
+        """``owner`` no longer holds ``key``; drop the entry once nobody does.
+
+        Returns whether the entry was dropped.
+        """
+        with self._owners_lock:
+            owners = self._owners.get(key)
+            if owners is not None:
+                owners.discard(owner)
+                if not owners:
+                    del self._owners[key]
+            held = bool(owners)
+        if self._db is not None:
+            with self._db_lock, self._db:
+                self._db.execute(
+                    "DELETE FROM parse_owners WHERE key = ? AND owner = ?", (key, owner)
+                )
+                held = held or self._db.execute(
+                    "SELECT 1 FROM parse_owners WHERE key = ? LIMIT 1", (key,)
+                ).fetchone() is not None
+                if not held:
+                    self._db.execute("DELETE FROM parse_entries WHERE key = ?", (key,))
+        if not held:
+            self.lru.pop(key)
+        return not held
+
+    def drop_owner(self, owner: str) -> int:
+        """Release every key ``owner`` holds; returns how many entries were dropped."""
+        with self._owners_lock:
+            keys = {k for k, owners in self._owners.items() if owner in owners}
+        if self._db is not None:
+            with self._db_lock:
+                rows = self._db.execute(
+                    "SELECT key FROM parse_owners WHERE owner = ?", (owner,)
+                ).fetchall()
+            keys.update(k for (k,) in rows)
+        return sum(self.release(key, owner) for key in keys)
+
+    async def get_or_parse(
+        self,
+        key: str,
+        parse: Callable[[], Awaitable[Dict[str, Any]]],
+        owner: Optional[str] = None,
+        persist: bool = True,
+    ) -> Dict[str, Any]:
+        """Return the cached payload, parsing at most once per key at a time.
+
+        The parse runs in its own task, which caches and owns the result;
+        every caller, the first included, only awaits it shielded, so a
+        cancelled request neither cancels the parse nor fails the others.
+        ``parse()`` is called synchronously, at most once per started parse.
+        Each caller then holds the key as ``owner`` and persists it only if
+        it passed ``persist``.
+        """
+        payload = self.get(key)
+        if payload is None:
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._fill(key, parse()))
+                self._inflight[key] = task
+                task.add_done_callback(partial(self._settled, key))
+            payload = await asyncio.shield(task)
+        self._claim(key, payload, owner, persist)
+        return payload
+
+    async def _fill(self, key: str, pending: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+        payload = await pending
+        self.put(key, payload, persist=False)
+        return payload
+
+    def _settled(self, key: str, task: "asyncio.Task[Dict[str, Any]]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # waiters re-raise it; mark it retrieved so an unawaited failure is not logged
+            task.exception()
+
+    def close(self) -> None:
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+
+
+parse_cache = ParseCache()
@@ -0,0 +1,67 @@
+"""Streaming DOCX text extraction.
+
+Reads ``word/document.xml`` straight out of the zip archive with an
+incremental parser and yields paragraph text in document order, without
+building python-docx's object model or touching embedded media. Unlike
+python-docx's ``Document.paragraphs`` this includes paragraphs inside table
+cells and text boxes. Text boxes are usually stored twice, as DrawingML in
+``mc:Choice`` and as a VML copy in ``mc:Fallback``; the fallback is skipped.
+A text box's paragraphs are yielded before the paragraph that anchors it.
+
+Every element is detached from its parent once it has been read, so memory
+is bounded by nesting depth and the longest paragraph, not document size.
+"""
+
+import zipfile
+from typing import BinaryIO, Iterator, List, Union
+from xml.etree.ElementTree import iterparse
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+_P = W + "p"
+_T = W + "t"
+_FALLBACK = MC + "Fallback"
+# run content that python-docx renders as characters
+_CHARS = {W + "tab": "\t", W + "ptab": "\t", W + "cr": "\n", W + "noBreakHyphen": "-"}
+_BR = W + "br"
+
+
+def _paragraphs(xml: BinaryIO) -> Iterator[str]:
+    stack: List = []
+    # one buffer per open paragraph; text boxes nest paragraphs inside runs
+    open_paragraphs: List[List[str]] = []
+    skip = 0
+    for event, elem in iterparse(xml, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            stack.append(elem)
+            if tag == _FALLBACK:
+                skip += 1
+            elif tag == _P and not skip:
+                open_paragraphs.append([])
+            continue
+
+        stack.pop()
+        if tag == _FALLBACK:
+            skip -= 1
+        elif skip:
+            pass
+        elif tag == _P:
+            yield "".join(open_paragraphs.pop())
+        elif open_paragraphs:
+            if tag == _T:
+                open_paragraphs[-1].append(elem.text or "")
+            elif tag in _CHARS:
+                open_paragraphs[-1].append(_CHARS[tag])
+            elif tag == _BR and elem.get(W + "type", "textWrapping") == "textWrapping":
+                open_paragraphs[-1].append("\n")
+        # a finished element is always its parent's last child
+        if stack:
+            del stack[-1][-1]
+
+
+def iter_paragraphs(source: Union[str, BinaryIO]) -> Iterator[str]:
+    """Paragraph texts of a DOCX path or seekable binary file, in document order."""
+    with zipfile.ZipFile(source) as zf, zf.open("word/document.xml") as xml:
+        yield from _paragraphs(xml)
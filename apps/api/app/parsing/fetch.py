@@ -0,0 +1,174 @@
+"""Async fetching of job postings by URL.
+
+One :class:`JobFetcher` shares an ``httpx.AsyncClient`` connection pool
+across requests and caps concurrent requests per host. Extracted posting
+text is kept in a bounded LRU keyed by URL together with the response's
+``ETag``/``Last-Modified`` validators; a repeat fetch while the entry is
+fresh (``max-age``, else ``FETCH_DEFAULT_TTL``) is answered from the cache,
+and otherwise revalidated with a conditional request so an unchanged page
+(304) skips download and extraction. Bodies larger than ``FETCH_MAX_BYTES``
+are rejected while streaming.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..lru import LRUCache
+
+MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", str(2 * 1024 * 1024)))
+TIMEOUT = float(os.getenv("FETCH_TIMEOUT", "10"))
+PER_HOST = int(os.getenv("FETCH_PER_HOST", "4"))
+MAX_CONNECTIONS = int(os.getenv("FETCH_MAX_CONNECTIONS", "32"))
+TEXT_CACHE_BYTES = int(os.getenv("FETCH_CACHE_BYTES", str(8 * 1024 * 1024)))
+# freshness for responses without Cache-Control; postings rarely change within minutes
+DEFAULT_TTL = float(os.getenv("FETCH_DEFAULT_TTL", "300"))
+
+
+class FetchError(ValueError):
+    """The posting could not be fetched (status, size or transport error)."""
+
+
+def extract_text(html: str) -> str:
+    """Main-content text of an HTML page."""
+    from lxml import html as lxml_html
+    from readability import Document
+
+    snippet = Document(html).summary()
+    return lxml_html.fromstring(snippet).text_content()
+
+
+@dataclass
+class _Entry:
+    text: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fresh_until: float
+
+
+def _freshness(cache_control: str, default: float) -> Optional[float]:
+    """Seconds a response stays fresh, or ``None`` if it must not be stored."""
+    directives = {}
+    for directive in cache_control.lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        directives[name] = value.strip('"')
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    if directives.get("max-age", "").isdigit():
+        return float(directives["max-age"])
+    return default
+
+
+class JobFetcher:
+    def __init__(
+        self,
+        *,
+        max_bytes: int = MAX_BYTES,
+        timeout: float = TIMEOUT,
+        per_host: int = PER_HOST,
+        max_connections: int = MAX_CONNECTIONS,
+        cache_bytes: int = TEXT_CACHE_BYTES,
+        default_ttl: float = DEFAULT_TTL,
+        extract: Optional[Callable[[str], Awaitable[str]]] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.per_host = per_host
+        self.max_connections = max_connections
+        self.default_ttl = default_ttl
+        self.cache = LRUCache(cache_bytes, sizeof=lambda e: len(e.text) + 64)
+        self._extract = extract or (lambda html: asyncio.to_thread(extract_text, html))
+        # the client and semaphores belong to the loop that created them
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+
+    def _session(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._loop = loop
+            self._hosts = {}
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                headers={"User-Agent": "doesmyresumematch/1.0"},
+            )
+        return self._client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        sem = self._hosts.get(host)
+        if sem is None:
+            sem = self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return sem
+
+    async def fetch_text(self, url: str) -> str:
+        """Extracted posting text for ``url``."""
+        cached: Optional[_Entry] = self.cache.get(url)
+        if cached is not None and cached.fresh_until > time.monotonic():
+            return cached.text
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        client = self._session()
+        async with self._host_limit(url):
+            try:
+                async with client.stream("GET", url, headers=headers) as resp:
+                    if resp.status_code == 304 and cached is not None:
+                        body = None
+                    elif resp.status_code >= 400:
+                        raise FetchError(f"Fetching {url} failed with HTTP {resp.status_code}")
+                    else:
+                        body = await self._read_limited(resp)
+                    etag = resp.headers.get("ETag")
+                    last_modified = resp.headers.get("Last-Modified")
+                    fresh_for = _freshness(resp.headers.get("Cache-Control", ""), self.default_ttl)
+                    encoding = resp.encoding or "utf-8"
+            except httpx.HTTPError as exc:
+                raise FetchError(f"Fetching {url} failed: {exc}") from exc
+
+        if body is None:
+            text = cached.text
+            etag = etag or cached.etag
+            last_modified = last_modified or cached.last_modified
+        else:
+            text = await self._extract(body.decode(encoding, errors="replace"))
+        if fresh_for is None:
+            self.cache.pop(url)
+        else:
+            self.cache.put(url, _Entry(text, etag, last_modified, time.monotonic() + fresh_for))
+        return text
+
+    async def _read_limited(self, resp: httpx.Response) -> bytes:
+        length = resp.headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > self.max_bytes:
+            raise FetchError("Posting too large")
+        chunks = []
+        total = 0
+        async for chunk in resp.aiter_bytes():
+            total += len(chunk)
+            if total > self.max_bytes:
+                raise FetchError("Posting too large")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -1,65 +1,97 @@
 import re
 from typing import Any, Dict, List, Optional
 
+from ..taxonomy.automaton import get_automaton
+from ..taxonomy.index import get_index
+
+# checked in this order: a posting naming several levels gets the first
+LEVELS = ("junior", "mid", "senior", "lead")
+LEVEL_RE = re.compile(r"\b(junior|mid|senior|lead)\b")
+YEARS_RE = re.compile(r"(\d+)\+?\s+years")
+TRAILING_NUMBER_RE = re.compile(r"(\d+)\+?$")
+SECTION_HEADERS = {
+    "requirements": "required",
+    "preferred": "preferred",
+    "nice to have": "preferred",
+    "responsibilities": "responsibilities",
+}
+
 
 def _fetch_url(url: str) -> str:
-    import requests
-    from readability import Document
-    from lxml import html
+    """Blocking fetch for scripts; the API uses :class:`~app.parsing.fetch.JobFetcher`."""
+    import httpx
+
+    from .fetch import extract_text
 
-    resp = requests.get(url, timeout=10)
-    doc = Document(resp.text)
-    snippet = doc.summary()
-    return html.fromstring(snippet).text_content()
+    resp = httpx.get(url, timeout=10, follow_redirects=True)
+    return extract_text(resp.text)
 
 
-def parse_job(source: str) -> Dict[str, Any]:
-    if source.strip().startswith("http"):
+def parse_job(source: str, fetch: bool = True) -> Dict[str, Any]:
+    """Parse posting text, or the page at ``source`` if it is a URL and ``fetch`` is set."""
+    if fetch and source.strip().startswith("http"):
         text = _fetch_url(source)
     else:
         text = source
 
-    lines = [l.strip() for l in text.splitlines() if l.strip()]
+    lines = [l for l in map(str.strip, text.splitlines()) if l]
     if not lines:
         return {}
-    title = lines[0]
-    body_lower = "\n".join(lines).lower()
-    level = None
-    for lvl in ["junior", "mid", "senior", "lead"]:
-        if re.search(rf"\b{lvl}\b", body_lower):
-            level = lvl.capitalize()
-            break
+    return parse_job_lines(lines)
+
+
+def parse_job_lines(lines: List[str]) -> Dict[str, Any]:
+    """Parse stripped, non-empty posting lines in one pass; the first is the title."""
+    levels = set()
     years_required = None
-    m = re.search(r"(\d+)\+?\s+years", body_lower)
-    if m:
-        years_required = int(m.group(1))
+    # digits ending the previous line, for "5+" / "years ..." split across lines
+    years_pending = None
     location = None
     work_auth = None
-    for line in lines:
+    sections: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = None
+    for i, line in enumerate(lines):
         lower = line.lower()
+        if LEVELS[0] not in levels:
+            levels.update(LEVEL_RE.findall(lower))
+        if years_required is None:
+            if years_pending is not None and lower.startswith("years"):
+                years_required = int(years_pending)
+            else:
+                m = YEARS_RE.search(lower)
+                if m:
+                    years_required = int(m.group(1))
+                elif lower[-1].isdigit() or lower[-1] == "+":
+                    m = TRAILING_NUMBER_RE.search(lower)
+                    years_pending = m.group(1) if m else None
+                else:
+                    years_pending = None
         if lower.startswith("location"):
             location = line.split(":", 1)[1].strip()
         if "visa" in lower or "authorization" in lower:
             work_auth = line
 
-    sections: Dict[str, List[str]] = {}
-    current: Optional[str] = None
-    headers = {
-        "requirements": "required",
-        "preferred": "preferred",
-        "nice to have": "preferred",
-        "responsibilities": "responsibilities",
-    }
-    for line in lines[1:]:
-        lower = line.lower()
-        if lower in headers:
-            current = headers[lower]
-            sections[current] = []
+        if i == 0:
             continue
-        if current and line.startswith(('-', '*')):
-            sections[current].append(line.lstrip('-* ').strip())
-        elif current and lower in headers:
-            current = None
+        header = SECTION_HEADERS.get(lower)
+        if header:
+            current = sections[header] = []
+        elif current is not None and line.startswith(('-', '*')):
+            current.append(line.lstrip('-* ').strip())
+    title = lines[0]
+    level = next((lvl.capitalize() for lvl in LEVELS if lvl in levels), None)
+
+    # Taxonomy skills named outside the requirement lists (title, responsibilities, prose)
+    automaton = get_automaton()
+    taxonomy = get_index()
+    listed_lines = sections.get("required", []) + sections.get("preferred", [])
+    listed = set(automaton.skill_ids("\n".join(listed_lines)))
+    listed.update(sid for sid in map(taxonomy.lookup, listed_lines) if sid is not None)
+    mentioned = [
+        taxonomy.names[sid]
+        for sid in automaton.skill_ids("\n".join(lines))
+        if sid not in listed
+    ]
 
     return {
         "title": title,
@@ -70,4 +102,5 @@ def parse_job(source: str) -> Dict[str, Any]:
         "required_skills": sections.get("required", []),
         "preferred_skills": sections.get("preferred", []),
         "responsibilities": sections.get("responsibilities", []),
+        "mentioned_skills": mentioned,
     }
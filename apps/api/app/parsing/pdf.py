@@ -0,0 +1,228 @@
+"""PDF text extraction with a page cap, selectable layout analysis and per-page timings.
+
+Layout modes:
+
+* ``default`` – pdfminer's stock ``LAParams()``; the same text as
+  ``pdfminer.high_level.extract_text``.
+* ``fast`` – lines and text boxes are still grouped, but boxes are emitted in
+  content-stream order instead of being ordered hierarchically
+  (``boxes_flow=None``), and vertical text detection is off. The hierarchical
+  ordering is quadratic in the number of boxes and dominates on designer
+  resumes full of small shapes and labels.
+* ``none`` – no layout analysis: characters in content-stream order, broken
+  into lines where the baseline moves.
+
+Only the first ``PDF_MAX_PAGES`` pages are read (``0`` reads all). With
+``PDF_WORKERS`` > 1 and a document on disk, pages are dealt round-robin to a
+process pool; each worker reopens the file. The API already parses whole
+documents in parallel, so this defaults to 1 there and is meant for batch
+scripts. Documents slower than ``PDF_SLOW_SECONDS`` are logged with their
+slowest page.
+"""
+
+import itertools
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from io import StringIO
+from typing import BinaryIO, Container, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "10"))
+LAYOUT = os.getenv("PDF_LAYOUT", "default")
+WORKERS = int(os.getenv("PDF_WORKERS", "1"))
+SLOW_SECONDS = float(os.getenv("PDF_SLOW_SECONDS", "2"))
+LAYOUTS = ("default", "fast", "none")
+
+Source = Union[str, os.PathLike, BinaryIO]
+
+
+@dataclass
+class PageTiming:
+    page: int
+    seconds: float
+    chars: int
+
+
+@dataclass
+class PdfText:
+    pages: List[str]
+    timings: List[PageTiming]
+    # pages in the document, before the cap
+    page_count: int
+    # wall time; below the sum of page timings when pages ran in parallel
+    elapsed: float
+
+    @property
+    def text(self) -> str:
+        return "".join(self.pages)
+
+    def slowest(self) -> Optional[PageTiming]:
+        return max(self.timings, key=lambda t: t.seconds, default=None)
+
+
+def _laparams(layout: str):
+    from pdfminer.layout import LAParams
+
+    if layout == "default":
+        return LAParams()
+    if layout == "fast":
+        return LAParams(boxes_flow=None, detect_vertical=False)
+    if layout == "none":
+        return None
+    raise ValueError(f"Unknown PDF layout mode: {layout}")
+
+
+def _converter(rsrcmgr, out: StringIO, layout: str):
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LTChar, LTContainer
+
+    class StreamConverter(TextConverter):
+        """Characters in stream order; a newline where the baseline moves."""
+
+        def receive_layout(self, ltpage) -> None:
+            def chars(item) -> Iterator[LTChar]:
+                for child in item:
+                    if isinstance(child, LTChar):
+                        yield child
+                    elif isinstance(child, LTContainer):
+                        yield from chars(child)
+
+            prev = None
+            for char in chars(ltpage):
+                if prev is not None:
+                    if abs(char.y0 - prev.y0) > min(char.height, prev.height) / 2:
+                        self.write_text("\n")
+                    elif char.x0 - prev.x1 > 0.1 * max(char.width, char.height):
+                        self.write_text(" ")
+                self.write_text(char.get_text())
+                prev = char
+            self.write_text("\n\f")
+
+    if layout == "none":
+        return StreamConverter(rsrcmgr, out)
+    return TextConverter(rsrcmgr, out, laparams=_laparams(layout))
+
+
+def _extract_pages(
+    fp: BinaryIO, pages: Optional[Container[int]], max_pages: int, layout: str
+) -> List[Tuple[int, str, float]]:
+    """``(page, text, seconds)`` for each selected page among the first ``max_pages``."""
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    rsrcmgr = PDFResourceManager(caching=True)
+    out = StringIO()
+    device = _converter(rsrcmgr, out, layout)
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    rows = []
+    try:
+        for i, page in enumerate(PDFPage.get_pages(fp, maxpages=max_pages)):
+            if pages is not None and i not in pages:
+                continue
+            out.seek(0)
+            out.truncate()
+            start = time.perf_counter()
+            interpreter.process_page(page)
+            rows.append((i, out.getvalue(), time.perf_counter() - start))
+    finally:
+        device.close()
+    return rows
+
+
+def _extract_share(path: str, pages: List[int], max_pages: int, layout: str):
+    with open(path, "rb") as fp:
+        return _extract_pages(fp, set(pages), max_pages, layout)
+
+
+def _page_count(fp: BinaryIO) -> int:
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdftypes import resolve1
+
+    doc = PDFDocument(PDFParser(fp))
+    count = resolve1(resolve1(doc.catalog.get("Pages")) or {}).get("Count")
+    if isinstance(count, int):
+        return count
+    return sum(1 for _ in PDFPage.create_pages(doc))
+
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_SIZE = 0
+
+
+def _pool(workers: int) -> ProcessPoolExecutor:
+    global _POOL, _POOL_SIZE
+    if _POOL is None or _POOL_SIZE != workers:
+        shutdown()
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None
+        _POOL = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(method))
+        _POOL_SIZE = workers
+    return _POOL
+
+
+def shutdown() -> None:
+    global _POOL
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+
+
+def _path_of(source: Source) -> Optional[str]:
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    name = getattr(source, "name", None)
+    return name if isinstance(name, str) and os.path.isfile(name) else None
+
+
+@contextmanager
+def _opened(source: Source) -> Iterator[BinaryIO]:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fp:
+            yield fp
+    else:
+        yield source
+
+
+def extract(
+    source: Source,
+    *,
+    max_pages: int = MAX_PAGES,
+    layout: str = LAYOUT,
+    workers: int = WORKERS,
+) -> PdfText:
+    """Extract the text of a PDF path or seekable binary file, page by page."""
+    _laparams(layout)  # reject unknown modes before doing any work
+    path = _path_of(source)
+    began = time.perf_counter()
+    with _opened(source) as fp:
+        start = fp.tell()
+        count = _page_count(fp)
+        n = min(count, max_pages) if max_pages > 0 else count
+        if workers <= 1 or n <= 1 or path is None:
+            fp.seek(start)
+            rows = _extract_pages(fp, None, n, layout)
+        else:
+            shares = [list(range(w, n, workers)) for w in range(min(workers, n))]
+            pool = _pool(workers)
+            futures = [pool.submit(_extract_share, path, s, n, layout) for s in shares]
+            rows = sorted(itertools.chain.from_iterable(f.result() for f in futures))
+    result = PdfText(
+        pages=[text for _, text, _ in rows],
+        timings=[PageTiming(i, secs, len(text)) for i, text, secs in rows],
+        page_count=count,
+        elapsed=time.perf_counter() - began,
+    )
+    if result.elapsed > SLOW_SECONDS:
+        slowest = result.slowest()
+        logger.warning(
+            "slow PDF: %d of %d pages in %.2fs (layout=%s), slowest page %d took %.2fs",
+            len(rows), count, result.elapsed, layout, slowest.page + 1, slowest.seconds,
+        )
+    return result
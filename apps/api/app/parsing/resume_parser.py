@@ -1,13 +1,22 @@
 import io
+import os
 import re
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import Any, BinaryIO, Dict, List, Optional, Union
+
+from ..taxonomy.automaton import get_automaton
+from ..taxonomy.index import get_index
+from . import docx_text, pdf
 
 SECTION_RE = re.compile(r'^(skills?|experience|projects?|education|certifications?)$', re.I)
 DATE_RANGE_RE = re.compile(
     r'(?P<start>(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}|\d{4})\s*[\u2013\-]\s*(?P<end>(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}|\d{4}|Present)',
     re.I,
 )
+MONTH_DATE_RE = re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{4})', re.I)
+YEAR_RE = re.compile(r'(\d{4})')
+DEGREE_RE = re.compile(r"\b(BSc|MSc|Bachelor|Master)\b", re.I)
+SKILL_SPLIT_RE = re.compile(r'[;,\n]')
 MONTHS = {m.lower(): i + 1 for i, m in enumerate(['Jan','Feb','Mar','Apr','May','Jun','Jul','Aug','Sep','Oct','Nov','Dec'])}
 
 
@@ -15,107 +24,122 @@ def _parse_date(part: str) -> Optional[str]:
     part = part.strip()
     if part.lower() == 'present':
         return None
-    m = re.match(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{4})', part, re.I)
+    m = MONTH_DATE_RE.match(part)
     if m:
         month = MONTHS[m.group(1).lower()]
         return f"{int(m.group(2)):04d}-{month:02d}"
-    m = re.match(r'(\d{4})', part)
+    m = YEAR_RE.match(part)
     if m:
         return f"{int(m.group(1)):04d}-01"
     return None
 
 
-def _extract_text_pdf(data: bytes) -> List[str]:
-    from pdfminer.high_level import extract_text
-
-    text = extract_text(io.BytesIO(data)) or ""
+def _extract_text_pdf(fp: BinaryIO) -> List[str]:
+    text = pdf.extract(fp).text
     return [l.strip() for l in text.splitlines() if l.strip()]
 
 
-def _extract_text_docx(data: bytes) -> List[str]:
-    from docx import Document
+def _extract_text_docx(fp: BinaryIO) -> List[str]:
+    return [p.strip() for p in docx_text.iter_paragraphs(fp) if p.strip()]
 
-    doc = Document(io.BytesIO(data))
-    return [p.text.strip() for p in doc.paragraphs if p.text.strip()]
 
+def parse_resume(
+    source: Union[bytes, str, os.PathLike, BinaryIO], filename: str
+) -> Dict[str, Any]:
+    """Parse a resume given as bytes, a file path or a seekable binary file.
 
-def parse_resume(data: bytes, filename: str) -> Dict[str, Any]:
+    The format comes from ``filename``'s extension.
+    """
     ext = filename.lower().split('.')[-1]
     if ext == 'pdf':
-        lines = _extract_text_pdf(data)
+        extract = _extract_text_pdf
     elif ext in {'docx', 'doc'}:
-        lines = _extract_text_docx(data)
+        extract = _extract_text_docx
     else:
         raise ValueError('Unsupported resume format')
+    if isinstance(source, (bytes, bytearray)):
+        lines = extract(io.BytesIO(source))
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as fp:
+            lines = extract(fp)
+    else:
+        lines = extract(source)
+
+    return parse_resume_lines(lines)
+
+
+def parse_resume_lines(lines: List[str]) -> Dict[str, Any]:
+    """Parse extracted resume lines in one pass.
 
+    Section headers switch the section the following lines belong to; a
+    repeated header starts that section over. Experiences and degree lines
+    are picked up on the same pass.
+    """
     sections: Dict[str, List[str]] = {}
-    current: Optional[str] = None
+    section: Optional[List[str]] = None
     prev_line: Optional[str] = None
+    experiences: List[Dict[str, Any]] = []
+    degree_lines: List[str] = []
     for line in lines:
         stripped = line.strip()
-        lower = stripped.lower()
-        key_match = SECTION_RE.match(lower)
+        m = DATE_RANGE_RE.search(line) if ' at ' in line else None
+        if m:
+            pre = line[: m.start()].strip()
+            role = company = ''
+            if ' at ' in pre:
+                role, company = pre.split(' at ', 1)
+            experiences.append(
+                {
+                    'role': role.strip(),
+                    'company': company.strip(),
+                    'start': _parse_date(m.group('start')),
+                    'end': _parse_date(m.group('end')),
+                    'bullets': [],
+                }
+            )
+        if DEGREE_RE.search(line):
+            degree_lines.append(line)
+
+        key_match = SECTION_RE.match(stripped.lower())
+        head, colon, rest = stripped.partition(":")
         if key_match:
-            current = key_match.group(1).lower()
-            sections[current] = []
-            if current == 'education' and prev_line:
-                sections[current].append(prev_line)
-            prev_line = stripped
-            continue
-        if ":" in stripped:
-            head, rest = stripped.split(":", 1)
-            if SECTION_RE.match(head.lower()):
-                current = head.lower()
-                sections[current] = [rest.strip()]
-                prev_line = stripped
-                continue
-        if current:
-            sections[current].append(stripped)
+            key = key_match.group(1).lower()
+            section = sections[key] = []
+            if key == 'education' and prev_line:
+                section.append(prev_line)
+        elif colon and SECTION_RE.match(head.lower()):
+            section = sections[head.lower()] = [rest.strip()]
+        elif section is not None:
+            section.append(stripped)
         prev_line = stripped
 
     # Skills
     skills_raw: List[str] = []
     if 'skills' in sections:
         skills_text = ' '.join(sections['skills'])
-        skills_raw = [s.strip() for s in re.split(r'[;,\n]', skills_text) if s.strip()]
-
-    # Experience
-    experiences: List[Dict[str, Any]] = []
-    for line in lines:
-        m = DATE_RANGE_RE.search(line)
-        if not m or ' at ' not in line:
-            continue
-        start = _parse_date(m.group('start'))
-        end = _parse_date(m.group('end'))
-        pre = line[: m.start()].strip()
-        role = company = ''
-        if ' at ' in pre:
-            role, company = pre.split(' at ', 1)
-        experiences.append(
-            {
-                'role': role.strip(),
-                'company': company.strip(),
-                'start': start,
-                'end': end,
-                'bullets': [],
-            }
-        )
+        skills_raw = [s.strip() for s in SKILL_SPLIT_RE.split(skills_text) if s.strip()]
+
+    # Taxonomy skills mentioned anywhere else (experience, projects, certifications)
+    automaton = get_automaton()
+    taxonomy = get_index()
+    listed = set(automaton.skill_ids('\n'.join(skills_raw)))
+    listed.update(sid for sid in map(taxonomy.lookup, skills_raw) if sid is not None)
+    for sid in automaton.skill_ids('\n'.join(lines)):
+        if sid not in listed:
+            skills_raw.append(taxonomy.names[sid])
+            listed.add(sid)
 
     education = sections.get('education', [])
-    edu_matches = [
-        l for l in lines if re.search(r"\b(BSc|MSc|Bachelor|Master)\b", l, re.I)
-    ]
-    for l in edu_matches:
-        if l not in education:
+    seen = set(education)
+    for l in degree_lines:
+        if l not in seen:
             education.append(l)
+            seen.add(l)
     education = [l for l in education if l and ' at ' not in l]
 
-    certifications = sections.get('certifications', [])
-
     return {
         'experiences': experiences,
         'skills': skills_raw,
         'education': education,
-        'certifications': certifications,
+        'certifications': sections.get('certifications', []),
     }
-
@@ -0,0 +1,230 @@
+"""Streaming resume uploads.
+
+The request body is consumed chunk by chunk, either as the raw document or
+as ``multipart/form-data`` (the first part with a filename). Each chunk is
+counted against ``UPLOAD_MAX_BYTES``, fed to the parse-cache key hash and
+written to a temporary file, so an upload holds one network chunk in memory
+however large it is, and an oversized body is rejected as soon as it crosses
+the limit. The format comes from the magic bytes, not from the client's
+filename or content type: ``%PDF-`` for PDF, a zip containing
+``word/document.xml`` for DOCX.
+
+Configuration (environment):
+
+* ``UPLOAD_MAX_BYTES`` – largest accepted document (default 2 000 000)
+* ``UPLOAD_TMP_DIR`` – spool directory (default: the system temp dir)
+"""
+
+import os
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional
+
+from .cache import key_hasher, resume_kind
+
+MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", "2000000"))
+TMP_DIR = os.getenv("UPLOAD_TMP_DIR") or None
+# PDF allows junk before the header; readers look for it in the first KiB
+_SNIFF_BYTES = 1024
+# room for multipart boundaries, part headers and small form fields
+_MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadError(ValueError):
+    """The upload was rejected; ``str(exc)`` is safe to return to the client."""
+
+
+@dataclass
+class Upload:
+    path: str
+    format: str
+    size: int
+    key: str
+
+    @property
+    def filename(self) -> str:
+        return "resume." + self.format
+
+    def close(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def sniff(head: bytes) -> Optional[str]:
+    """``"pdf"`` or ``"docx"`` from the leading bytes of a document, else ``None``."""
+    if b"%PDF-" in head[:_SNIFF_BYTES]:
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        return "docx"
+    return None
+
+
+def _is_docx(path: str) -> bool:
+    try:
+        with zipfile.ZipFile(path) as zf:
+            return "word/document.xml" in zf.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+
+class _Spool:
+    """Writes an upload to a temp file while sizing, sniffing and hashing it."""
+
+    def __init__(self, max_bytes: int, tmp_dir: Optional[str]):
+        self.max_bytes = max_bytes
+        self.file = tempfile.NamedTemporaryFile(dir=tmp_dir, prefix="upload-", delete=False)
+        self.size = 0
+        self.format: Optional[str] = None
+        self._head = bytearray()
+        self._hasher = None
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadError("File too large")
+        if self._hasher is None:
+            self._head += chunk
+            if len(self._head) >= _SNIFF_BYTES:
+                self._start()
+        else:
+            self._hasher.update(chunk)
+        self.file.write(chunk)
+
+    def _start(self) -> None:
+        self.format = sniff(bytes(self._head))
+        if self.format is None:
+            raise UploadError("Unsupported resume format")
+        self._hasher = key_hasher(resume_kind(self.format))
+        self._hasher.update(self._head)
+        self._head = bytearray()
+
+    def finish(self) -> Upload:
+        if self.size == 0:
+            raise UploadError("Empty upload")
+        if self._hasher is None:
+            self._start()
+        self.file.close()
+        if self.format == "docx" and not _is_docx(self.file.name):
+            raise UploadError("Unsupported resume format")
+        return Upload(self.file.name, self.format, self.size, self._hasher.hexdigest())
+
+    def discard(self) -> None:
+        self.file.close()
+        try:
+            os.unlink(self.file.name)
+        except FileNotFoundError:
+            pass
+
+
+class _FilePart:
+    """``MultipartParser`` callbacks that keep the data of the first file part."""
+
+    def __init__(self):
+        self.found = False
+        self.done = False
+        self.pending: List[bytes] = []
+        self._headers: Dict[bytes, bytes] = {}
+        self._field = bytearray()
+        self._value = bytearray()
+        self._active = False
+
+    def callbacks(self):
+        return {
+            "on_part_begin": self._headers.clear,
+            "on_header_field": lambda data, start, end: self._field.extend(data[start:end]),
+            "on_header_value": lambda data, start, end: self._value.extend(data[start:end]),
+            "on_header_end": self._header_end,
+            "on_headers_finished": self._headers_finished,
+            "on_part_data": self._part_data,
+            "on_part_end": self._part_end,
+        }
+
+    def _header_end(self) -> None:
+        self._headers[bytes(self._field).lower()] = bytes(self._value)
+        self._field.clear()
+        self._value.clear()
+
+    def _headers_finished(self) -> None:
+        from python_multipart.multipart import parse_options_header
+
+        _, params = parse_options_header(self._headers.get(b"content-disposition"))
+        self._active = not self.done and b"filename" in params
+        self.found = self.found or self._active
+
+    def _part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._active:
+            self.pending.append(bytes(data[start:end]))
+
+    def _part_end(self) -> None:
+        if self._active:
+            self._active = False
+            self.done = True
+
+    def drain(self) -> List[bytes]:
+        chunks, self.pending = self.pending, []
+        return chunks
+
+
+async def _limited(chunks: AsyncIterator[bytes], limit: int) -> AsyncIterator[bytes]:
+    total = 0
+    async for chunk in chunks:
+        total += len(chunk)
+        if total > limit:
+            raise UploadError("File too large")
+        yield chunk
+
+
+async def _multipart_file(chunks: AsyncIterator[bytes], content_type: str) -> AsyncIterator[bytes]:
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import MultipartParser, parse_options_header
+
+    _, params = parse_options_header(content_type)
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise UploadError("Missing multipart boundary")
+    part = _FilePart()
+    parser = MultipartParser(boundary, part.callbacks())
+    try:
+        async for chunk in chunks:
+            parser.write(chunk)
+            for data in part.drain():
+                yield data
+        parser.finalize()
+    except MultipartParseError as exc:
+        raise UploadError("Malformed multipart body") from exc
+    for data in part.drain():
+        yield data
+    if not part.found:
+        raise UploadError("No file in upload")
+
+
+async def receive_upload(
+    request, max_bytes: int = MAX_BYTES, tmp_dir: Optional[str] = TMP_DIR
+) -> Upload:
+    """Spool the document in ``request``'s body to disk.
+
+    The caller owns the returned :class:`Upload` and must ``close()`` it.
+    Raises :class:`UploadError` for oversized, empty, malformed or
+    unsupported uploads.
+    """
+    content_type = request.headers.get("content-type", "")
+    multipart = content_type.lower().startswith("multipart/form-data")
+    limit = max_bytes + (_MULTIPART_OVERHEAD if multipart else 0)
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > limit:
+        raise UploadError("File too large")
+
+    chunks = _limited(request.stream(), limit)
+    if multipart:
+        chunks = _multipart_file(chunks, content_type)
+    spool = _Spool(max_bytes, tmp_dir)
+    try:
+        async for chunk in chunks:
+            spool.write(chunk)
+        return spool.finish()
+    except BaseException:
+        spool.discard()
+        raise
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -24,3 +24,41 @@ class MatchResponse(BaseModel):
     gaps: List[Dict[str, Any]]
     clusters: List[Dict[str, Any]]
     terms: Dict[str, float]
+
+
+class BatchMatchRequest(BaseModel):
+    """One resume against many jobs, or one job against many resumes."""
+
+    resume_doc_id: Optional[int] = None
+    job_doc_ids: List[int] = []
+    job_doc_id: Optional[int] = None
+    resume_doc_ids: List[int] = []
+    explain: bool = False
+
+
+class BatchMatchRow(BaseModel):
+    resume_doc_id: int
+    job_doc_id: int
+    score: float
+    label: str
+    explanation: Optional[MatchResponse] = None
+
+
+class BatchMatchResponse(BaseModel):
+    results: List[BatchMatchRow]
+    missing: List[int]
+
+
+class RecommendRequest(BaseModel):
+    resume_doc_id: int
+    k: int = 10
+
+
+class RecommendRow(BaseModel):
+    job_doc_id: int
+    score: float
+    label: str
+
+
+class RecommendResponse(BaseModel):
+    results: List[RecommendRow]
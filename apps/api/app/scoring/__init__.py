@@ -1,3 +1,3 @@
-from . import vectors, engine, explain
+from . import batch, clusters, engine, explain, job_index, kernel, vectors
 
-__all__ = ["vectors", "engine", "explain"]
+__all__ = ["vectors", "engine", "explain", "clusters", "kernel", "batch", "job_index"]
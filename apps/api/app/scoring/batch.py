@@ -0,0 +1,220 @@
+"""Vectorized ``score_pair`` over many resume/job pairs at once.
+
+Vectors are stacked into CSR matrices whose columns are only the skill ids
+the batch uses (see :func:`columns`), so matrix width depends on the batch,
+not on the vocabulary, and every term of the score is computed with sparse
+products:
+
+* base cosine: ``R @ J.T`` scaled by both row norms;
+* critical-skill penalty: required job weight not covered by a non-zero
+  resume weight, ``total_req - (R != 0) @ Q.T``;
+* cluster penalty: ``sum_c w_c (1 - cos_c)`` with one product per cluster.
+
+Results equal :func:`app.scoring.engine.score_pair` up to float rounding.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from .skill_vector import SkillVector, SkillVocabulary, get_vocabulary
+
+
+@dataclass
+class ScoreMatrix:
+    score: np.ndarray
+    base: np.ndarray
+    pcrit: np.ndarray
+    cluster_penalty: np.ndarray
+
+
+def columns(*groups: Sequence[SkillVector]) -> np.ndarray:
+    """Sorted distinct skill ids of every vector in ``groups``: a batch's columns."""
+    ids = [np.frombuffer(vec.ids, dtype=np.int32) for vectors in groups for vec in vectors]
+    return np.unique(np.concatenate(ids)) if ids else np.empty(0, dtype=np.int32)
+
+
+def stack(vectors: Sequence[SkillVector], cols: np.ndarray) -> sparse.csr_matrix:
+    """Stack vectors as rows of a ``len(vectors) x len(cols)`` CSR matrix.
+
+    ``cols`` are sorted skill ids covering every id in ``vectors``.
+    """
+    indptr = np.zeros(len(vectors) + 1, dtype=np.int64)
+    for i, vec in enumerate(vectors):
+        indptr[i + 1] = indptr[i] + len(vec)
+    indices = np.empty(indptr[-1], dtype=np.int32)
+    data = np.empty(indptr[-1], dtype=np.float64)
+    for i, vec in enumerate(vectors):
+        lo, hi = indptr[i], indptr[i + 1]
+        indices[lo:hi] = np.frombuffer(vec.ids, dtype=np.int32)
+        data[lo:hi] = np.frombuffer(vec.weights, dtype=np.float32)
+    indices = np.searchsorted(cols, indices).astype(np.int32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(vectors), len(cols)))
+
+
+def required_matrix(
+    jobs: Sequence[SkillVector],
+    required: Sequence[List[str]],
+    cols: np.ndarray,
+    vocab: Optional[SkillVocabulary] = None,
+) -> sparse.csr_matrix:
+    """Job weight of each required skill, counted once per listing."""
+    vocab = vocab or get_vocabulary()
+    rows: List[int] = []
+    sids: List[int] = []
+    vals: List[float] = []
+    for j, (vec, skills) in enumerate(zip(jobs, required)):
+        for s in skills:
+            sid = vocab.id_of(s)
+            w = vec.get(sid)
+            if w:
+                rows.append(j)
+                sids.append(sid)
+                vals.append(w)
+    # a non-zero weight means the id is in the job vector, so it is a column
+    col_idx = np.searchsorted(cols, np.asarray(sids, dtype=np.int64))
+    # duplicate (row, col) entries are summed, matching repeated required skills
+    return sparse.csr_matrix((vals, (rows, col_idx)), shape=(len(jobs), len(cols)))
+
+
+def _row_norms(m: sparse.csr_matrix) -> np.ndarray:
+    return np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel())
+
+
+def _safe_div(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    out = np.zeros(np.broadcast(num, den).shape)
+    np.divide(num, den, out=out, where=den != 0)
+    return out
+
+
+def _membership(cluster_of: np.ndarray, n_clusters: int) -> sparse.csr_matrix:
+    """``columns x n_clusters`` one-hot matrix of each column's cluster."""
+    return sparse.csr_matrix(
+        (np.ones(len(cluster_of)), (np.arange(len(cluster_of)), cluster_of)),
+        shape=(len(cluster_of), n_clusters),
+    )
+
+
+def score_matrix(
+    resumes: sparse.csr_matrix,
+    jobs: sparse.csr_matrix,
+    job_required: sparse.csr_matrix,
+    cluster_of: np.ndarray,
+    n_clusters: int,
+    *,
+    delta: float = 0.35,
+    eta: float = 0.15,
+    eps: float = 0.05,
+    level_gap: float = 0.0,
+) -> ScoreMatrix:
+    """Score every resume row against every job row; arrays are ``R x J``."""
+    resumes = sparse.csr_matrix(resumes)
+    jobs = sparse.csr_matrix(jobs)
+    r_norm = _row_norms(resumes)
+    j_norm = _row_norms(jobs)
+
+    dots = (resumes @ jobs.T).toarray()
+    base = _safe_div(dots, np.outer(r_norm, j_norm))
+
+    total_req = np.asarray(job_required.sum(axis=1)).ravel()
+    covered = ((resumes != 0).astype(np.float64) @ job_required.T).toarray()
+    pcrit = (total_req[None, :] - covered) / np.where(total_req == 0, 1.0, total_req)[None, :]
+
+    job_total = np.asarray(jobs.sum(axis=1)).ravel()
+    job_total = np.where(job_total == 0, 1.0, job_total)
+    cluster_pen = np.zeros_like(base)
+    membership = _membership(cluster_of, n_clusters)
+    job_cluster_w = (jobs @ membership).toarray() / job_total[:, None]
+    # one indicator mask per cluster keeps every product sparse
+    for c in np.flatnonzero(job_cluster_w.any(axis=0)):
+        mask = sparse.diags(membership[:, c].toarray().ravel())
+        r_c = resumes @ mask
+        j_c = jobs @ mask
+        cos_c = _safe_div((r_c @ j_c.T).toarray(), np.outer(_row_norms(r_c), _row_norms(j_c)))
+        cluster_pen += job_cluster_w[None, :, c] * (1.0 - cos_c)
+
+    score = base - delta * pcrit - eta * cluster_pen - eps * abs(level_gap)
+    score = np.clip(score, 0.0, 1.0) * 100.0
+    return ScoreMatrix(score=score, base=base, pcrit=pcrit, cluster_penalty=cluster_pen)
+
+
+def pair_terms(
+    resumes: sparse.csr_matrix,
+    jobs: sparse.csr_matrix,
+    job_required: sparse.csr_matrix,
+    cluster_of: np.ndarray,
+    n_clusters: int,
+) -> np.ndarray:
+    """Score terms for aligned rows (resume ``i`` vs job ``i``).
+
+    Returns an ``n x 3`` array of ``base, pcrit, cluster_penalty``; these enter
+    the score linearly, so any ``delta/eta/eps`` can be applied afterwards.
+    """
+    resumes = sparse.csr_matrix(resumes)
+    jobs = sparse.csr_matrix(jobs)
+    shared = resumes.multiply(jobs).tocsr()
+    base = _safe_div(np.asarray(shared.sum(axis=1)).ravel(), _row_norms(resumes) * _row_norms(jobs))
+
+    total_req = np.asarray(job_required.sum(axis=1)).ravel()
+    covered = np.asarray(job_required.multiply(resumes != 0).sum(axis=1)).ravel()
+    pcrit = (total_req - covered) / np.where(total_req == 0, 1.0, total_req)
+
+    membership = _membership(cluster_of, n_clusters)
+    job_total = np.asarray(jobs.sum(axis=1)).ravel()
+    job_cluster_w = (jobs @ membership).toarray() / np.where(job_total == 0, 1.0, job_total)[:, None]
+    c_dots = (shared @ membership).toarray()
+    c_norms = np.sqrt((resumes.multiply(resumes) @ membership).toarray()) * np.sqrt(
+        (jobs.multiply(jobs) @ membership).toarray()
+    )
+    cluster_pen = (job_cluster_w * (1.0 - _safe_div(c_dots, c_norms))).sum(axis=1)
+    return np.column_stack([base, pcrit, cluster_pen])
+
+
+def score_many(
+    resumes: Sequence[SkillVector],
+    jobs: Sequence[SkillVector],
+    required: Sequence[List[str]],
+    *,
+    vocab: Optional[SkillVocabulary] = None,
+    **params: float,
+) -> ScoreMatrix:
+    """Convenience wrapper: stack vectors and score all ``resumes x jobs``."""
+    vocab = vocab or get_vocabulary()
+    cols = columns(resumes, jobs)
+    return score_matrix(
+        stack(resumes, cols),
+        stack(jobs, cols),
+        required_matrix(jobs, required, cols, vocab),
+        vocab.cluster_array(cols),
+        len(vocab.cluster_names),
+        **params,
+    )
+
+
+def pair_terms_many(
+    resumes: Sequence[SkillVector],
+    jobs: Sequence[SkillVector],
+    required: Sequence[List[str]],
+    *,
+    vocab: Optional[SkillVocabulary] = None,
+) -> np.ndarray:
+    """:func:`pair_terms` for aligned lists of vectors."""
+    vocab = vocab or get_vocabulary()
+    cols = columns(resumes, jobs)
+    return pair_terms(
+        stack(resumes, cols),
+        stack(jobs, cols),
+        required_matrix(jobs, required, cols, vocab),
+        vocab.cluster_array(cols),
+        len(vocab.cluster_names),
+    )
+
+
+def terms_at(m: ScoreMatrix, i: int, j: int) -> Dict[str, float]:
+    return {
+        "base": float(m.base[i, j]),
+        "pcrit": float(m.pcrit[i, j]),
+        "cluster_penalty": float(m.cluster_penalty[i, j]),
+    }
@@ -0,0 +1,52 @@
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from .skill_vector import SkillVector, SkillVocabulary, VectorLike, as_vector, get_vocabulary
+
+ClusterSplit = Dict[int, SkillVector]
+
+
+def split_by_cluster(vec: VectorLike, vocab: Optional[SkillVocabulary] = None) -> ClusterSplit:
+    """Slice a vector by taxonomy cluster index, in order of first id."""
+    vocab = vocab or get_vocabulary()
+    cluster_of = vocab.cluster
+    groups: Dict[int, Tuple[List[int], List[float]]] = {}
+    for sid, w in as_vector(vec, vocab):
+        g = groups.setdefault(cluster_of(sid), ([], []))
+        g[0].append(sid)
+        g[1].append(w)
+    return {cid: SkillVector(array("i", ids), array("f", ws)) for cid, (ids, ws) in groups.items()}
+
+
+def combine(
+    job_split: ClusterSplit,
+    resume_split: ClusterSplit,
+    job_total: float,
+    vocab: Optional[SkillVocabulary] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Pair precomputed per-cluster slices into the ``cluster_map`` layout."""
+    vocab = vocab or get_vocabulary()
+    empty = SkillVector(array("i"), array("f"))
+    total = job_total or 1.0
+    out: Dict[str, Dict[str, Any]] = {}
+    for cid in list(job_split) + [c for c in resume_split if c not in job_split]:
+        job = job_split.get(cid, empty)
+        out[vocab.cluster_names[cid]] = {
+            "job": job,
+            "resume": resume_split.get(cid, empty),
+            "weight": sum(job.weights) / total,
+        }
+    return out
+
+
+def cluster_map(
+    job_vec: VectorLike,
+    resume_vec: VectorLike,
+    vocab: Optional[SkillVocabulary] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Split both vectors by taxonomy cluster and weight clusters by job mass."""
+    vocab = vocab or get_vocabulary()
+    job = as_vector(job_vec, vocab)
+    return combine(
+        split_by_cluster(job, vocab), split_by_cluster(resume_vec, vocab), job.total, vocab
+    )
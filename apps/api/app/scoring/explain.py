@@ -1,14 +1,7 @@
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
-
-def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
-    keys = set(a) | set(b)
-    dot = sum(a.get(k, 0.0) * b.get(k, 0.0) for k in keys)
-    na = sum(a.get(k, 0.0) ** 2 for k in keys) ** 0.5
-    nb = sum(b.get(k, 0.0) ** 2 for k in keys) ** 0.5
-    if na == 0 or nb == 0:
-        return 0.0
-    return dot / (na * nb)
+from . import kernel
+from .skill_vector import VectorLike, as_vector, get_vocabulary
 
 
 def _label(score: float) -> str:
@@ -21,58 +14,44 @@ def _label(score: float) -> str:
     return "Reach"
 
 
-def build_explanation(
-    job_vector: Dict[str, float],
-    resume_vector: Dict[str, float],
-    required_skills: List[str],
-    engine_out: Tuple[float, Dict[str, float]],
+def render(
+    result: kernel.MatchResult,
     evidence: Dict[str, Any],
-    cluster_map: Dict[str, Dict[str, Any]],
+    engine_out: Optional[Tuple[float, Dict[str, float]]] = None,
+    labels: Optional[Mapping[int, str]] = None,
 ) -> Dict[str, Any]:
-    score, terms = engine_out
-    best_fit: List[Dict[str, Any]] = []
-    gaps: List[Dict[str, Any]] = []
+    """Turn a kernel result into the API explanation payload.
+
+    ``labels`` names skill ids as the documents spelled them (see
+    :func:`app.scoring.features.labels`); ids without one use the taxonomy name.
+    """
+    score, terms = engine_out if engine_out is not None else (result.score, result.terms)
+    vocab = get_vocabulary()
 
-    for skill in set(job_vector) & set(resume_vector):
-        contrib = job_vector[skill] * resume_vector[skill]
+    def name(sid: int) -> str:
+        return vocab.label(sid, labels)
+
+    best_fit: List[Dict[str, Any]] = []
+    for sid, contrib in result.best_fit:
+        skill = name(sid)
         best_fit.append({
             "skill": skill,
             "contribution": contrib,
             "evidence": evidence.get(skill, {}),
         })
-    best_fit.sort(key=lambda x: x["contribution"], reverse=True)
-    best_fit = best_fit[:5]
 
-    missing_required = [s for s in required_skills if resume_vector.get(s, 0.0) == 0.0]
-    missing_required.sort(key=lambda s: job_vector.get(s, 0.0), reverse=True)
-    for s in missing_required:
-        gaps.append({"skill": s, "required": True})
-    if len(gaps) < 5:
-        others = [s for s in job_vector if resume_vector.get(s, 0.0) == 0.0 and s not in missing_required]
-        others.sort(key=lambda s: job_vector.get(s, 0.0), reverse=True)
-        for s in others:
-            gaps.append({"skill": s, "required": False})
-            if len(gaps) == 5:
-                break
+    gaps: List[Dict[str, Any]] = [{"skill": s, "required": True} for s in result.missing_required]
+    gaps.extend({"skill": name(sid), "required": False} for sid in result.other_gaps)
 
-    clusters: List[Dict[str, Any]] = []
-    for name, cl in cluster_map.items():
-        align = _cosine(cl.get("resume", {}), cl.get("job", {}))
-        r_vec = cl.get("resume", {})
-        j_vec = cl.get("job", {})
-        shared = set(r_vec) & set(j_vec)
-        examples = sorted(shared, key=lambda s: j_vec[s] * r_vec[s], reverse=True)
-        examples = examples[:3]
-        gap_skills = [s for s in j_vec if s not in r_vec]
-        gap_skills.sort(key=lambda s: j_vec[s], reverse=True)
-        clusters.append(
-            {
-                "cluster": name,
-                "align_pct": max(0.0, align) * 100.0,
-                "best_examples": examples,
-                "gaps": gap_skills[:3],
-            }
-        )
+    clusters: List[Dict[str, Any]] = [
+        {
+            "cluster": cl.name,
+            "align_pct": max(0.0, cl.align) * 100.0,
+            "best_examples": [name(sid) for sid in cl.examples],
+            "gaps": [name(sid) for sid in cl.gaps],
+        }
+        for cl in result.clusters
+    ]
 
     return {
         "score": score,
@@ -82,3 +61,19 @@ def build_explanation(
         "clusters": clusters,
         "terms": terms,
     }
+
+
+def build_explanation(
+    job_vector: VectorLike,
+    resume_vector: VectorLike,
+    required_skills: List[str],
+    engine_out: Tuple[float, Dict[str, float]],
+    evidence: Dict[str, Any],
+    cluster_map: Dict[str, Dict[str, Any]],
+) -> Dict[str, Any]:
+    labels: Dict[int, str] = {}
+    # resume first: shared skills are named as the resume spells them
+    resume = as_vector(resume_vector, labels=labels)
+    job = as_vector(job_vector, labels=labels)
+    result = kernel.run(resume, job, required_skills, 0.0, cluster_map)
+    return render(result, evidence, engine_out, labels)
@@ -0,0 +1,101 @@
+"""Per-document match features, computed once when a document is ingested.
+
+A stored job or resume carries its normalized :class:`SkillVector`, that
+vector sliced by taxonomy cluster, and whatever else the kernel needs
+(required skills for jobs, evidence for resumes). Matching two stored
+documents then only pairs the cluster slices and runs the kernel.
+"""
+
+import math
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from . import kernel
+from .clusters import ClusterSplit, combine, split_by_cluster
+from .skill_vector import SkillVector, SkillVocabulary, get_vocabulary
+from .vectors import IdfTable, job_skill_weights, resume_skill_weights
+
+
+@dataclass
+class Features:
+    vector: SkillVector
+    clusters: ClusterSplit
+    required: List[str] = field(default_factory=list)
+    evidence: Dict[str, Any] = field(default_factory=dict)
+    # the document's own spelling of each skill id, for explanations
+    labels: Dict[int, str] = field(default_factory=dict)
+
+
+def posting_text(job: Dict[str, Any]) -> str:
+    return (
+        job.get("title", "")
+        + "\n"
+        + "\n".join(
+            job.get("responsibilities", [])
+            + job.get("required_skills", [])
+            + job.get("preferred_skills", [])
+        )
+    )
+
+
+def job_features(
+    job: Dict[str, Any],
+    idf: Optional[IdfTable] = None,
+    vocab: Optional[SkillVocabulary] = None,
+) -> Features:
+    vocab = vocab or get_vocabulary()
+    weights = job_skill_weights(
+        posting_text(job),
+        job.get("required_skills", []),
+        job.get("preferred_skills", []) + job.get("mentioned_skills", []),
+        idf,
+    )
+    labels: Dict[int, str] = {}
+    vec = SkillVector.from_dict(weights, vocab, labels)
+    return Features(
+        vec, split_by_cluster(vec, vocab), list(job.get("required_skills", [])), labels=labels
+    )
+
+
+def resume_features(
+    resume: Dict[str, Any],
+    lambda_: float = 0.03,
+    reference: Optional[date] = None,
+    vocab: Optional[SkillVocabulary] = None,
+) -> Features:
+    """Features for a parsed resume; ``skill_instances`` wins over bare ``skills``.
+
+    Bare skills (what the resume parser returns) are weighted equally.
+    """
+    vocab = vocab or get_vocabulary()
+    instances = resume.get("skill_instances")
+    bare = [{"name": s} for s in resume.get("skills", [])]
+    weights, evidence = resume_skill_weights(instances or bare, lambda_, reference)
+    if not instances and weights:
+        # bare skills carry no dates, so tenure weighting would zero every one
+        weights = dict.fromkeys(weights, 1.0 / math.sqrt(len(weights)))
+    labels: Dict[int, str] = {}
+    vec = SkillVector.from_dict(weights, vocab, labels)
+    return Features(vec, split_by_cluster(vec, vocab), evidence=evidence, labels=labels)
+
+
+def labels(resume: Features, job: Features) -> Dict[int, str]:
+    """Skill names for explaining a match; the resume's spelling wins, matching evidence keys."""
+    return {**job.labels, **resume.labels}
+
+
+def run(
+    resume: Features,
+    job: Features,
+    level_gap: float = 0.0,
+    *,
+    vocab: Optional[SkillVocabulary] = None,
+    **params: float,
+) -> kernel.MatchResult:
+    """Run the kernel on two precomputed feature sets."""
+    vocab = vocab or get_vocabulary()
+    clusters = combine(job.clusters, resume.clusters, job.vector.total, vocab)
+    return kernel.run(
+        resume.vector, job.vector, job.required, level_gap, clusters, vocab=vocab, **params
+    )
@@ -0,0 +1,152 @@
+"""Inverted index over stored jobs for top-K recommendation.
+
+Each skill id maps to postings ``{slot: weight / |job|}``, where a slot is a
+dense position assigned to every indexed job. Because penalties are never
+negative, ``score_pair`` is bounded above by the base cosine, and the base
+cosine of every job sharing a skill with the resume is one sparse
+accumulation over the resume's posting lists. ``top_k`` accumulates those
+bounds term-at-a-time with NumPy, then scores jobs exactly with
+``engine.score_pair`` in descending bound order and stops as soon as the
+next bound cannot beat the current K-th score (the MaxScore stopping rule).
+
+Jobs that share no positively weighted skill with the resume score zero and
+are never returned.
+"""
+
+import heapq
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from . import engine
+from .clusters import cluster_map
+from .skill_vector import SkillVector, SkillVocabulary, get_vocabulary
+
+# bounds are summed in a different order than the exact cosine; never prune on rounding
+_SLACK = 1e-6
+
+
+class _Postings:
+    __slots__ = ("weights", "_arrays")
+
+    def __init__(self):
+        self.weights: Dict[int, float] = {}
+        self._arrays: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def add(self, slot: int, weight: float) -> None:
+        self.weights[slot] = weight
+        self._arrays = None
+
+    def remove(self, slot: int) -> None:
+        self.weights.pop(slot, None)
+        self._arrays = None
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Slots and weights as arrays, rebuilt only after the list changed."""
+        arrays = self._arrays
+        if arrays is None:
+            arrays = (
+                np.fromiter(self.weights.keys(), dtype=np.int64, count=len(self.weights)),
+                np.fromiter(self.weights.values(), dtype=np.float64, count=len(self.weights)),
+            )
+            self._arrays = arrays
+        return arrays
+
+
+class JobIndex:
+    def __init__(self, vocab: Optional[SkillVocabulary] = None):
+        self.vocab = vocab or get_vocabulary()
+        self._postings: Dict[int, _Postings] = {}
+        self._jobs: Dict[int, Tuple[int, SkillVector, List[str]]] = {}
+        self._slot_jobs: List[Optional[int]] = []
+        self._free: List[int] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, job_id: int) -> bool:
+        return job_id in self._jobs
+
+    def add(self, job_id: int, vector: SkillVector, required: List[str]) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._remove(job_id)
+            if self._free:
+                slot = self._free.pop()
+                self._slot_jobs[slot] = job_id
+            else:
+                slot = len(self._slot_jobs)
+                self._slot_jobs.append(job_id)
+            self._jobs[job_id] = (slot, vector, list(required))
+            norm = vector.norm
+            if norm == 0:
+                return
+            for sid, w in vector:
+                if w > 0:
+                    self._postings.setdefault(sid, _Postings()).add(slot, w / norm)
+
+    def remove(self, job_id: int) -> None:
+        with self._lock:
+            self._remove(job_id)
+
+    def _remove(self, job_id: int) -> None:
+        entry = self._jobs.pop(job_id, None)
+        if entry is None:
+            return
+        slot, vector, _ = entry
+        for sid, _ in vector:
+            postings = self._postings.get(sid)
+            if postings is None:
+                continue
+            postings.remove(slot)
+            if not postings.weights:
+                del self._postings[sid]
+        self._slot_jobs[slot] = None
+        self._free.append(slot)
+
+    def top_k(self, resume: SkillVector, k: int = 10, **params: float) -> List[Tuple[int, float]]:
+        """Return up to ``k`` ``(job_id, score)`` pairs, best score then lowest id first."""
+        if k <= 0 or resume.norm == 0:
+            return []
+        # exact scoring is the slow part; it runs on a snapshot so adds and
+        # removes only wait for the bound accumulation
+        with self._lock:
+            bounds, candidates = self._candidates(resume)
+
+        heap: List[Tuple[float, int]] = []  # (score, -job_id) min-heap of the current top k
+        for bound, (job_id, job_vec, required) in zip(bounds.tolist(), candidates):
+            if len(heap) == k and bound * 100.0 + _SLACK < heap[0][0]:
+                break
+            score, _ = engine.score_pair(
+                resume, job_vec, required, 0.0, cluster_map(job_vec, resume, self.vocab), **params
+            )
+            item = (score, -job_id)
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+        return [(-neg_id, score) for score, neg_id in sorted(heap, reverse=True)]
+
+    def _candidates(
+        self, resume: SkillVector
+    ) -> Tuple[np.ndarray, List[Tuple[int, SkillVector, List[str]]]]:
+        """Bounds and ``(job_id, vector, required)`` of every overlapping job, best bound first."""
+        bounds = np.zeros(len(self._slot_jobs))
+        r_norm = resume.norm
+        for sid, w in resume:
+            postings = self._postings.get(sid)
+            if w > 0 and postings is not None:
+                slots, weights = postings.arrays()
+                # a slot appears at most once per list, so fancy-index add is safe
+                bounds[slots] += (w / r_norm) * weights
+        candidates = np.flatnonzero(bounds > 0)
+        order = candidates[np.argsort(-bounds[candidates], kind="stable")]
+        jobs = []
+        for slot in order.tolist():
+            job_id = self._slot_jobs[slot]
+            _, job_vec, required = self._jobs[job_id]
+            jobs.append((job_id, job_vec, required))
+        return bounds[order], jobs
@@ -0,0 +1,152 @@
+"""Single-pass score-and-explain kernel.
+
+``score_pair`` and ``build_explanation`` used to walk the same vectors three
+or four times between them (global cosine, one cosine per cluster, then the
+same cluster cosines again plus full sorts for the top-k lists). ``run``
+walks the job/resume pair and each cluster pair once and collects the score
+terms, per-cluster alignments, best-fit contributions and gaps together;
+top-k lists are selected with ``heapq.nlargest``, which keeps ``sorted``'s
+tie order.
+"""
+
+import heapq
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
+
+from .skill_vector import SkillVector, SkillVocabulary, VectorLike, as_vector, get_vocabulary
+
+TOP_FIT = 5
+TOP_GAPS = 5
+TOP_CLUSTER = 3
+
+_by_weight = itemgetter(1)
+
+
+@dataclass
+class ClusterResult:
+    name: str
+    align: float
+    examples: List[int] = field(default_factory=list)
+    gaps: List[int] = field(default_factory=list)
+
+
+@dataclass
+class MatchResult:
+    score: float
+    terms: Dict[str, float]
+    best_fit: List[Tuple[int, float]]
+    missing_required: List[str]
+    other_gaps: List[int]
+    clusters: List[ClusterResult]
+
+
+def _walk(job: SkillVector, resume: SkillVector):
+    """Merge-join ``job`` against ``resume`` once.
+
+    Returns the dot product, ``(id, contribution)`` for shared ids and
+    ``(id, job weight)`` for job ids the resume lacks or weights at zero.
+    """
+    j_ids, j_w, r_ids, r_w = job.ids, job.weights, resume.ids, resume.weights
+    nr = len(r_ids)
+    dot = 0.0
+    shared: List[Tuple[int, float]] = []
+    unmet: List[Tuple[int, float]] = []
+    k = 0
+    for i in range(len(j_ids)):
+        sid = j_ids[i]
+        while k < nr and r_ids[k] < sid:
+            k += 1
+        if k < nr and r_ids[k] == sid:
+            c = j_w[i] * r_w[k]
+            dot += c
+            shared.append((sid, c))
+            if r_w[k] == 0.0:
+                unmet.append((sid, j_w[i]))
+        else:
+            unmet.append((sid, j_w[i]))
+    return dot, shared, unmet
+
+
+def _cosine(dot: float, a: SkillVector, b: SkillVector) -> float:
+    na, nb = a.norm, b.norm
+    if na == 0 or nb == 0:
+        return 0.0
+    return dot / (na * nb)
+
+
+def run(
+    resume_vector: VectorLike,
+    job_vector: VectorLike,
+    required_skills: List[str],
+    level_gap: float,
+    cluster_map: Dict[str, Dict[str, Any]],
+    *,
+    delta: float = 0.35,
+    eta: float = 0.15,
+    eps: float = 0.05,
+    vocab: Optional[SkillVocabulary] = None,
+) -> MatchResult:
+    vocab = vocab or get_vocabulary()
+    resume = as_vector(resume_vector, vocab)
+    job = as_vector(job_vector, vocab)
+
+    dot, shared, unmet = _walk(job, resume)
+    base = _cosine(dot, resume, job)
+
+    req_ids = [vocab.id_of(s) for s in required_skills]
+    total_req = 0.0
+    missing = 0.0
+    missing_required: List[Tuple[str, float]] = []
+    for s, sid in zip(required_skills, req_ids):
+        w = job.get(sid)
+        total_req += w
+        if resume.get(sid) == 0.0:
+            missing += w
+            missing_required.append((s, w))
+    pcrit = missing / (total_req or 1.0)
+
+    clusters: List[ClusterResult] = []
+    cluster_pen = 0.0
+    for name, cl in cluster_map.items():
+        r_vec = as_vector(cl.get("resume", {}), vocab)
+        j_vec = as_vector(cl.get("job", {}), vocab)
+        c_dot, c_shared, _ = _walk(j_vec, r_vec)
+        align = _cosine(c_dot, r_vec, j_vec)
+        cluster_pen += cl.get("weight", 0.0) * (1.0 - align)
+        c_gaps = [(sid, w) for sid, w in j_vec if sid not in r_vec]
+        clusters.append(
+            ClusterResult(
+                name,
+                align,
+                [sid for sid, _ in heapq.nlargest(TOP_CLUSTER, c_shared, key=_by_weight)],
+                [sid for sid, _ in heapq.nlargest(TOP_CLUSTER, c_gaps, key=_by_weight)],
+            )
+        )
+
+    level_pen = abs(level_gap)
+    score = base - delta * pcrit - eta * cluster_pen - eps * level_pen
+    score = max(0.0, min(1.0, score)) * 100.0
+    terms = {
+        "base": base,
+        "pcrit": pcrit,
+        "cluster_penalty": cluster_pen,
+        "level_penalty": eps * level_pen,
+    }
+
+    missing_names = [s for s, _ in sorted(missing_required, key=_by_weight, reverse=True)]
+    other_gaps: List[int] = []
+    room = TOP_GAPS - len(missing_names)
+    if room > 0:
+        missing_ids = set(req_ids)
+        candidates = [(sid, w) for sid, w in unmet if sid not in missing_ids]
+        other_gaps = [sid for sid, _ in heapq.nlargest(room, candidates, key=_by_weight)]
+
+    return MatchResult(
+        score=score,
+        terms=terms,
+        best_fit=heapq.nlargest(TOP_FIT, shared, key=_by_weight),
+        missing_required=missing_names,
+        other_gaps=other_gaps,
+        clusters=clusters,
+    )
@@ -0,0 +1,204 @@
+"""Compact sparse skill vectors keyed by integer skill ids.
+
+:class:`SkillVocabulary` maps skill strings to ids in a fixed range without
+storing anything per string: taxonomy skills (any spelling the taxonomy
+resolves) take their taxonomy id, every other string is hashed into a fixed
+block of ids above those, so memory and batch width do not grow with the
+free-text skills users send. A :class:`SkillVector` stores sorted ``int32``
+ids with ``float32`` weights in ``array`` buffers and caches its norm, so dot
+products are merge-joins with no hashing.
+"""
+
+import hashlib
+import math
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from ..taxonomy.index import OTHER_CLUSTER, TaxonomyIndex, get_index
+
+# ids for strings outside the taxonomy; distinct strings rarely share one
+HASH_BUCKETS = 1 << 20
+
+
+class SkillVocabulary:
+    """Fixed id space: taxonomy ids first, then ``buckets`` hashed ids.
+
+    Spellings the taxonomy resolves (case, aliases) share the canonical
+    skill's id and cluster. Any other string is hashed, so two distinct
+    unknown skills can collide into one id; hashed ids are in the Other
+    cluster and have no stored name; callers that display them keep the
+    document's own strings (see ``labels`` in :meth:`SkillVector.from_dict`).
+    """
+
+    def __init__(self, taxonomy: Optional[TaxonomyIndex] = None, buckets: int = HASH_BUCKETS):
+        self.taxonomy = taxonomy or get_index()
+        self.cluster_names: List[str] = list(self.taxonomy.clusters) + [OTHER_CLUSTER]
+        self._other = len(self.cluster_names) - 1
+        self._known = len(self.taxonomy)
+        self.buckets = buckets
+
+    def intern(self, name: str) -> int:
+        sid = self.taxonomy.lookup(name)
+        if sid is not None:
+            return sid
+        digest = hashlib.blake2b(name.encode(), digest_size=8).digest()
+        return self._known + int.from_bytes(digest, "little") % self.buckets
+
+    id_of = intern
+
+    def name(self, sid: int) -> Optional[str]:
+        """Canonical taxonomy name, or ``None`` for a hashed id."""
+        return self.taxonomy.names[sid] if sid < self._known else None
+
+    def label(self, sid: int, labels: Optional[Mapping[int, str]] = None) -> str:
+        """Display name: the document's spelling from ``labels``, else the canonical name."""
+        text = labels.get(sid) if labels else None
+        return text or self.name(sid) or f"skill #{sid}"
+
+    def cluster(self, sid: int) -> int:
+        return self.taxonomy.skill_cluster[sid] if sid < self._known else self._other
+
+    def cluster_name(self, sid: int) -> str:
+        return self.cluster_names[self.cluster(sid)]
+
+    def cluster_array(self, ids):
+        """``int32`` cluster index of each id in the integer array ``ids``."""
+        import numpy as np
+
+        ids = np.asarray(ids, dtype=np.int64)
+        known = np.asarray(self.taxonomy.skill_cluster, dtype=np.int32)
+        out = np.full(len(ids), self._other, dtype=np.int32)
+        mask = ids < self._known
+        out[mask] = known[ids[mask]]
+        return out
+
+    def __len__(self) -> int:
+        return self._known + self.buckets
+
+
+_vocabulary: Optional[SkillVocabulary] = None
+_vocabulary_lock = threading.Lock()
+
+
+def get_vocabulary() -> SkillVocabulary:
+    global _vocabulary
+    if _vocabulary is None:
+        with _vocabulary_lock:
+            if _vocabulary is None:
+                _vocabulary = SkillVocabulary()
+    return _vocabulary
+
+
+class SkillVector:
+    __slots__ = ("ids", "weights", "_norm", "_total")
+
+    def __init__(self, ids: array, weights: array):
+        self.ids = ids
+        self.weights = weights
+        self._norm: Optional[float] = None
+        self._total: Optional[float] = None
+
+    @classmethod
+    def from_pairs(cls, pairs: List[Tuple[int, float]]) -> "SkillVector":
+        """Build from ``(id, weight)`` pairs; repeated ids are summed."""
+        merged: Dict[int, float] = {}
+        for sid, w in pairs:
+            merged[sid] = merged.get(sid, 0.0) + w
+        ids = sorted(merged)
+        return cls(array("i", ids), array("f", [merged[i] for i in ids]))
+
+    @classmethod
+    def from_dict(
+        cls,
+        vec: Mapping[str, float],
+        vocab: Optional[SkillVocabulary] = None,
+        labels: Optional[Dict[int, str]] = None,
+    ) -> "SkillVector":
+        """Build from ``{skill: weight}``; spellings sharing an id are summed.
+
+        ``labels``, if given, gets each new id's first spelling in ``vec``.
+        """
+        vocab = vocab or get_vocabulary()
+        pairs = [(vocab.intern(k), float(w)) for k, w in vec.items()]
+        if labels is not None:
+            for k, (sid, _) in zip(vec, pairs):
+                labels.setdefault(sid, k)
+        return cls.from_pairs(pairs)
+
+    def to_dict(
+        self, vocab: Optional[SkillVocabulary] = None, labels: Optional[Mapping[int, str]] = None
+    ) -> Dict[str, float]:
+        """``{name: weight}`` with names from :meth:`SkillVocabulary.label`."""
+        vocab = vocab or get_vocabulary()
+        return {vocab.label(i, labels): w for i, w in zip(self.ids, self.weights)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Tuple[int, float]]:
+        return zip(self.ids, self.weights)
+
+    def __contains__(self, sid: int) -> bool:
+        i = bisect_left(self.ids, sid)
+        return i < len(self.ids) and self.ids[i] == sid
+
+    def get(self, sid: Optional[int], default: float = 0.0) -> float:
+        if sid is None:
+            return default
+        i = bisect_left(self.ids, sid)
+        if i < len(self.ids) and self.ids[i] == sid:
+            return self.weights[i]
+        return default
+
+    @property
+    def norm(self) -> float:
+        if self._norm is None:
+            self._norm = math.sqrt(sum(w * w for w in self.weights))
+        return self._norm
+
+    @property
+    def total(self) -> float:
+        if self._total is None:
+            self._total = math.fsum(self.weights)
+        return self._total
+
+    def dot(self, other: "SkillVector") -> float:
+        a_ids, a_w, b_ids, b_w = self.ids, self.weights, other.ids, other.weights
+        i = j = 0
+        na, nb = len(a_ids), len(b_ids)
+        total = 0.0
+        while i < na and j < nb:
+            a, b = a_ids[i], b_ids[j]
+            if a == b:
+                total += a_w[i] * b_w[j]
+                i += 1
+                j += 1
+            elif a < b:
+                i += 1
+            else:
+                j += 1
+        return total
+
+    def cosine(self, other: "SkillVector") -> float:
+        na, nb = self.norm, other.norm
+        if na == 0 or nb == 0:
+            return 0.0
+        return self.dot(other) / (na * nb)
+
+
+EMPTY = SkillVector(array("i"), array("f"))
+
+VectorLike = Union[SkillVector, Mapping[str, float]]
+
+
+def as_vector(
+    vec: VectorLike,
+    vocab: Optional[SkillVocabulary] = None,
+    labels: Optional[Dict[int, str]] = None,
+) -> SkillVector:
+    """Accept either a :class:`SkillVector` or a legacy ``{skill: weight}`` dict."""
+    if isinstance(vec, SkillVector):
+        return vec
+    return SkillVector.from_dict(vec, vocab, labels)
@@ -1,17 +1,90 @@
+import json
 import math
-from datetime import datetime
-from typing import Any, Dict, List, Tuple
+import re
+from collections import Counter
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from sklearn.feature_extraction.text import TfidfVectorizer
+from .skill_vector import SkillVector
 
+# Lower-cased word tokens; "+" and "#" stay attached so C++ and C# survive.
+_TOKEN_RE = re.compile(r"\w[\w+#]*")
 
-def job_skill_weights(posting_text: str, required: List[str], preferred: List[str]) -> Dict[str, float]:
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def term_counts(text: str, terms: List[str]) -> List[int]:
+    """Count whole-token occurrences of each term, including multi-word terms."""
+    grams: Dict[Tuple[str, ...], List[int]] = {}
+    for i, term in enumerate(terms):
+        key = tuple(_tokens(term))
+        if key:
+            grams.setdefault(key, []).append(i)
+    counts = [0] * len(terms)
+    if not grams:
+        return counts
+    tokens = _tokens(text)
+    for n in {len(k) for k in grams}:
+        seen = Counter(zip(*(tokens[k:] for k in range(n))))
+        for key, idxs in grams.items():
+            if len(key) == n and key in seen:
+                for i in idxs:
+                    counts[i] = seen[key]
+    return counts
+
+
+class IdfTable:
+    """Smoothed corpus IDF (``ln((1 + N) / (1 + df)) + 1``) per lower-cased term."""
+
+    __slots__ = ("idf", "default")
+
+    def __init__(self, idf: Dict[str, float], default: float):
+        self.idf = idf
+        self.default = default
+
+    @classmethod
+    def fit(cls, documents: Iterable[str], vocabulary: Iterable[str]) -> "IdfTable":
+        terms = list(dict.fromkeys(t.lower() for t in vocabulary))
+        df = [0] * len(terms)
+        n_docs = 0
+        for doc in documents:
+            n_docs += 1
+            for i, c in enumerate(term_counts(doc, terms)):
+                if c:
+                    df[i] += 1
+        idf = {t: math.log((1 + n_docs) / (1 + d)) + 1.0 for t, d in zip(terms, df)}
+        return cls(idf, math.log(1 + n_docs) + 1.0)
+
+    def get(self, term: str) -> float:
+        return self.idf.get(term.lower(), self.default)
+
+    def save(self, path: Path) -> None:
+        path.write_text(json.dumps({"default": self.default, "idf": self.idf}))
+
+    @classmethod
+    def load(cls, path: Path) -> "IdfTable":
+        data = json.loads(path.read_text())
+        return cls(data["idf"], data["default"])
+
+
+def job_skill_weights(
+    posting_text: str,
+    required: List[str],
+    preferred: List[str],
+    idf: Optional[IdfTable] = None,
+) -> Dict[str, float]:
     skills = list(dict.fromkeys(required + preferred))
     if not skills:
         return {}
-    vect = TfidfVectorizer(vocabulary=[s.lower() for s in skills])
-    tfidf = vect.fit_transform([posting_text.lower()]).toarray()[0]
-    weights = {skill: tfidf[i] for i, skill in enumerate(skills)}
+    tf = term_counts(posting_text, skills)
+    if idf is not None:
+        tf = [c * idf.get(s) for c, s in zip(tf, skills)]
+    norm = math.sqrt(sum(v * v for v in tf)) or 1.0
+    weights = {skill: v / norm for skill, v in zip(skills, tf)}
     for skill in required:
         weights[skill] = weights.get(skill, 0) + 0.4
     for skill in preferred:
@@ -20,23 +93,40 @@ def job_skill_weights(posting_text: str, required: List[str], preferred: List[st
     return {k: v / total for k, v in weights.items()}
 
 
-def resume_skill_weights(instances: List[Dict[str, Any]], lambda_: float = 0.03) -> Tuple[Dict[str, float], Dict[str, Any]]:
+@lru_cache(maxsize=4096)
+def _month_index(value: str) -> int:
+    """Months since year 0 for a ``YYYY-MM`` string."""
+    year, _, month = value.partition("-")
+    if not (year.isdigit() and month.isdigit() and 1 <= int(month) <= 12):
+        raise ValueError(f"time data {value!r} does not match format '%Y-%m'")
+    return int(year) * 12 + int(month) - 1
+
+
+def resume_skill_weights(
+    instances: List[Dict[str, Any]],
+    lambda_: float = 0.03,
+    reference: Optional[date] = None,
+) -> Tuple[Dict[str, float], Dict[str, Any]]:
+    """Tenure-weighted, recency-decayed skill weights.
+
+    Recency is measured against ``reference`` (default: today, UTC); pass a
+    fixed date to make the result reproducible and cacheable.
+    """
     weights: Dict[str, float] = {}
     evidence: Dict[str, Any] = {}
-    now = datetime.utcnow()
+    if reference is None:
+        reference = datetime.utcnow()
+    now_month = reference.year * 12 + reference.month - 1
     for inst in instances:
         skill = inst["name"]
         start = inst.get("start")
         end = inst.get("end") or start
         months_since = 6
         if end:
-            end_dt = datetime.strptime(end, "%Y-%m")
-            months_since = (now.year - end_dt.year) * 12 + (now.month - end_dt.month)
+            months_since = now_month - _month_index(end)
         tenure_months = 0
         if start and end:
-            start_dt = datetime.strptime(start, "%Y-%m")
-            end_dt = datetime.strptime(end, "%Y-%m")
-            tenure_months = (end_dt.year - start_dt.year) * 12 + (end_dt.month - start_dt.month)
+            tenure_months = _month_index(end) - _month_index(start)
         tenure_years = tenure_months / 12.0
         decay = math.exp(-lambda_ * months_since)
         weight = tenure_years * decay
@@ -50,8 +140,8 @@ def resume_skill_weights(instances: List[Dict[str, Any]], lambda_: float = 0.03)
     return weights, evidence
 
 
-def build_vectors(posting_text: str, required: List[str], preferred: List[str], resume_instances: List[Dict[str, Any]], lambda_: float = 0.03):
-    job = job_skill_weights(posting_text, required, preferred)
+def build_vectors(posting_text: str, required: List[str], preferred: List[str], resume_instances: List[Dict[str, Any]], lambda_: float = 0.03, idf: Optional[IdfTable] = None):
+    """Return ``(job, resume, evidence)`` with both vectors as :class:`SkillVector`."""
+    job = job_skill_weights(posting_text, required, preferred, idf)
     resume, evidence = resume_skill_weights(resume_instances, lambda_)
-    return job, resume, evidence
-
+    return SkillVector.from_dict(job), SkillVector.from_dict(resume), evidence
@@ -0,0 +1,152 @@
+"""In-memory document store with per-entry expiry.
+
+Parsed resumes, jobs and match results live here keyed by doc id, together
+with their owner and precomputed match features. Entries are kept until
+removed, unless :meth:`DocumentStore.expire` gives them a deadline. Deadlines
+sit in one min-heap, and a single daemon sweeper thread sleeps until the
+earliest one and removes whatever is due. The thread is started on the first
+``expire`` call. Lookups treat an overdue entry as gone even before the
+sweeper reaches it, so expiry never depends on sweeper latency. Shortening a
+deadline pushes a new heap entry; superseded entries are skipped when popped.
+"""
+
+import heapq
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class Document:
+    kind: str
+    data: Dict[str, Any]
+    owner: str
+    # Features for resumes and jobs; None for matches
+    features: Any = None
+    # parse-cache key of the payload, released when the document goes
+    key: Optional[str] = None
+    expires_at: Optional[float] = None
+
+
+class DocumentStore:
+    def __init__(
+        self,
+        on_remove: Optional[Callable[[int, Document], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._docs: Dict[int, Document] = {}
+        self._heap: List[Tuple[float, int]] = []
+        self._cond = threading.Condition()
+        self._on_remove = on_remove
+        self._clock = clock
+        self._sweeper: Optional[threading.Thread] = None
+        self._closed = False
+
+    def _live(self, doc: Optional[Document]) -> Optional[Document]:
+        if doc is None or (doc.expires_at is not None and doc.expires_at <= self._clock()):
+            return None
+        return doc
+
+    def add(
+        self,
+        doc_id: int,
+        kind: str,
+        data: Dict[str, Any],
+        owner: str,
+        features: Any = None,
+        key: Optional[str] = None,
+    ) -> None:
+        with self._cond:
+            self._docs[doc_id] = Document(kind, data, owner, features, key)
+
+    def get(self, doc_id: int, kind: Optional[str] = None) -> Optional[Document]:
+        """The live document with ``doc_id`` (of ``kind``, if given), else ``None``."""
+        doc = self._live(self._docs.get(doc_id))
+        if doc is None or (kind is not None and doc.kind != kind):
+            return None
+        return doc
+
+    def __contains__(self, doc_id: int) -> bool:
+        return self.get(doc_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def expire(self, doc_ids: Iterable[int], ttl: float) -> None:
+        """Remove ``doc_ids`` within ``ttl`` seconds; an earlier deadline is kept."""
+        with self._cond:
+            deadline = self._clock() + ttl
+            earliest = self._heap[0][0] if self._heap else None
+            for doc_id in doc_ids:
+                doc = self._docs.get(doc_id)
+                if doc is None or (doc.expires_at is not None and doc.expires_at <= deadline):
+                    continue
+                doc.expires_at = deadline
+                heapq.heappush(self._heap, (deadline, doc_id))
+            if self._sweeper is None and not self._closed:
+                self._sweeper = threading.Thread(
+                    target=self._sweep_forever, name="doc-sweeper", daemon=True
+                )
+                self._sweeper.start()
+            elif earliest is None or deadline < earliest:
+                self._cond.notify()
+
+    def _pop_due(self) -> List[Tuple[int, Document]]:
+        now = self._clock()
+        removed = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, doc_id = heapq.heappop(self._heap)
+            doc = self._docs.get(doc_id)
+            if doc is not None and doc.expires_at == deadline:
+                del self._docs[doc_id]
+                removed.append((doc_id, doc))
+        return removed
+
+    def _notify(self, removed: List[Tuple[int, Document]]) -> None:
+        # outside the store lock: callbacks take their own locks
+        if self._on_remove is not None:
+            for doc_id, doc in removed:
+                self._on_remove(doc_id, doc)
+
+    def sweep(self) -> int:
+        """Remove every overdue document now; returns how many were removed."""
+        with self._cond:
+            removed = self._pop_due()
+        self._notify(removed)
+        return len(removed)
+
+    def _sweep_forever(self) -> None:
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                wait = self._heap[0][0] - self._clock() if self._heap else None
+                if wait is None or wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                removed = self._pop_due()
+            self._notify(removed)
+
+    def remove(self, doc_id: int) -> Optional[Document]:
+        with self._cond:
+            doc = self._docs.pop(doc_id, None)
+        if doc is not None:
+            self._notify([(doc_id, doc)])
+        return doc
+
+    def remove_owner(self, owner: str) -> int:
+        """Remove every document owned by ``owner``; returns how many were removed."""
+        with self._cond:
+            removed = [(i, d) for i, d in self._docs.items() if d.owner == owner]
+            for doc_id, _ in removed:
+                del self._docs[doc_id]
+        self._notify(removed)
+        return len(removed)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=1)
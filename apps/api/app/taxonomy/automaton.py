@@ -0,0 +1,158 @@
+"""Aho–Corasick matcher for every skill name and alias in the taxonomy.
+
+One pass over a document reports each taxonomy mention as
+``(skill_id, start, end)``. Matching is case-insensitive and only accepts
+hits on word boundaries; overlapping hits resolve leftmost-longest, so
+"Machine Learning Engineer" yields Machine Learning rather than a shorter
+alias inside it.
+
+Aliases of :data:`_SHORT` characters or fewer ("go", "cv", "ml") are also
+common words and abbreviations, so they need more evidence: the exact
+spelling (the canonical name's casing, "Go", or else the upper-case
+acronym, "ML"), no hyphen joining them to a neighbouring word ("Go-Jek"),
+and a technical context, meaning another, longer skill mention on the same
+line. "Go to market strategy lead" and a bare "CV" therefore yield nothing.
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .index import TaxonomyIndex, get_index
+
+_SHORT = 2
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _hyphen_joined(text: str, start: int, end: int) -> bool:
+    before = start > 1 and text[start - 1] == "-" and _is_word(text[start - 2])
+    after = end + 1 < len(text) and text[end] == "-" and _is_word(text[end + 1])
+    return before or after
+
+
+def _fold(text: str) -> str:
+    lower = text.lower()
+    if len(lower) == len(text):
+        return lower
+    # a few characters expand when lower-cased; keep offsets aligned
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+class SkillAutomaton:
+    """Matcher for lower-cased ``patterns``; ``names`` are the canonical names by id.
+
+    ``names`` gives short patterns that are a canonical name their accepted
+    casing; every other short pattern must be written in upper case.
+    """
+
+    def __init__(self, patterns: Dict[str, int], names: Optional[List[str]] = None):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int, bool, bool]]] = [[]]
+        # exact spelling a short pattern must have in the text
+        self._short: Dict[str, str] = {}
+        for pattern, skill_id in patterns.items():
+            if pattern:
+                self._add(pattern, skill_id)
+            if 0 < len(pattern) <= _SHORT:
+                name = names[skill_id] if names is not None else ""
+                self._short[pattern] = name if name.lower() == pattern else pattern.upper()
+        self._link()
+
+    def _add(self, pattern: str, skill_id: int) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        # boundary checks only apply where the pattern itself starts/ends in a word char
+        self._out[node].append(
+            (len(pattern), skill_id, _is_word(pattern[0]), _is_word(pattern[-1]))
+        )
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def scan(self, text: str) -> List[Tuple[int, int, int]]:
+        """Return non-overlapping ``(skill_id, start, end)`` hits in text order."""
+        folded = _fold(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        n = len(text)
+        found: List[Tuple[int, int, int]] = []
+        node = 0
+        for i, ch in enumerate(folded):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            for length, skill_id, word_start, word_end in out[node]:
+                start = end - length
+                if word_start and start > 0 and _is_word(text[start - 1]):
+                    continue
+                if word_end and end < n and _is_word(text[end]):
+                    continue
+                if length <= _SHORT and (
+                    text[start:end] != self._short[folded[start:end]]
+                    or _hyphen_joined(text, start, end)
+                ):
+                    continue
+                found.append((start, -length, skill_id))
+
+        hits: List[Tuple[int, int, int]] = []
+        last_end = 0
+        for start, neg_len, skill_id in sorted(found):
+            if start >= last_end:
+                hits.append((skill_id, start, start - neg_len))
+                last_end = start - neg_len
+        if any(end - start <= _SHORT for _, start, end in hits):
+            hits = self._in_context(text, hits)
+        return hits
+
+    @staticmethod
+    def _in_context(text: str, hits: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+        """Drop short hits with no longer skill mention on the same line."""
+        lines: List[int] = []
+        line = pos = 0
+        for _, start, _ in hits:
+            line += text.count("\n", pos, start)
+            pos = start
+            lines.append(line)
+        technical = {ln for ln, (_, start, end) in zip(lines, hits) if end - start > _SHORT}
+        return [
+            hit for ln, hit in zip(lines, hits) if hit[2] - hit[1] > _SHORT or ln in technical
+        ]
+
+    def skill_ids(self, text: str) -> List[int]:
+        """Distinct skill ids mentioned in ``text``, in order of first mention."""
+        return list(dict.fromkeys(sid for sid, _, _ in self.scan(text)))
+
+
+def build_automaton(taxonomy: Optional[TaxonomyIndex] = None) -> SkillAutomaton:
+    taxonomy = taxonomy or get_index()
+    return SkillAutomaton(taxonomy.alias_to_id, taxonomy.names)
+
+
+@lru_cache(maxsize=1)
+def get_automaton() -> SkillAutomaton:
+    """Shared automaton over the bundled taxonomy."""
+    return build_automaton()
@@ -0,0 +1,177 @@
+"""Persisted taxonomy embedding matrix shared read-only by every worker.
+
+Row ``i`` holds the L2-normalized embedding of the ``i``-th skill in
+``skills.yaml``. Files are keyed by the YAML's hash plus the embedding
+model, so editing the taxonomy or switching providers never serves stale
+vectors; rebuilds reuse the rows of skills whose name did not change.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from .index import CACHE_DIR, get_index
+
+logger = logging.getLogger(__name__)
+
+# index_key() is 16 hex digits; "_" never occurs in a slug, so
+# "skills-<slug>_<key>" cannot also match a model whose slug extends <slug>
+_KEY_GLOB = "[0-9a-f]" * 16
+
+
+def index_key(taxonomy_hash: str, model: str) -> str:
+    digest = hashlib.sha256(f"{taxonomy_hash}\0{model}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _slug(model: str) -> str:
+    return "".join(c if c.isalnum() else "-" for c in model)
+
+
+def _paths(key: str, model: str, cache_dir: Path):
+    stem = cache_dir / f"skills-{_slug(model)}_{key}"
+    return stem.with_suffix(".npy"), stem.with_suffix(".json")
+
+
+def _model_files(model: str, cache_dir: Path, suffix: str = "*"):
+    """Index files of exactly ``model``, including ones named before the ``_`` separator."""
+    slug = _slug(model)
+    for sep in ("_", "-"):
+        yield from cache_dir.glob(f"skills-{slug}{sep}{_KEY_GLOB}{suffix}")
+
+
+def load_index(
+    names: List[str], model: str, taxonomy_hash: str, cache_dir: Path = CACHE_DIR
+) -> Optional[np.ndarray]:
+    """Memory-map a valid index for ``names`` read-only, or return ``None``."""
+    npy, manifest = _paths(index_key(taxonomy_hash, model), model, cache_dir)
+    if not npy.exists() or not manifest.exists():
+        return None
+    try:
+        meta = json.loads(manifest.read_text())
+        matrix = np.load(npy, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    if meta.get("names") != list(names) or matrix.shape[0] != len(names):
+        return None
+    return matrix
+
+
+def _previous_rows(model: str, cache_dir: Path):
+    """Collect name -> row from earlier indexes built with the same model."""
+    rows = {}
+    for manifest in sorted(_model_files(model, cache_dir, ".json")):
+        npy = manifest.with_suffix(".npy")
+        try:
+            meta = json.loads(manifest.read_text())
+            matrix = np.load(npy, mmap_mode="r")
+        except (OSError, ValueError):
+            continue
+        if meta.get("model") != model:
+            continue
+        for i, name in enumerate(meta.get("names", [])):
+            if i < matrix.shape[0]:
+                rows[name] = np.array(matrix[i])
+    return rows
+
+
+def build_index(
+    names: List[str],
+    embeddings_fn: Callable[[List[str]], List[List[float]]],
+    model: str,
+    taxonomy_hash: str,
+    cache_dir: Path = CACHE_DIR,
+    reuse: bool = True,
+) -> np.ndarray:
+    """Write the index for ``names`` and return it memory-mapped."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    key = index_key(taxonomy_hash, model)
+    npy, manifest = _paths(key, model, cache_dir)
+
+    previous = _previous_rows(model, cache_dir) if reuse else {}
+    todo = [n for n in dict.fromkeys(names) if n not in previous]
+    if todo:
+        fresh = np.asarray(embeddings_fn(todo), dtype=np.float32)
+        norms = np.linalg.norm(fresh, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        previous.update(zip(todo, fresh / norms))
+    matrix = np.ascontiguousarray(np.stack([previous[n] for n in names]), dtype=np.float32)
+
+    # write under temporary names so concurrent workers never see a partial file
+    tmp_npy = npy.with_name(f"{npy.stem}.{os.getpid()}.tmp.npy")
+    tmp_manifest = manifest.with_name(f"{manifest.stem}.{os.getpid()}.tmp.json")
+    np.save(tmp_npy, matrix)
+    tmp_manifest.write_text(json.dumps({"model": model, "names": list(names)}))
+    os.replace(tmp_npy, npy)
+    os.replace(tmp_manifest, manifest)
+
+    for stale in list(_model_files(model, cache_dir)):
+        if stale not in (npy, manifest) and ".tmp." not in stale.name:
+            stale.unlink(missing_ok=True)
+    return np.load(npy, mmap_mode="r")
+
+
+def ensure_index(
+    names: List[str],
+    embeddings_fn: Callable[[List[str]], List[List[float]]],
+    model: str,
+    taxonomy_hash: str,
+    cache_dir: Path = CACHE_DIR,
+) -> np.ndarray:
+    matrix = load_index(names, model, taxonomy_hash, cache_dir)
+    if matrix is None:
+        matrix = build_index(names, embeddings_fn, model, taxonomy_hash, cache_dir)
+    return matrix
+
+
+def startup_check(cache_dir: Path = CACHE_DIR) -> bool:
+    """Build the configured provider's index if it is missing or stale.
+
+    Called at API startup so no request pays for embedding the taxonomy.
+    Returns ``False`` (after logging) if building failed; the matcher then
+    builds it on first use instead.
+    """
+    from ..embeddings import cache, provider
+
+    taxonomy = get_index()
+    model = provider.model_name()
+    if load_index(taxonomy.names, model, taxonomy.yaml_hash, cache_dir) is not None:
+        return True
+    logger.info("building taxonomy embedding index for %s", model)
+    try:
+        build_index(taxonomy.names, cache.embed_texts, model, taxonomy.yaml_hash, cache_dir)
+    except Exception:
+        logger.warning("could not build the taxonomy embedding index", exc_info=True)
+        return False
+    return True
+
+
+def main(argv=None):
+    from ..embeddings import provider
+
+    parser = argparse.ArgumentParser(description="Build the taxonomy embedding index")
+    parser.add_argument(
+        "--force", action="store_true", help="Re-embed every skill even if up to date"
+    )
+    args = parser.parse_args(argv)
+
+    taxonomy = get_index()
+    names = taxonomy.names
+    model = provider.model_name()
+    if not args.force and load_index(names, model, taxonomy.yaml_hash) is not None:
+        print("Taxonomy embedding index is up to date")
+        return
+    build_index(
+        names, provider.get_embeddings, model, taxonomy.yaml_hash, reuse=not args.force
+    )
+    print(f"Wrote taxonomy embedding index for {len(names)} skills to {CACHE_DIR}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,144 @@
+"""Compiled, process-wide view of ``skills.yaml``.
+
+Skill names are interned to dense integer ids in YAML order; aliases and
+canonical names (lower-cased) map to those ids and every id maps to its
+cluster. The compiled form is saved as JSON next to the embedding index and
+reused until the YAML's hash changes, so consumers never re-parse YAML. The
+cache directory is writable, so the snapshot is plain data (never unpickled)
+and is validated before use.
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SKILLS_PATH = Path(__file__).with_name("skills.yaml")
+CACHE_DIR = Path(
+    os.environ.get("TAXONOMY_CACHE_DIR", Path(__file__).resolve().parent / "cache")
+)
+OTHER_CLUSTER = "Other"
+_SNAPSHOT_VERSION = 2
+
+
+class TaxonomyIndex:
+    __slots__ = ("yaml_hash", "names", "clusters", "skill_cluster", "alias_to_id")
+
+    def __init__(
+        self,
+        yaml_hash: str,
+        names: List[str],
+        clusters: List[str],
+        skill_cluster: List[int],
+        alias_to_id: Dict[str, int],
+    ):
+        self.yaml_hash = yaml_hash
+        self.names = names
+        self.clusters = clusters
+        self.skill_cluster = skill_cluster
+        self.alias_to_id = alias_to_id
+
+    @classmethod
+    def from_yaml(cls, yaml_bytes: bytes) -> "TaxonomyIndex":
+        import yaml
+
+        data = yaml.safe_load(yaml_bytes) or {}
+        names: List[str] = []
+        clusters: List[str] = []
+        skill_cluster: List[int] = []
+        alias_to_id: Dict[str, int] = {}
+        for cluster, items in data.items():
+            cid = len(clusters)
+            clusters.append(cluster)
+            for item in items:
+                sid = len(names)
+                names.append(item["name"])
+                skill_cluster.append(cid)
+                alias_to_id[item["name"].lower()] = sid
+                for alias in item.get("aliases", []):
+                    alias_to_id[alias.lower()] = sid
+        return cls(_hash(yaml_bytes), names, clusters, skill_cluster, alias_to_id)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def lookup(self, text: str) -> Optional[int]:
+        """Return the skill id for a canonical name or alias, ignoring case."""
+        return self.alias_to_id.get(text.lower())
+
+    def cluster_of(self, text: str) -> str:
+        sid = self.alias_to_id.get(text.lower())
+        if sid is None:
+            return OTHER_CLUSTER
+        return self.clusters[self.skill_cluster[sid]]
+
+    def to_snapshot(self) -> Dict[str, Any]:
+        return {
+            "version": _SNAPSHOT_VERSION,
+            "yaml_hash": self.yaml_hash,
+            "names": self.names,
+            "clusters": self.clusters,
+            "skill_cluster": self.skill_cluster,
+            "alias_to_id": self.alias_to_id,
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any]) -> "TaxonomyIndex":
+        """Inverse of :meth:`to_snapshot`; raises ``ValueError`` on malformed data."""
+        if not isinstance(data, dict) or data.get("version") != _SNAPSHOT_VERSION:
+            raise ValueError("Incompatible taxonomy snapshot")
+        try:
+            names = [str(n) for n in data["names"]]
+            clusters = [str(c) for c in data["clusters"]]
+            skill_cluster = [int(c) for c in data["skill_cluster"]]
+            alias_to_id = {str(a): int(sid) for a, sid in data["alias_to_id"].items()}
+            yaml_hash = str(data["yaml_hash"])
+        except (KeyError, TypeError, AttributeError) as exc:
+            raise ValueError("Malformed taxonomy snapshot") from exc
+        valid = (
+            len(skill_cluster) == len(names)
+            and all(0 <= c < len(clusters) for c in skill_cluster)
+            and all(0 <= sid < len(names) for sid in alias_to_id.values())
+        )
+        if not valid:
+            raise ValueError("Malformed taxonomy snapshot")
+        return cls(yaml_hash, names, clusters, skill_cluster, alias_to_id)
+
+
+def _hash(yaml_bytes: bytes) -> str:
+    return hashlib.sha256(yaml_bytes).hexdigest()
+
+
+def load_index(path: Path = SKILLS_PATH, cache_dir: Path = CACHE_DIR) -> TaxonomyIndex:
+    """Load the compiled snapshot for ``path``, compiling it on a hash miss."""
+    yaml_bytes = path.read_bytes()
+    digest = _hash(yaml_bytes)
+    snapshot = cache_dir / f"taxonomy-{digest[:16]}.json"
+    try:
+        index = TaxonomyIndex.from_snapshot(json.loads(snapshot.read_bytes()))
+        if index.yaml_hash == digest:
+            return index
+    except (OSError, ValueError):
+        pass
+
+    index = TaxonomyIndex.from_yaml(yaml_bytes)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = snapshot.with_name(f"{snapshot.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(index.to_snapshot()))
+        os.replace(tmp, snapshot)
+        # earlier versions pickled the snapshot
+        for stale in cache_dir.glob("taxonomy-*"):
+            if stale != snapshot and stale.suffix in (".json", ".pickle"):
+                stale.unlink(missing_ok=True)
+    except OSError:  # pragma: no cover - read-only deployments still work
+        pass
+    return index
+
+
+@lru_cache(maxsize=1)
+def get_index() -> TaxonomyIndex:
+    """Shared index for the bundled ``skills.yaml``."""
+    return load_index()
@@ -0,0 +1,115 @@
+"""Bounded executors that keep CPU-bound work off the event loop.
+
+Parsing (pdfminer, DOCX XML, regex section parsing, URL fetches) runs in a
+process pool so one large PDF cannot hold the GIL for every request; scoring
+is short and mostly NumPy/array work, so it runs in a thread pool that shares
+the in-memory document store. Each pool admits at most ``queue limit`` jobs
+(running plus waiting); past that, :class:`Overloaded` is raised and the API
+answers 503 instead of letting latency grow without bound. A parser process
+that dies mid-job (OOM, segfault) raises :class:`WorkerCrashed` instead: the
+document is at fault, so retrying it would only crash the fresh pool again.
+
+Configuration (environment):
+
+* ``PARSE_WORKERS`` – parser processes (default 2; ``0`` parses on threads)
+* ``SCORE_WORKERS`` – scoring threads (default 4)
+* ``WORKER_QUEUE_LIMIT`` – admitted jobs per pool (default 32)
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "2"))
+SCORE_WORKERS = int(os.getenv("SCORE_WORKERS", "4"))
+QUEUE_LIMIT = int(os.getenv("WORKER_QUEUE_LIMIT", "32"))
+
+
+class Overloaded(RuntimeError):
+    """Raised when a pool already has ``queue limit`` jobs admitted."""
+
+
+class WorkerCrashed(RuntimeError):
+    """Raised when the worker process running a job died."""
+
+
+class BoundedPool:
+    def __init__(self, name: str, factory: Callable[[], Executor], limit: int):
+        self.name = name
+        self.limit = limit
+        self._factory = factory
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self.rejected = 0
+
+    def _get(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._factory()
+            return self._executor
+
+    def _reset(self, broken: Executor) -> None:
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            if self._admitted >= self.limit:
+                self.rejected += 1
+                raise Overloaded(f"{self.name} queue is full")
+            self._admitted += 1
+        executor = self._get()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, partial(fn, *args, **kwargs))
+        except BrokenProcessPool as exc:
+            # a crashed parser (OOM, segfault) poisons the pool; start a fresh one
+            self._reset(executor)
+            raise WorkerCrashed(f"{self.name} worker crashed") from exc
+        finally:
+            with self._lock:
+                self._admitted -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"admitted": self._admitted, "limit": self.limit, "rejected": self.rejected}
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _parse_executor() -> Executor:
+    if PARSE_WORKERS <= 0:
+        return ThreadPoolExecutor(max_workers=2, thread_name_prefix="parse")
+    # forkserver avoids forking the threaded server process
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None
+    return ProcessPoolExecutor(
+        max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context(method)
+    )
+
+
+parse_pool = BoundedPool("parse", _parse_executor, QUEUE_LIMIT)
+score_pool = BoundedPool(
+    "score",
+    lambda: ThreadPoolExecutor(max_workers=max(1, SCORE_WORKERS), thread_name_prefix="score"),
+    QUEUE_LIMIT,
+)
+
+
+def stats() -> Dict[str, Dict[str, int]]:
+    return {"parse": parse_pool.stats(), "score": score_pool.stats()}
+
+
+def shutdown() -> None:
+    parse_pool.shutdown()
+    score_pool.shutdown()
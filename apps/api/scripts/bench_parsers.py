@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+"""Benchmark the one-pass resume/job parsers against the previous multi-pass versions.
+
+Both versions run on the same long synthetic documents (and on random line
+soups built from section headers, dates, degrees and level words); outputs
+must be identical before any timing is reported.
+"""
+
+import argparse
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.parsing import job_parser, resume_parser  # noqa: E402
+from app.taxonomy.automaton import get_automaton  # noqa: E402
+from app.taxonomy.index import get_index  # noqa: E402
+
+
+def legacy_parse_resume_lines(lines: List[str]) -> Dict[str, Any]:
+    def parse_date(part: str) -> Optional[str]:
+        part = part.strip()
+        if part.lower() == 'present':
+            return None
+        m = re.match(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{4})', part, re.I)
+        if m:
+            month = resume_parser.MONTHS[m.group(1).lower()]
+            return f"{int(m.group(2)):04d}-{month:02d}"
+        m = re.match(r'(\d{4})', part)
+        if m:
+            return f"{int(m.group(1)):04d}-01"
+        return None
+
+    sections: Dict[str, List[str]] = {}
+    current: Optional[str] = None
+    prev_line: Optional[str] = None
+    for line in lines:
+        stripped = line.strip()
+        lower = stripped.lower()
+        key_match = resume_parser.SECTION_RE.match(lower)
+        if key_match:
+            current = key_match.group(1).lower()
+            sections[current] = []
+            if current == 'education' and prev_line:
+                sections[current].append(prev_line)
+            prev_line = stripped
+            continue
+        if ":" in stripped:
+            head, rest = stripped.split(":", 1)
+            if resume_parser.SECTION_RE.match(head.lower()):
+                current = head.lower()
+                sections[current] = [rest.strip()]
+                prev_line = stripped
+                continue
+        if current:
+            sections[current].append(stripped)
+        prev_line = stripped
+
+    skills_raw: List[str] = []
+    if 'skills' in sections:
+        skills_text = ' '.join(sections['skills'])
+        skills_raw = [s.strip() for s in re.split(r'[;,\n]', skills_text) if s.strip()]
+    automaton = get_automaton()
+    taxonomy = get_index()
+    listed = set(automaton.skill_ids('\n'.join(skills_raw)))
+    listed.update(sid for sid in map(taxonomy.lookup, skills_raw) if sid is not None)
+    for sid in automaton.skill_ids('\n'.join(lines)):
+        if sid not in listed:
+            skills_raw.append(taxonomy.names[sid])
+            listed.add(sid)
+
+    experiences: List[Dict[str, Any]] = []
+    for line in lines:
+        m = resume_parser.DATE_RANGE_RE.search(line)
+        if not m or ' at ' not in line:
+            continue
+        start = parse_date(m.group('start'))
+        end = parse_date(m.group('end'))
+        pre = line[: m.start()].strip()
+        role = company = ''
+        if ' at ' in pre:
+            role, company = pre.split(' at ', 1)
+        experiences.append(
+            {'role': role.strip(), 'company': company.strip(), 'start': start, 'end': end, 'bullets': []}
+        )
+
+    education = sections.get('education', [])
+    edu_matches = [l for l in lines if re.search(r"\b(BSc|MSc|Bachelor|Master)\b", l, re.I)]
+    for l in edu_matches:
+        if l not in education:
+            education.append(l)
+    education = [l for l in education if l and ' at ' not in l]
+    return {
+        'experiences': experiences,
+        'skills': skills_raw,
+        'education': education,
+        'certifications': sections.get('certifications', []),
+    }
+
+
+def legacy_parse_job(text: str) -> Dict[str, Any]:
+    lines = [l.strip() for l in text.splitlines() if l.strip()]
+    if not lines:
+        return {}
+    title = lines[0]
+    body_lower = "\n".join(lines).lower()
+    level = None
+    for lvl in ["junior", "mid", "senior", "lead"]:
+        if re.search(rf"\b{lvl}\b", body_lower):
+            level = lvl.capitalize()
+            break
+    years_required = None
+    m = re.search(r"(\d+)\+?\s+years", body_lower)
+    if m:
+        years_required = int(m.group(1))
+    location = None
+    work_auth = None
+    for line in lines:
+        lower = line.lower()
+        if lower.startswith("location"):
+            location = line.split(":", 1)[1].strip()
+        if "visa" in lower or "authorization" in lower:
+            work_auth = line
+
+    sections: Dict[str, List[str]] = {}
+    current: Optional[str] = None
+    for line in lines[1:]:
+        lower = line.lower()
+        if lower in job_parser.SECTION_HEADERS:
+            current = job_parser.SECTION_HEADERS[lower]
+            sections[current] = []
+            continue
+        if current and line.startswith(('-', '*')):
+            sections[current].append(line.lstrip('-* ').strip())
+
+    automaton = get_automaton()
+    taxonomy = get_index()
+    listed_lines = sections.get("required", []) + sections.get("preferred", [])
+    listed = set(automaton.skill_ids("\n".join(listed_lines)))
+    listed.update(sid for sid in map(taxonomy.lookup, listed_lines) if sid is not None)
+    mentioned = [
+        taxonomy.names[sid] for sid in automaton.skill_ids("\n".join(lines)) if sid not in listed
+    ]
+    return {
+        "title": title,
+        "level": level,
+        "years_required": years_required,
+        "location": location,
+        "work_auth": work_auth,
+        "required_skills": sections.get("required", []),
+        "preferred_skills": sections.get("preferred", []),
+        "responsibilities": sections.get("responsibilities", []),
+        "mentioned_skills": mentioned,
+    }
+
+
+RESUME_PIECES = [
+    "Skills", "skill", "Experience", "Projects", "Education", "Certifications",
+    "Skills: Python, SQL; Docker", "Certifications: AWS", "Education:",
+    "Data Scientist at Acme Corp Jan 2020 - Mar 2022", "Engineer at Initech 2018 – Present",
+    "Intern at Hooli 2016-2017", "BSc Computer Science 2016-2020", "MSc AI at MIT 2021",
+    "Master of Data", "Built pipelines in Python and Kubernetes", "Led a team of 5",
+    "  padded line  ", "Key: value",
+]
+JOB_PIECES = [
+    "Requirements", "Preferred", "Nice to have", "Responsibilities", "- Python", "* SQL",
+    "- Docker and Kubernetes", "Senior engineer wanted", "junior-friendly team", "Lead the platform",
+    "mid", "5+ years of experience", "3", "years in production", "10+", "Years of Go",
+    "Location: Berlin", "Visa sponsorship available", "Work authorization required", "", "   ",
+]
+
+
+def random_resume(rng: random.Random, n: int) -> List[str]:
+    return [rng.choice(RESUME_PIECES) for _ in range(n)]
+
+
+def random_job(rng: random.Random, n: int) -> str:
+    return "Platform Engineer\n" + "\n".join(rng.choice(JOB_PIECES) for _ in range(n))
+
+
+def check(trials: int = 300, seed: int = 0) -> None:
+    """Raise AssertionError if the new and legacy parsers ever disagree."""
+    rng = random.Random(seed)
+    for _ in range(trials):
+        lines = random_resume(rng, rng.randint(0, 40))
+        assert resume_parser.parse_resume_lines(lines) == legacy_parse_resume_lines(lines), lines
+        text = random_job(rng, rng.randint(0, 40))
+        assert job_parser.parse_job(text, fetch=False) == legacy_parse_job(text), text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=2000, help="Lines per document")
+    parser.add_argument("--number", type=int, default=20, help="Calls per timing")
+    args = parser.parse_args()
+
+    check()
+    rng = random.Random(1)
+    resume = random_resume(rng, args.lines)
+    job = random_job(rng, args.lines)
+    assert resume_parser.parse_resume_lines(resume) == legacy_parse_resume_lines(resume)
+    assert job_parser.parse_job(job, fetch=False) == legacy_parse_job(job)
+
+    cases = [
+        ("resume", lambda: legacy_parse_resume_lines(resume), lambda: resume_parser.parse_resume_lines(resume)),
+        ("job", lambda: legacy_parse_job(job), lambda: job_parser.parse_job(job, fetch=False)),
+    ]
+    print(f"lines={args.lines} outputs identical")
+    for name, old, new in cases:
+        t_old = min(timeit.repeat(old, number=args.number, repeat=3)) / args.number
+        t_new = min(timeit.repeat(new, number=args.number, repeat=3)) / args.number
+        print(f"{name:<6} legacy {t_old * 1e3:8.2f} ms/doc  one-pass {t_new * 1e3:8.2f} ms/doc  ({t_old / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""Benchmark app.parsing.pdf against the previous whole-document extractor.
+
+The baseline is what ``_extract_text_pdf`` used to run: pdfminer's
+``extract_text`` over every page with default layout analysis in one thread.
+Each layout mode is timed on every input and the slowest page is reported, so
+pathological documents stand out. Without paths, a synthetic "designer"
+resume (many small positioned labels per page) is generated.
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.parsing import pdf  # noqa: E402
+
+
+def synthetic_pdf(pages: int, lines: int = 30, labels: int = 0) -> bytes:
+    """A minimal valid PDF: ``lines`` text lines plus ``labels`` scattered short labels per page."""
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")
+    tree = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    kids = []
+    for p in range(pages):
+        ops = [b"BT /F1 11 Tf"]
+        for i in range(lines):
+            text = f"Page {p + 1} line {i + 1}: Python, SQL and Machine Learning"
+            ops.append(f"1 0 0 1 50 {780 - i * 14} Tm ({text}) Tj".encode())
+        for i in range(labels):
+            x, y = 40 + (i * 37) % 520, 60 + (i * 53) % 300
+            ops.append(f"1 0 0 1 {x} {y} Tm (tag{i}) Tj".encode())
+        ops.append(b"ET")
+        stream = b"\n".join(ops)
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        kids.append(
+            add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792]"
+                b" /Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+                % (tree, font, content)
+            )
+        )
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % tree
+    objects[tree - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids),
+        len(kids),
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for n, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (n, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        catalog,
+        xref,
+    )
+    return bytes(out)
+
+
+def _best(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="*", help="PDF files or directories of PDFs")
+    parser.add_argument("--layouts", nargs="+", default=list(pdf.LAYOUTS), choices=pdf.LAYOUTS)
+    parser.add_argument("--max-pages", type=int, default=pdf.MAX_PAGES, help="0 reads all pages")
+    parser.add_argument("--workers", type=int, default=1, help="Page-parallel processes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=12, help="Synthetic document pages")
+    parser.add_argument("--labels", type=int, default=300, help="Synthetic labels per page")
+    args = parser.parse_args()
+
+    from pdfminer.high_level import extract_text
+
+    # the per-run slow-document warnings would drown the table
+    logging.getLogger(pdf.__name__).setLevel(logging.ERROR)
+    paths: List[Path] = []
+    for p in map(Path, args.paths):
+        paths.extend(sorted(p.glob("*.pdf")) if p.is_dir() else [p])
+    tmp = None
+    if not paths:
+        tmp = tempfile.NamedTemporaryFile(suffix=".pdf")
+        tmp.write(synthetic_pdf(args.pages, labels=args.labels))
+        tmp.flush()
+        paths = [Path(tmp.name)]
+
+    for path in paths:
+        baseline = _best(lambda: extract_text(str(path)), args.repeat)
+        print(f"{path.name}: baseline {baseline:.3f}s")
+        for layout in args.layouts:
+            run = lambda: pdf.extract(  # noqa: E731
+                str(path), max_pages=args.max_pages, layout=layout, workers=args.workers
+            )
+            secs = _best(run, args.repeat)
+            result = run()
+            slowest = result.slowest()
+            print(
+                f"  {layout:<8} {secs:.3f}s ({baseline / secs:.1f}x)"
+                f"  page time {sum(t.seconds for t in result.timings):.3f}s"
+                f"  pages {len(result.pages)}/{result.page_count}"
+                f"  slowest page {slowest.page + 1 if slowest else '-'}"
+                f" {slowest.seconds if slowest else 0:.3f}s"
+            )
+    pdf.shutdown()
+    if tmp is not None:
+        tmp.close()
+
+
+if __name__ == "__main__":
+    main()
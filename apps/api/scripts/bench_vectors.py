@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""Benchmark job_skill_weights against the previous per-call sklearn TF-IDF path."""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.scoring import vectors  # noqa: E402
+from app.taxonomy.index import get_index  # noqa: E402
+
+
+def sklearn_job_skill_weights(
+    posting_text: str, required: List[str], preferred: List[str]
+) -> Dict[str, float]:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    skills = list(dict.fromkeys(required + preferred))
+    if not skills:
+        return {}
+    vect = TfidfVectorizer(vocabulary=[s.lower() for s in skills])
+    tfidf = vect.fit_transform([posting_text.lower()]).toarray()[0]
+    weights = {skill: tfidf[i] for i, skill in enumerate(skills)}
+    for skill in required:
+        weights[skill] = weights.get(skill, 0) + 0.4
+    for skill in preferred:
+        weights[skill] = weights.get(skill, 0) + 0.15
+    total = sum(weights.values()) or 1.0
+    return {k: v / total for k, v in weights.items()}
+
+
+def _posting(n_terms: int):
+    # single-token names only, where the sklearn tokenizer can see the term at all
+    names = [n for n in get_index().names if n.isalnum() and len(n) > 1][:n_terms]
+    required, preferred = names[: n_terms // 2], names[n_terms // 2 :]
+    lines = [f"Experience with {n} in production" for n in names] * 3
+    return "Senior Engineer\n" + "\n".join(lines), required, preferred
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--terms", type=int, default=20, help="Vocabulary size")
+    parser.add_argument("--number", type=int, default=500, help="Calls per timing")
+    args = parser.parse_args()
+
+    text, required, preferred = _posting(args.terms)
+    new = vectors.job_skill_weights(text, required, preferred)
+    old = sklearn_job_skill_weights(text, required, preferred)
+    drift = max(abs(new[k] - old[k]) for k in old)
+
+    t_old = min(
+        timeit.repeat(
+            lambda: sklearn_job_skill_weights(text, required, preferred),
+            number=args.number,
+            repeat=3,
+        )
+    )
+    t_new = min(
+        timeit.repeat(
+            lambda: vectors.job_skill_weights(text, required, preferred),
+            number=args.number,
+            repeat=3,
+        )
+    )
+    print(f"terms={len(required) + len(preferred)} max_abs_diff={drift:.2e}")
+    print(f"sklearn: {t_old / args.number * 1e6:8.1f} us/call")
+    print(f"counter: {t_new / args.number * 1e6:8.1f} us/call  ({t_old / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
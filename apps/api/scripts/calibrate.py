@@ -2,14 +2,15 @@
 import argparse
 import csv
 import json
-import math
+import multiprocessing
+import os
 import re
-from collections import defaultdict
-from itertools import product
+from dataclasses import dataclass, field
+from datetime import date
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-import yaml
+import numpy as np
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 
 # ensure app package can be imported
@@ -20,7 +21,8 @@ if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
 from app.parsing.job_parser import parse_job
-from app.scoring import engine, vectors
+from app.scoring import batch, features, vectors
+from app.scoring.skill_vector import SkillVector
 
 LABELS = ["reject", "stretch", "on_target", "strong"]
 DEFAULT_THRESHOLDS = [25, 50, 75]
@@ -31,40 +33,14 @@ PARAM_GRID = {
     "eps": [0.03, 0.05, 0.07],
     "lambda": [0.01, 0.03, 0.05],
 }
-
-
-def _load_skill_clusters() -> Dict[str, str]:
-    data_path = ROOT / "app" / "taxonomy" / "skills.yaml"
-    mapping: Dict[str, str] = {}
-    if data_path.exists():
-        data = yaml.safe_load(data_path.read_text())
-        for cluster, skills in data.items():
-            for item in skills:
-                name = item["name"].lower()
-                mapping[name] = cluster
-                for alias in item.get("aliases", []):
-                    mapping[alias.lower()] = cluster
-    return mapping
-
-
-_SKILL_CLUSTER = _load_skill_clusters()
-
-
-def _cluster_map(job_vec: Dict[str, float], resume_vec: Dict[str, float]):
-    clusters: Dict[str, Dict[str, Any]] = defaultdict(
-        lambda: {"job": {}, "resume": {}, "weight": 0.0}
-    )
-    for skill, w in job_vec.items():
-        cl = _SKILL_CLUSTER.get(skill.lower(), "Other")
-        clusters[cl]["job"][skill] = w
-        clusters[cl]["weight"] += w
-    for skill, w in resume_vec.items():
-        cl = _SKILL_CLUSTER.get(skill.lower(), "Other")
-        clusters[cl]["resume"][skill] = w
-    total = sum(job_vec.values()) or 1.0
-    for c in clusters.values():
-        c["weight"] = c["weight"] / total
-    return clusters
+DENSE_GRID = {
+    "delta": [round(0.1 + 0.05 * i, 2) for i in range(11)],
+    "eta": [round(0.05 + 0.025 * i, 3) for i in range(11)],
+    "eps": [0.03, 0.05, 0.07],
+    "lambda": [0.005, 0.01, 0.02, 0.03, 0.04, 0.05, 0.065, 0.08],
+}
+# coordinate-descent starting step per parameter; steps halve when a pass stalls
+REFINE_STEPS = {"delta": 0.05, "eta": 0.025, "eps": 0.01, "lambda": 0.01}
 
 
 def _parse_resume_text(text: str) -> List[Dict[str, Any]]:
@@ -76,112 +52,330 @@ def _parse_resume_text(text: str) -> List[Dict[str, Any]]:
     return instances
 
 
-def _classify(score: float) -> str:
-    if score < DEFAULT_THRESHOLDS[0]:
-        return "reject"
-    if score < DEFAULT_THRESHOLDS[1]:
-        return "stretch"
-    if score < DEFAULT_THRESHOLDS[2]:
-        return "on_target"
-    return "strong"
-
-
-def _score_example(
-    resume_text: str,
-    job_text: str,
-    *,
-    delta: float,
-    eta: float,
-    eps: float,
-    lambda_: float,
-) -> float:
-    job = parse_job(job_text)
-    resume_instances = _parse_resume_text(resume_text)
-    posting_text = job.get("title", "") + "\n" + "\n".join(
-        job.get("responsibilities", [])
-        + job.get("required_skills", [])
-        + job.get("preferred_skills", [])
-    )
-    job_vec = vectors.job_skill_weights(
-        posting_text, job.get("required_skills", []), job.get("preferred_skills", [])
-    )
-    resume_vec, _ = vectors.resume_skill_weights(resume_instances, lambda_)
-    clusters = _cluster_map(job_vec, resume_vec)
-    score, _ = engine.score_pair(
-        resume_vec,
-        job_vec,
-        job.get("required_skills", []),
-        0.0,
-        clusters,
-        delta=delta,
-        eta=eta,
-        eps=eps,
+@dataclass
+class Prepared:
+    """Labeled rows parsed once; term matrices are cached per ``lambda``.
+
+    Jobs are kept as ``{skill: weight}`` dicts so a pickled copy stays small
+    and is vectorized again in the worker process.
+    """
+
+    job_weights: List[Dict[str, float]]
+    job_required: List[List[str]]
+    resume_instances: List[List[Dict[str, Any]]]
+    truth: np.ndarray
+    labels: List[str]
+    reference: date
+    _terms: Dict[float, np.ndarray] = field(default_factory=dict)
+    _job_vectors: Optional[List[SkillVector]] = None
+
+    def __getstate__(self):
+        # vectors and term caches are rebuilt on demand; keep the pickle small
+        state = dict(self.__dict__)
+        state["_terms"] = {}
+        state["_job_vectors"] = None
+        return state
+
+    def terms(self, lambda_: float) -> np.ndarray:
+        """``n x 4`` matrix of ``base, pcrit, cluster_penalty, level_gap``."""
+        cached = self._terms.get(lambda_)
+        if cached is None:
+            if self._job_vectors is None:
+                self._job_vectors = [SkillVector.from_dict(w) for w in self.job_weights]
+            resumes = [
+                SkillVector.from_dict(
+                    vectors.resume_skill_weights(inst, lambda_, self.reference)[0]
+                )
+                for inst in self.resume_instances
+            ]
+            cached = np.column_stack([
+                batch.pair_terms_many(resumes, self._job_vectors, self.job_required),
+                np.zeros(len(resumes)),  # calibration pairs carry no seniority gap
+            ])
+            self._terms[lambda_] = cached
+        return cached
+
+
+def prepare(rows: List[Dict[str, str]]) -> Prepared:
+    jobs = [parse_job(r["job_text"]) for r in rows]
+    return Prepared(
+        job_weights=[
+            vectors.job_skill_weights(
+                features.posting_text(job),
+                job.get("required_skills", []),
+                job.get("preferred_skills", []) + job.get("mentioned_skills", []),
+            )
+            for job in jobs
+        ],
+        job_required=[job.get("required_skills", []) for job in jobs],
+        resume_instances=[_parse_resume_text(r["resume_text"]) for r in rows],
+        truth=np.array([LABELS.index(r["human_label"]) if r["human_label"] in LABELS else -1 for r in rows]),
+        labels=[r["human_label"] for r in rows],
+        reference=date.today(),
     )
-    return score
-
-
-def evaluate(rows: List[Dict[str, str]], params: Dict[str, float]):
-    scores = []
-    preds = []
-    truth = []
-    for r in rows:
-        score = _score_example(
-            r["resume_text"],
-            r["job_text"],
-            delta=params["delta"],
-            eta=params["eta"],
-            eps=params["eps"],
-            lambda_=params["lambda"],
-        )
-        scores.append(score)
-        preds.append(_classify(score))
-        truth.append(r["human_label"])
+
+
+def grid_scores(
+    terms: np.ndarray,
+    delta: Sequence[float],
+    eta: Sequence[float],
+    eps: Sequence[float],
+) -> np.ndarray:
+    """Scores for every row and every ``(delta, eta, eps)``: ``n x D x E x P``."""
+    base, pcrit, cluster_pen, level = (terms[:, i, None, None, None] for i in range(4))
+    d = np.asarray(delta)[None, :, None, None]
+    e = np.asarray(eta)[None, None, :, None]
+    p = np.asarray(eps)[None, None, None, :]
+    score = base - d * pcrit - e * cluster_pen - p * np.abs(level)
+    return np.clip(score, 0.0, 1.0) * 100.0
+
+
+def _predict(scores: np.ndarray, thresholds: Sequence[float]) -> np.ndarray:
+    """Index into ``LABELS`` per score; a score on a threshold takes the higher label."""
+    return np.searchsorted(np.asarray(thresholds), scores, side="right")
+
+
+def evaluate(
+    rows: List[Dict[str, str]],
+    params: Dict[str, float],
+    prepared: Optional[Prepared] = None,
+    thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+):
+    prepared = prepared or prepare(rows)
+    scores = grid_scores(
+        prepared.terms(params["lambda"]), [params["delta"]], [params["eta"]], [params["eps"]]
+    ).ravel()
+    preds = [LABELS[i] for i in _predict(scores, thresholds)]
+    truth = prepared.labels
     acc = accuracy_score(truth, preds)
     cm = confusion_matrix(truth, preds, labels=LABELS)
     report = classification_report(truth, preds, labels=LABELS)
     return acc, cm, report
 
 
-def grid_search(rows: List[Dict[str, str]]):
-    best_params = None
-    best_acc = -math.inf
-    for delta, eta, eps, lam in product(
-        PARAM_GRID["delta"],
-        PARAM_GRID["eta"],
-        PARAM_GRID["eps"],
-        PARAM_GRID["lambda"],
-    ):
-        params = {"delta": delta, "eta": eta, "eps": eps, "lambda": lam}
-        acc, _, _ = evaluate(rows, params)
-        if acc > best_acc:
-            best_acc = acc
-            best_params = params
-    return best_params, best_acc
+def grid_search(rows: List[Dict[str, str]], prepared: Optional[Prepared] = None):
+    """Best grid point by accuracy; ties keep the first in ``PARAM_GRID`` order."""
+    prepared = prepared or prepare(rows)
+    acc = np.stack(
+        [
+            (
+                _predict(
+                    grid_scores(
+                        prepared.terms(lam), PARAM_GRID["delta"], PARAM_GRID["eta"], PARAM_GRID["eps"]
+                    ),
+                    DEFAULT_THRESHOLDS,
+                )
+                == prepared.truth[:, None, None, None]
+            ).mean(axis=0)
+            for lam in PARAM_GRID["lambda"]
+        ],
+        axis=-1,
+    )
+    d, e, p, l = np.unravel_index(int(np.argmax(acc)), acc.shape)
+    best_params = {
+        "delta": PARAM_GRID["delta"][d],
+        "eta": PARAM_GRID["eta"][e],
+        "eps": PARAM_GRID["eps"][p],
+        "lambda": PARAM_GRID["lambda"][l],
+    }
+    return best_params, float(acc[d, e, p, l])
+
+
+def optimal_thresholds(scores: np.ndarray, truth: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Exact best three cut points for each column of ``scores``.
+
+    ``scores`` is ``n`` or ``n x G``. Rows are sorted once per column; with
+    prefix counts ``cnt_c[k]`` of label ``c`` among the ``k`` lowest scores,
+    cuts at ``a <= b <= c`` classify
+    ``cnt_0[a] + cnt_1[b] - cnt_1[a] + cnt_2[c] - cnt_2[b] + cnt_3[n] - cnt_3[c]``
+    rows correctly, which running maxima maximise in one pass. Cuts only go
+    between distinct scores. Returns ``(accuracy (G,), thresholds (G, 3))``.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    squeeze = scores.ndim == 1
+    if squeeze:
+        scores = scores[:, None]
+    n, g = scores.shape
+    if n == 0:
+        acc, thresholds = np.zeros(g), np.tile(np.asarray(DEFAULT_THRESHOLDS, float), (g, 1))
+        return (acc[0], thresholds[0]) if squeeze else (acc, thresholds)
+    order = np.argsort(scores, axis=0, kind="stable")
+    s = np.take_along_axis(scores, order, axis=0)
+    y = truth[order]
+    zero = np.zeros((1, g))
+    cnt = [np.vstack([zero, np.cumsum(y == c, axis=0)]) for c in range(len(LABELS))]
+    valid = np.ones((n + 1, g), dtype=bool)
+    valid[1:n] = s[:-1] < s[1:]
+
+    def masked(x):
+        return np.where(valid, x, -np.inf)
+
+    g0 = masked(cnt[0] - cnt[1])
+    h1 = masked(np.maximum.accumulate(g0, axis=0) + cnt[1] - cnt[2])
+    h2 = masked(np.maximum.accumulate(h1, axis=0) + cnt[2] - cnt[3])
+    c_pos = np.argmax(h2, axis=0)
+    cols = np.arange(g)
+    correct = h2[c_pos, cols] + cnt[3][n, cols]
+
+    # walk back: best b <= c, then best a <= b
+    rows = np.arange(n + 1)[:, None]
+    b_pos = np.argmax(np.where(rows <= c_pos, h1, -np.inf), axis=0)
+    a_pos = np.argmax(np.where(rows <= b_pos, g0, -np.inf), axis=0)
+
+    def cut_value(k):
+        lo = s[np.maximum(k - 1, 0), cols]
+        hi = s[np.minimum(k, n - 1), cols]
+        mid = (lo + hi) / 2.0
+        return np.where(k == 0, 0.0, np.where(k == n, np.nextafter(lo, np.inf), mid))
+
+    thresholds = np.column_stack([cut_value(a_pos), cut_value(b_pos), cut_value(c_pos)])
+    acc = correct / max(n, 1)
+    if squeeze:
+        return acc[0], thresholds[0]
+    return acc, thresholds
+
+
+# Per-worker copy of the prepared rows, installed once by _init_worker.
+_PREPARED: Optional[Prepared] = None
+
+
+def _init_worker(prepared: Prepared) -> None:
+    global _PREPARED
+    _PREPARED = prepared
+
+
+def _search_lambda(args):
+    """Accuracy and optimal thresholds for one ``lambda`` over a delta/eta/eps grid."""
+    lambda_, grid = args
+    scores = grid_scores(_PREPARED.terms(lambda_), grid["delta"], grid["eta"], grid["eps"])
+    n = scores.shape[0]
+    shape = scores.shape[1:]
+    acc, thresholds = optimal_thresholds(scores.reshape(n, -1), _PREPARED.truth)
+    return acc.reshape(shape), thresholds.reshape(shape + (3,))
+
+
+def threshold_search(
+    prepared: Prepared, grid: Dict[str, List[float]] = DENSE_GRID, workers: int = 1
+) -> Tuple[Dict[str, float], List[float], float]:
+    """Best grid point with its optimal thresholds; lambdas run on a process pool."""
+    tasks = [(lam, grid) for lam in grid["lambda"]]
+    if workers <= 1 or len(tasks) <= 1:
+        _init_worker(prepared)
+        results = [_search_lambda(t) for t in tasks]
+    else:
+        with multiprocessing.Pool(
+            min(workers, len(tasks)), initializer=_init_worker, initargs=(prepared,)
+        ) as pool:
+            results = pool.map(_search_lambda, tasks)
+    acc = np.stack([r[0] for r in results], axis=-1)
+    d, e, p, l = np.unravel_index(int(np.argmax(acc)), acc.shape)
+    params = {
+        "delta": grid["delta"][d],
+        "eta": grid["eta"][e],
+        "eps": grid["eps"][p],
+        "lambda": grid["lambda"][l],
+    }
+    return params, [float(t) for t in results[l][1][d, e, p]], float(acc[d, e, p, l])
+
+
+def _point_accuracy(prepared: Prepared, params: Dict[str, float]) -> Tuple[float, np.ndarray]:
+    scores = grid_scores(
+        prepared.terms(params["lambda"]), [params["delta"]], [params["eta"]], [params["eps"]]
+    ).ravel()
+    return optimal_thresholds(scores, prepared.truth)
+
+
+def refine(
+    prepared: Prepared,
+    start: Dict[str, float],
+    steps: Optional[Dict[str, float]] = None,
+    min_step: float = 1e-3,
+    patience: int = 2,
+) -> Tuple[Dict[str, float], List[float], float]:
+    """Coordinate descent from ``start`` with optimal thresholds at every point.
+
+    Each pass tries ``value +/- step`` for every parameter and keeps strict
+    improvements. A pass without one halves all steps; the search stops when
+    steps fall below ``min_step`` or after ``patience`` stalled passes in a row.
+    """
+    steps = dict(steps or REFINE_STEPS)
+    best = dict(start)
+    best_acc, best_thr = _point_accuracy(prepared, best)
+    stalled = 0
+    while stalled < patience and max(steps.values()) >= min_step:
+        improved = False
+        for name, step in steps.items():
+            for value in (best[name] - step, best[name] + step):
+                if value < 0:
+                    continue
+                cand = dict(best, **{name: round(value, 6)})
+                acc, thr = _point_accuracy(prepared, cand)
+                if acc > best_acc:
+                    best, best_acc, best_thr = cand, acc, thr
+                    improved = True
+        if improved:
+            stalled = 0
+        else:
+            stalled += 1
+            steps = {k: v / 2.0 for k, v in steps.items()}
+    return best, [float(t) for t in best_thr], float(best_acc)
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Calibrate scoring parameters")
     parser.add_argument("csv", help="Path to labeled pairs CSV")
+    parser.add_argument(
+        "--optimize-thresholds",
+        action="store_true",
+        help="Fit the three label thresholds exactly for every parameter set",
+    )
+    parser.add_argument(
+        "--dense", action="store_true", help="Search DENSE_GRID (implies --optimize-thresholds)"
+    )
+    parser.add_argument(
+        "--refine",
+        action="store_true",
+        help="Coordinate-descent refinement after the grid (implies --optimize-thresholds)",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
     args = parser.parse_args()
 
     with open(args.csv, newline="", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         rows = list(reader)
 
+    prepared = prepare(rows)
     print("Evaluating default parameters...")
-    acc, cm, report = evaluate(rows, DEFAULT_PARAMS)
+    acc, cm, report = evaluate(rows, DEFAULT_PARAMS, prepared)
     print(f"Accuracy: {acc:.3f}")
     print("Confusion matrix (rows=truth, cols=pred):")
     print(cm)
     print(report)
 
-    print("Searching parameter grid...")
-    best_params, best_acc = grid_search(rows)
-    print("Best params:", best_params)
-    print(f"Best accuracy: {best_acc:.3f}")
+    output: Dict[str, Any]
+    if args.optimize_thresholds or args.dense or args.refine:
+        grid = DENSE_GRID if args.dense else PARAM_GRID
+        print("Searching parameter grid with threshold sweeps...")
+        best_params, thresholds, best_acc = threshold_search(prepared, grid, args.workers)
+        if args.refine:
+            print("Refining by coordinate descent...")
+            best_params, thresholds, best_acc = refine(prepared, best_params)
+        print("Best params:", best_params)
+        print("Best thresholds:", [round(t, 3) for t in thresholds])
+        print(f"Best accuracy: {best_acc:.3f}")
+        _, cm, report = evaluate(rows, best_params, prepared, thresholds)
+        print(cm)
+        print(report)
+        output = dict(best_params, thresholds=thresholds)
+    else:
+        print("Searching parameter grid...")
+        best_params, best_acc = grid_search(rows, prepared)
+        print("Best params:", best_params)
+        print(f"Best accuracy: {best_acc:.3f}")
+        output = best_params
 
     params_path = ROOT / "app" / "scoring" / "params.json"
-    params_path.write_text(json.dumps(best_params, indent=2))
+    params_path.write_text(json.dumps(output, indent=2))
     print(f"Wrote best parameters to {params_path}")
 
 
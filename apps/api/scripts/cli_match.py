@@ -4,12 +4,9 @@
 import argparse
 import json
 import sys
-from collections import defaultdict
 from pathlib import Path
 from typing import Any, Dict
 
-import yaml
-
 # Ensure the app package can be imported
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -17,41 +14,7 @@ if str(ROOT) not in sys.path:
 
 from app.parsing.job_parser import parse_job  # noqa: E402
 from app.parsing.resume_parser import parse_resume  # noqa: E402
-from app.scoring import engine, explain, vectors  # noqa: E402
-
-
-def _load_skill_clusters() -> Dict[str, str]:
-    mapping: Dict[str, str] = {}
-    data_path = ROOT / "app" / "taxonomy" / "skills.yaml"
-    if data_path.exists():
-        data = yaml.safe_load(data_path.read_text())
-        for cluster, skills in data.items():
-            for item in skills:
-                name = item["name"].lower()
-                mapping[name] = cluster
-                for alias in item.get("aliases", []):
-                    mapping[alias.lower()] = cluster
-    return mapping
-
-
-_SKILL_CLUSTER = _load_skill_clusters()
-
-
-def _cluster_map(job_vec: Dict[str, float], resume_vec: Dict[str, float]):
-    clusters: Dict[str, Dict[str, Any]] = defaultdict(
-        lambda: {"job": {}, "resume": {}, "weight": 0.0}
-    )
-    for skill, w in job_vec.items():
-        cl = _SKILL_CLUSTER.get(skill.lower(), "Other")
-        clusters[cl]["job"][skill] = w
-        clusters[cl]["weight"] += w
-    for skill, w in resume_vec.items():
-        cl = _SKILL_CLUSTER.get(skill.lower(), "Other")
-        clusters[cl]["resume"][skill] = w
-    total = sum(job_vec.values()) or 1.0
-    for c in clusters.values():
-        c["weight"] = c["weight"] / total
-    return clusters
+from app.scoring import explain, features  # noqa: E402
 
 
 def run_pipeline(resume_path: str, job_source: str) -> Dict[str, Any]:
@@ -64,35 +27,12 @@ def run_pipeline(resume_path: str, job_source: str) -> Dict[str, Any]:
         job_text = Path(job_source).read_text(encoding="utf-8")
     job = parse_job(job_text)
 
-    resume_instances = [{"name": s} for s in resume.get("skills", [])]
-    posting_text = (
-        job.get("title", "")
-        + "\n"
-        + "\n".join(
-            job.get("responsibilities", [])
-            + job.get("required_skills", [])
-            + job.get("preferred_skills", [])
-        )
-    )
-    job_vec, resume_vec, evidence = vectors.build_vectors(
-        posting_text,
-        job.get("required_skills", []),
-        job.get("preferred_skills", []),
-        resume_instances,
-    )
-    clusters = _cluster_map(job_vec, resume_vec)
-    score, terms = engine.score_pair(
-        resume_vec, job_vec, job.get("required_skills", []), 0.0, clusters
-    )
-    explanation = explain.build_explanation(
-        job_vec,
-        resume_vec,
-        job.get("required_skills", []),
-        (score, terms),
-        evidence,
-        clusters,
+    resume_features = features.resume_features(resume)
+    job_features = features.job_features(job)
+    result = features.run(resume_features, job_features)
+    return explain.render(
+        result, resume_features.evidence, labels=features.labels(resume_features, job_features)
     )
-    return explanation
 
 
 def main() -> None:
@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+"""Score every resume against every job and stream the results to CSV.
+
+Both corpora are loaded and vectorized once, stacked into CSR matrices over
+the skill ids they use, and scored blockwise with
+:func:`app.scoring.batch.score_matrix`. Block sizes are chosen so one
+worker's dense temporaries stay under ``--memory-mb``; row blocks are spread
+across ``--workers`` processes and written in order as they finish.
+
+A corpus is either a directory (resumes: ``.pdf``/``.docx`` files, jobs:
+``.txt`` files; ids are file stems) or a ``.jsonl`` file of documents with an
+``id`` field plus either parser output (``skills`` / ``required_skills``…),
+``skill_instances`` for resumes, or raw ``text`` for jobs.
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.parsing.job_parser import parse_job  # noqa: E402
+from app.parsing.resume_parser import parse_resume  # noqa: E402
+from app.scoring import batch, features  # noqa: E402
+from app.scoring.skill_vector import SkillVector, get_vocabulary  # noqa: E402
+
+PARAMS_PATH = ROOT / "app" / "scoring" / "params.json"
+DEFAULT_PARAMS = {"delta": 0.35, "eta": 0.15, "eps": 0.05, "lambda": 0.03}
+RESUME_SUFFIXES = {".pdf", ".docx"}
+# dense float64 temporaries score_matrix keeps alive per (resume, job) cell
+_BYTES_PER_CELL = 8 * 8
+
+
+def _iter_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_resumes(path: Path, lambda_: float) -> Tuple[List[str], List[SkillVector]]:
+    ids: List[str] = []
+    vecs: List[SkillVector] = []
+    if path.is_dir():
+        docs = (
+            (p.stem, parse_resume(p, p.name))
+            for p in sorted(path.iterdir())
+            if p.suffix.lower() in RESUME_SUFFIXES
+        )
+    else:
+        docs = ((str(d["id"]), d) for d in _iter_jsonl(path))
+    for doc_id, doc in docs:
+        ids.append(doc_id)
+        vecs.append(features.resume_features(doc, lambda_).vector)
+    return ids, vecs
+
+
+def load_jobs(path: Path) -> Tuple[List[str], List[SkillVector], List[List[str]]]:
+    ids: List[str] = []
+    vecs: List[SkillVector] = []
+    required: List[List[str]] = []
+    if path.is_dir():
+        docs = (
+            (p.stem, parse_job(p.read_text(encoding="utf-8")))
+            for p in sorted(path.glob("*.txt"))
+        )
+    else:
+        docs = (
+            (str(d["id"]), parse_job(d["text"]) if "text" in d else d)
+            for d in _iter_jsonl(path)
+        )
+    for doc_id, job in docs:
+        job_features = features.job_features(job)
+        ids.append(doc_id)
+        vecs.append(job_features.vector)
+        required.append(job_features.required)
+    return ids, vecs, required
+
+
+def block_shape(n_resumes: int, n_jobs: int, memory_mb: float) -> Tuple[int, int]:
+    """Rows and columns per block so one block fits the memory budget."""
+    cells = max(1, int(memory_mb * 1024 * 1024) // _BYTES_PER_CELL)
+    cols = max(1, min(n_jobs, cells))
+    rows = max(1, min(n_resumes, cells // cols))
+    return rows, cols
+
+
+# Per-worker state, installed once by _init_worker instead of per task.
+_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(state: Dict[str, Any]) -> None:
+    _STATE.update(state)
+
+
+def _merge_top_k(
+    scores: np.ndarray, cols: np.ndarray, k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Keep the ``k`` best columns per row, best score then lowest column first."""
+    if scores.shape[1] > k:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(scores, part, axis=1)
+        cols = np.take_along_axis(cols, part, axis=1)
+    order = np.lexsort((cols, -scores), axis=1)
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(cols, order, axis=1)
+
+
+def score_rows(bounds: Tuple[int, int]):
+    """Score resume rows ``[lo, hi)`` against all jobs, one column block at a time.
+
+    Returns the full ``(hi - lo) x n_jobs`` float32 score block, or with
+    ``top_k`` set, ``(scores, job_columns)`` of the best ``top_k`` per row.
+    """
+    lo, hi = bounds
+    s = _STATE
+    resumes = s["resumes"][lo:hi]
+    n_jobs = s["jobs"].shape[0]
+    top_k: Optional[int] = s["top_k"]
+    full = None if top_k else np.empty((hi - lo, n_jobs), dtype=np.float32)
+    best_scores = np.empty((hi - lo, 0))
+    best_cols = np.empty((hi - lo, 0), dtype=np.int64)
+    for c0 in range(0, n_jobs, s["block_cols"]):
+        c1 = min(n_jobs, c0 + s["block_cols"])
+        out = batch.score_matrix(
+            resumes,
+            s["jobs"][c0:c1],
+            s["required"][c0:c1],
+            s["cluster_of"],
+            s["n_clusters"],
+            **s["params"],
+        )
+        if full is not None:
+            full[:, c0:c1] = out.score
+            continue
+        cols = np.broadcast_to(np.arange(c0, c1), out.score.shape)
+        best_scores, best_cols = _merge_top_k(
+            np.hstack([best_scores, out.score]), np.hstack([best_cols, cols]), top_k
+        )
+    return full if full is not None else (best_scores, best_cols)
+
+
+def score_all(
+    resumes: List[SkillVector],
+    jobs: List[SkillVector],
+    required: List[List[str]],
+    *,
+    params: Dict[str, float],
+    memory_mb: float = 512,
+    workers: int = 1,
+    top_k: Optional[int] = None,
+) -> Iterator[Tuple[int, Any]]:
+    """Yield ``(first_row, block_result)`` for consecutive resume row blocks."""
+    vocab = get_vocabulary()
+    cols = batch.columns(resumes, jobs)
+    state = {
+        "resumes": batch.stack(resumes, cols),
+        "jobs": batch.stack(jobs, cols),
+        "required": batch.required_matrix(jobs, required, cols, vocab),
+        "cluster_of": vocab.cluster_array(cols),
+        "n_clusters": len(vocab.cluster_names),
+        "params": params,
+        "top_k": top_k,
+    }
+    rows, cols = block_shape(len(resumes), len(jobs), memory_mb)
+    state["block_cols"] = cols
+    blocks = [(lo, min(len(resumes), lo + rows)) for lo in range(0, len(resumes), rows)]
+    if workers <= 1 or len(blocks) <= 1:
+        _init_worker(state)
+        for block in blocks:
+            yield block[0], score_rows(block)
+        return
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(state,)) as pool:
+        for block, result in zip(blocks, pool.imap(score_rows, blocks)):
+            yield block[0], result
+
+
+def _load_params(path: Optional[str]) -> Dict[str, float]:
+    params = dict(DEFAULT_PARAMS)
+    params_path = Path(path) if path else PARAMS_PATH
+    if params_path.exists():
+        params.update(json.loads(params_path.read_text()))
+    return params
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Score all resume/job pairs")
+    parser.add_argument("--resumes", required=True, help="Resume directory or JSONL file")
+    parser.add_argument("--jobs", required=True, help="Job directory or JSONL file")
+    parser.add_argument("--out", required=True, help="Path to write CSV output")
+    parser.add_argument("--top-k", type=int, help="Only keep the best K jobs per resume")
+    parser.add_argument("--memory-mb", type=float, default=512, help="Per-worker block budget")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--params", help=f"Scoring params JSON (default {PARAMS_PATH})")
+    args = parser.parse_args()
+
+    params = _load_params(args.params)
+    start = time.time()
+    resume_ids, resume_vecs = load_resumes(Path(args.resumes), params["lambda"])
+    job_ids, job_vecs, required = load_jobs(Path(args.jobs))
+    print(
+        f"Loaded {len(resume_ids)} resumes and {len(job_ids)} jobs in {time.time() - start:.1f}s",
+        file=sys.stderr,
+    )
+
+    score_params = {k: params[k] for k in ("delta", "eta", "eps")}
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["resume_id", "job_id", "score"] + (["rank"] if args.top_k else []))
+        for lo, result in score_all(
+            resume_vecs,
+            job_vecs,
+            required,
+            params=score_params,
+            memory_mb=args.memory_mb,
+            workers=args.workers,
+            top_k=args.top_k,
+        ):
+            if args.top_k:
+                scores, cols = result
+                for i in range(scores.shape[0]):
+                    rid = resume_ids[lo + i]
+                    writer.writerows(
+                        (rid, job_ids[c], f"{s:.4f}", rank)
+                        for rank, (s, c) in enumerate(zip(scores[i], cols[i]), 1)
+                    )
+            else:
+                for i in range(result.shape[0]):
+                    rid = resume_ids[lo + i]
+                    writer.writerows(
+                        (rid, jid, f"{s:.4f}") for jid, s in zip(job_ids, result[i])
+                    )
+    print(f"Wrote {args.out} in {time.time() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
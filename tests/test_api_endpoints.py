@@ -62,3 +62,116 @@ def test_cors_preflight():
         res.headers.get("access-control-allow-origin")
         == "http://localhost:3000"
     )
+
+
+def test_batch_match():
+    client = TestClient(app)
+    headers = {"X-Client-Id": "test"}
+    data = _load("resume1_pdf.txt")
+    resume_id = client.post(
+        "/v1/parse/resume",
+        data=data,
+        headers={"Content-Type": "application/pdf", "X-Client-Id": "test"},
+    ).json()["doc_id"]
+    job_ids = [
+        client.post("/v1/parse/job", json={"source": src}, headers=headers).json()["doc_id"]
+        for src in (
+            "Engineer\nRequirements:\n- Python\nPreferred:\n- SQL",
+            "Designer\nRequirements:\n- Figma",
+        )
+    ]
+
+    res = client.post(
+        "/v1/match/batch",
+        json={"resume_doc_id": resume_id, "job_doc_ids": job_ids + [999999]},
+        headers=headers,
+    )
+    body = res.json()
+    assert res.status_code == 200
+    assert body["missing"] == [999999]
+    assert sorted(r["job_doc_id"] for r in body["results"]) == sorted(job_ids)
+    assert all(r["explanation"] is None for r in body["results"])
+
+    single = client.post(
+        "/v1/match",
+        json={"resume_doc_id": resume_id, "job_doc_id": job_ids[0]},
+        headers=headers,
+    ).json()
+    res = client.post(
+        "/v1/match/batch",
+        json={"job_doc_id": job_ids[0], "resume_doc_ids": [resume_id], "explain": True},
+        headers=headers,
+    )
+    row = res.json()["results"][0]
+    assert abs(row["score"] - single["score"]) < 1e-3
+    assert row["explanation"]["gaps"] == single["gaps"]
+
+    bad = client.post("/v1/match/batch", json={"job_doc_ids": job_ids}, headers=headers)
+    assert bad.status_code == 400
+
+
+def test_recommend(monkeypatch):
+    from app import main
+    from app.scoring.job_index import JobIndex
+
+    # a fresh index so jobs ingested by other tests cannot interleave
+    monkeypatch.setattr(main, "_JOB_INDEX", JobIndex())
+    client = TestClient(app)
+    headers = {"X-Client-Id": "test"}
+    resume_id = client.post(
+        "/v1/parse/resume",
+        data=_load("resume1_pdf.txt"),
+        headers={"Content-Type": "application/pdf", "X-Client-Id": "test"},
+    ).json()["doc_id"]
+    full, partial, unrelated = [
+        client.post("/v1/parse/job", json={"source": src}, headers=headers).json()["doc_id"]
+        for src in (
+            "Data Scientist\nRequirements\n- Python\n- SQL\n- Machine Learning",
+            "Backend Engineer\nRequirements\n- Python\n- Go\n- Kubernetes",
+            "Designer\nRequirements\n- Figma",
+        )
+    ]
+
+    res = client.post("/v1/recommend", json={"resume_doc_id": resume_id, "k": 5}, headers=headers)
+    assert res.status_code == 200
+    results = res.json()["results"]
+    assert [r["job_doc_id"] for r in results] == [full, partial]
+    scores = [r["score"] for r in results]
+    assert scores == sorted(scores, reverse=True) and scores[-1] > 0
+    single = client.post(
+        "/v1/match", json={"resume_doc_id": resume_id, "job_doc_id": full}, headers=headers
+    ).json()
+    assert abs(scores[0] - single["score"]) < 1e-3
+    assert unrelated not in {r["job_doc_id"] for r in results}
+
+    missing = client.post("/v1/recommend", json={"resume_doc_id": 999999}, headers=headers)
+    assert missing.status_code == 404
+
+
+def test_unsaved_match_expires_documents(monkeypatch):
+    from app import main
+
+    monkeypatch.setattr(main, "UNSAVED_TTL", 0.0)
+    client = TestClient(app)
+    headers = {"X-Client-Id": "ttl-test"}
+    resume_id = client.post(
+        "/v1/parse/resume",
+        content=_load("resume1_pdf.txt"),
+        headers={**headers, "Content-Type": "application/pdf"},
+    ).json()["doc_id"]
+    job_id = client.post(
+        "/v1/parse/job", json={"source": "TTL Engineer\nRequirements\n- Python"}, headers=headers
+    ).json()["doc_id"]
+    assert job_id in main._JOB_INDEX
+
+    res = client.post(
+        "/v1/match", json={"resume_doc_id": resume_id, "job_doc_id": job_id}, headers=headers
+    )
+    assert res.status_code == 200
+    assert resume_id not in main._STORE and job_id not in main._STORE
+    main._STORE.sweep()
+    assert job_id not in main._JOB_INDEX
+    again = client.post(
+        "/v1/match", json={"resume_doc_id": resume_id, "job_doc_id": job_id}, headers=headers
+    )
+    assert again.status_code == 404
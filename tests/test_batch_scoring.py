@@ -0,0 +1,52 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+from app.scoring import batch, kernel  # noqa: E402
+from app.scoring.clusters import cluster_map  # noqa: E402
+from app.scoring.skill_vector import SkillVector  # noqa: E402
+
+SKILLS = ['Python', 'SQL', 'Docker', 'Kubernetes', 'Go', 'Rust', 'Scala', 'PyTorch', 'Excel', 'Underwater Basket Weaving']
+
+
+def _random_vec(rng):
+    picked = rng.sample(SKILLS, rng.randint(0, 6))
+    return SkillVector.from_dict({s: rng.choice([0.0, rng.random()]) for s in picked})
+
+
+def test_score_many_matches_kernel():
+    rng = random.Random(7)
+    resumes = [_random_vec(rng) for _ in range(6)]
+    jobs = [_random_vec(rng) for _ in range(8)]
+    required = [rng.sample(SKILLS, rng.randint(0, 3)) + ['Python'] * rng.randint(0, 1) for _ in jobs]
+    out = batch.score_many(resumes, jobs, required)
+    assert out.score.shape == (6, 8)
+    for i, r in enumerate(resumes):
+        for j, job in enumerate(jobs):
+            res = kernel.run(r, job, required[j], 0.0, cluster_map(job, r))
+            assert out.score[i, j] == pytest.approx(res.score, abs=1e-4)
+            terms = batch.terms_at(out, i, j)
+            for key in ('base', 'pcrit', 'cluster_penalty'):
+                assert terms[key] == pytest.approx(res.terms[key], abs=1e-6)
+
+
+def test_score_many_handles_empty_inputs():
+    out = batch.score_many([SkillVector.from_dict({})], [], [])
+    assert out.score.shape == (1, 0)
+
+
+def test_pair_terms_match_kernel():
+    rng = random.Random(11)
+    resumes = [_random_vec(rng) for _ in range(30)]
+    jobs = [_random_vec(rng) for _ in range(30)]
+    required = [rng.sample(SKILLS, rng.randint(0, 3)) for _ in jobs]
+    terms = batch.pair_terms_many(resumes, jobs, required)
+    for i, (r, job) in enumerate(zip(resumes, jobs)):
+        res = kernel.run(r, job, required[i], 0.0, cluster_map(job, r))
+        assert list(terms[i]) == pytest.approx(
+            [res.terms['base'], res.terms['pcrit'], res.terms['cluster_penalty']], abs=1e-6
+        )
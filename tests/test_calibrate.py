@@ -0,0 +1,117 @@
+import random
+import sys
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api/scripts'))
+
+import calibrate  # noqa: E402
+from app.parsing.job_parser import parse_job  # noqa: E402
+from app.scoring import engine, features, vectors  # noqa: E402
+from app.scoring.clusters import cluster_map  # noqa: E402
+
+SKILLS = ['Python', 'SQL', 'Docker', 'Kubernetes', 'Go', 'Scala', 'PyTorch', 'Excel']
+
+
+def _rows(n=24, seed=3):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        req = rng.sample(SKILLS, 2)
+        pref = rng.sample(SKILLS, 2)
+        job_text = 'Engineer\nRequirements:\n' + '\n'.join(f'- {s}' for s in req)
+        job_text += '\nPreferred:\n' + '\n'.join(f'- {s}' for s in pref)
+        rows.append({
+            'job_text': job_text,
+            'resume_text': ', '.join(rng.sample(SKILLS, rng.randint(1, 5))),
+            'human_label': rng.choice(calibrate.LABELS),
+        })
+    return rows
+
+
+def _slow_accuracy(rows, params, prepared):
+    hits = 0
+    for r in rows:
+        job = features.job_features(parse_job(r['job_text']))
+        resume, _ = vectors.resume_skill_weights(
+            calibrate._parse_resume_text(r['resume_text']), params['lambda'], prepared.reference
+        )
+        score, _ = engine.score_pair(
+            resume, job.vector, job.required, 0.0, cluster_map(job.vector, resume),
+            delta=params['delta'], eta=params['eta'], eps=params['eps'],
+        )
+        (label,) = calibrate._predict(np.array([score]), calibrate.DEFAULT_THRESHOLDS)
+        hits += calibrate.LABELS[label] == r['human_label']
+    return hits / len(rows)
+
+
+def test_predict_labels_scores_by_threshold():
+    scores = np.array([0.0, 24.9, 25.0, 49.9, 50.0, 74.9, 75.0, 100.0])
+    labels = calibrate._predict(scores, calibrate.DEFAULT_THRESHOLDS)
+    assert labels.tolist() == [0, 0, 1, 1, 2, 2, 3, 3]
+
+
+def test_grid_search_matches_per_point_evaluation():
+    rows = _rows()
+    prepared = calibrate.prepare(rows)
+    best, best_acc = calibrate.grid_search(rows, prepared)
+
+    want, want_acc = None, -1.0
+    grid = calibrate.PARAM_GRID
+    for delta, eta, eps, lam in product(grid['delta'], grid['eta'], grid['eps'], grid['lambda']):
+        params = {'delta': delta, 'eta': eta, 'eps': eps, 'lambda': lam}
+        acc = _slow_accuracy(rows, params, prepared)
+        if acc > want_acc:
+            want, want_acc = params, acc
+    assert best == want
+    assert abs(best_acc - want_acc) < 1e-9
+
+
+def test_evaluate_reuses_prepared_terms():
+    rows = _rows(8)
+    prepared = calibrate.prepare(rows)
+    acc, cm, _ = calibrate.evaluate(rows, calibrate.DEFAULT_PARAMS, prepared)
+    assert cm.sum() == len(rows)
+    assert abs(acc - _slow_accuracy(rows, calibrate.DEFAULT_PARAMS, prepared)) < 1e-9
+    assert list(prepared._terms) == [calibrate.DEFAULT_PARAMS['lambda']]
+
+
+def _brute_thresholds(scores, truth):
+    cuts = sorted(set(scores)) + [max(scores) + 1]
+    best = -1
+    for t in product(cuts, repeat=3):
+        if not t[0] <= t[1] <= t[2]:
+            continue
+        pred = calibrate._predict(np.asarray(scores), t)
+        best = max(best, int((pred == truth).sum()))
+    return best / len(scores)
+
+
+def test_optimal_thresholds_match_enumeration():
+    rng = random.Random(5)
+    for _ in range(10):
+        scores = [rng.choice([0.0, 10.0, 20.0, 30.0, 55.5, 70.0, 90.0, 100.0]) for _ in range(14)]
+        truth = np.array([rng.randrange(4) for _ in scores])
+        acc, thr = calibrate.optimal_thresholds(np.array(scores), truth)
+        assert abs(acc - _brute_thresholds(scores, truth)) < 1e-9
+        pred = calibrate._predict(np.array(scores), thr)
+        assert abs((pred == truth).mean() - acc) < 1e-9
+        assert list(thr) == sorted(thr)
+
+
+def test_threshold_search_pool_and_refine():
+    rows = _rows(40, seed=9)
+    prepared = calibrate.prepare(rows)
+    serial = calibrate.threshold_search(prepared, calibrate.PARAM_GRID, workers=1)
+    pooled = calibrate.threshold_search(prepared, calibrate.PARAM_GRID, workers=2)
+    assert serial == pooled
+    params, thresholds, acc = calibrate.refine(prepared, serial[0])
+    assert acc >= serial[2]
+    truth = prepared.truth
+    scores = calibrate.grid_scores(
+        prepared.terms(params['lambda']), [params['delta']], [params['eta']], [params['eps']]
+    ).ravel()
+    assert abs((calibrate._predict(scores, thresholds) == truth).mean() - acc) < 1e-9
@@ -0,0 +1,91 @@
+import base64
+import io
+import os
+import sys
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+from app.parsing.docx_text import iter_paragraphs  # noqa: E402
+from app.parsing.resume_parser import parse_resume  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parents[1] / 'apps/api/tests/fixtures'
+
+NS = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml"'
+)
+
+
+def _p(text: str) -> str:
+    return f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>'
+
+
+def _docx(body: str, media: bytes = b'') -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(
+            'word/document.xml',
+            f'<?xml version="1.0" encoding="UTF-8"?><w:document {NS}><w:body>{body}</w:body></w:document>',
+        )
+        if media:
+            zf.writestr('word/media/image1.png', media)
+    return buf.getvalue()
+
+
+def test_runs_tables_and_text_boxes():
+    box = (
+        '<w:p><w:r><w:t>Anchor</w:t></w:r><w:r><mc:AlternateContent>'
+        '<mc:Choice Requires="wps"><w:drawing><wps:txbx><w:txbxContent>'
+        + _p('Skills: Python')
+        + '</w:txbxContent></wps:txbx></w:drawing></mc:Choice>'
+        '<mc:Fallback><w:pict><v:textbox><w:txbxContent>'
+        + _p('Skills: Python')
+        + '</w:txbxContent></v:textbox></w:pict></mc:Fallback>'
+        '</mc:AlternateContent></w:r></w:p>'
+    )
+    table = '<w:tbl><w:tr><w:tc>' + _p('SQL') + '</w:tc><w:tc>' + _p('Docker') + '</w:tc></w:tr></w:tbl>'
+    runs = (
+        '<w:p><w:r><w:t>Data</w:t><w:tab/><w:t xml:space="preserve"> Eng</w:t></w:r>'
+        '<w:hyperlink><w:r><w:t>ineer</w:t></w:r></w:hyperlink>'
+        '<w:r><w:br/><w:t>2020</w:t><w:br w:type="page"/></w:r>'
+        '<w:del><w:r><w:delText>gone</w:delText></w:r></w:del></w:p>'
+    )
+    data = _docx(runs + table + box)
+    assert list(iter_paragraphs(io.BytesIO(data))) == [
+        'Data\t Engineer\n2020',
+        'SQL',
+        'Docker',
+        'Skills: Python',
+        'Anchor',
+    ]
+
+
+def test_matches_fixture_paragraphs():
+    data = base64.b64decode((FIXTURES / 'resume2_docx.txt').read_text())
+    paragraphs = list(iter_paragraphs(io.BytesIO(data)))
+    assert paragraphs[0] == 'Jane Doe Resume' and 'MSc AI 2018' in paragraphs
+
+
+def test_memory_stays_bounded(tmp_path):
+    path = tmp_path / 'big.docx'
+    body = ''.join(_p(f'Paragraph {i} with Python experience') for i in range(20000))
+    path.write_bytes(_docx(body, media=os.urandom(4 * 1024 * 1024)))
+    tracemalloc.start()
+    try:
+        count = sum(1 for _ in iter_paragraphs(str(path)))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert count == 20000
+    assert peak < 1024 * 1024
+
+
+def test_parse_resume_reads_table_cells():
+    table = '<w:tbl><w:tr><w:tc>' + _p('Skills') + '</w:tc></w:tr><w:tr><w:tc>' + _p('Python, SQL') + '</w:tc></w:tr></w:tbl>'
+    result = parse_resume(_docx(_p('Jane Doe') + table), 'cv.docx')
+    assert 'Python' in result['skills'] and 'SQL' in result['skills']
@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+from app.taxonomy import embedding_index  # noqa: E402
+
+
+def _fake(calls):
+    def embed(texts):
+        calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    return embed
+
+
+def test_index_persists_and_memory_maps(tmp_path):
+    calls = []
+    names = ['Python', 'SQL', 'Docker']
+    matrix = embedding_index.ensure_index(names, _fake(calls), 'm:1', 'v1', tmp_path)
+    assert calls == [names]
+    assert isinstance(matrix, np.memmap) and not matrix.flags.writeable
+    assert np.allclose(np.linalg.norm(matrix, axis=1), 1.0)
+
+    again = embedding_index.ensure_index(names, _fake(calls), 'm:1', 'v1', tmp_path)
+    assert len(calls) == 1
+    assert np.array_equal(matrix, again)
+    assert embedding_index.load_index(names, 'm:2', 'v1', tmp_path) is None
+
+
+def test_rebuild_only_embeds_changed_names(tmp_path):
+    calls = []
+    embedding_index.ensure_index(['Python', 'SQL'], _fake(calls), 'm:1', 'v1', tmp_path)
+    matrix = embedding_index.ensure_index(
+        ['Python', 'Postgres'], _fake(calls), 'm:1', 'v2', tmp_path
+    )
+    assert calls == [['Python', 'SQL'], ['Postgres']]
+    assert matrix.shape == (2, 2)
+    assert embedding_index.load_index(['Python', 'SQL'], 'm:1', 'v1', tmp_path) is None
+
+
+def test_prefix_models_keep_separate_indexes(tmp_path):
+    calls = []
+    embedding_index.ensure_index(['Python'], _fake(calls), 'a', 'v1', tmp_path)
+    embedding_index.ensure_index(['Python'], _fake(calls), 'a-b', 'v1', tmp_path)
+    # rebuilding "a" must neither reuse nor delete the "a-b" index
+    embedding_index.ensure_index(['Python', 'SQL'], _fake(calls), 'a', 'v2', tmp_path)
+    assert calls == [['Python'], ['Python'], ['SQL']]
+    assert embedding_index.load_index(['Python'], 'a-b', 'v1', tmp_path) is not None
+    assert embedding_index.load_index(['Python'], 'a', 'v1', tmp_path) is None
+
+
+def test_startup_check_builds_missing_index(tmp_path, monkeypatch):
+    from app.embeddings import cache, provider
+    from app.taxonomy.index import get_index
+
+    calls = []
+    monkeypatch.setattr(cache, 'embed_texts', _fake(calls))
+    assert embedding_index.startup_check(tmp_path)
+    assert embedding_index.startup_check(tmp_path)
+    assert len(calls) == 1
+    taxonomy = get_index()
+    assert embedding_index.load_index(
+        taxonomy.names, provider.model_name(), taxonomy.yaml_hash, tmp_path
+    ) is not None
+
+    monkeypatch.setattr(cache, 'embed_texts', lambda texts: 1 / 0)
+    assert not embedding_index.startup_check(tmp_path / 'empty')
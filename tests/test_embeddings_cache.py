@@ -0,0 +1,219 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+from app.embeddings import cache  # noqa: E402
+from app.lru import LRUCache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_lru(monkeypatch):
+    lru = LRUCache(1 << 20)
+    monkeypatch.setattr(cache, 'lru', lru)
+    return lru
+
+
+def _engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    statements = []
+    event.listen(
+        engine,
+        'before_cursor_execute',
+        lambda conn, cursor, stmt, *a: statements.append(stmt.split()[0].upper()),
+    )
+    return engine, statements
+
+
+def test_embed_text_bulk_round_trips(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_embeddings(texts):
+        calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    monkeypatch.setattr(cache, 'get_embeddings', fake_embeddings)
+    engine, statements = _engine(tmp_path)
+    cache.init_db(engine)
+    text = ' '.join(f'w{i}' for i in range(25))
+
+    chunks = cache.chunk_text(text, max_tokens=10)
+    monkeypatch.setattr(cache, 'chunk_text', lambda t: chunks)
+
+    statements.clear()
+    first = cache.embed_text(text, engine=engine)
+    assert len(calls) == 1 and calls[0] == chunks
+    assert statements.count('SELECT') == 1
+    assert statements.count('INSERT') == 1
+    assert 'CREATE' not in statements
+
+    statements.clear()
+    second = cache.embed_text(text, engine=engine)
+    assert all(np.array_equal(a, b) for a, b in zip(first, second))
+    assert first[0].dtype == np.float32
+    assert len(calls) == 1
+    assert statements == []
+
+    cache.lru.clear()
+    third = cache.embed_text(text, engine=engine)
+    assert all(np.array_equal(a, b) for a, b in zip(first, third))
+    assert len(calls) == 1
+    assert statements == ['SELECT']
+
+
+def test_lru_tier_keys_by_model(tmp_path, monkeypatch, fresh_lru):
+    calls = []
+
+    def fake_embeddings(texts):
+        calls.append(list(texts))
+        return [[1.0, 0.0] for _ in texts]
+
+    monkeypatch.setattr(cache, 'get_embeddings', fake_embeddings)
+    engine, statements = _engine(tmp_path)
+    cache.embed_texts(['python', 'sql', 'python'], engine=engine)
+    assert calls == [['python', 'sql']]
+    statements.clear()
+    cache.embed_texts(['sql'], engine=engine)
+    assert statements == []
+    assert fresh_lru.stats()['hits'] == 1
+
+    first_model = cache.provider.model_name
+    monkeypatch.setattr(cache.provider, 'model_name', lambda: 'other:model')
+    cache.embed_texts(['sql'], engine=engine)
+    assert statements == ['SELECT', 'INSERT']
+    assert calls == [['python', 'sql'], ['sql']]
+
+    # the SQL tier keeps one row per model
+    monkeypatch.setattr(cache.provider, 'model_name', first_model)
+    fresh_lru.clear()
+    statements.clear()
+    cache.embed_texts(['sql'], engine=engine)
+    assert statements == ['SELECT']
+    assert len(calls) == 2
+
+
+def test_legacy_json_rows_migrate_on_read(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'get_embeddings', lambda texts: 1 / 0)
+    engine, _ = _engine(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE embeddings (id INTEGER PRIMARY KEY, '
+            'text_hash VARCHAR NOT NULL, embedding TEXT NOT NULL)'
+        ))
+        conn.execute(text('CREATE UNIQUE INDEX ix_embeddings_text_hash ON embeddings (text_hash)'))
+        digest = cache.hashlib.sha256(b'hello').hexdigest()
+        conn.execute(
+            text('INSERT INTO embeddings (text_hash, embedding) VALUES (:h, :e)'),
+            {'h': digest, 'e': json.dumps([0.5, -1.0, 2.0])},
+        )
+    cache.init_db(engine)
+    (vec,) = cache.embed_text('hello', engine=engine)
+    assert vec.tolist() == [0.5, -1.0, 2.0]
+    with engine.connect() as conn:
+        blob, payload = conn.execute(text('SELECT vector, embedding FROM embedding_cache')).one()
+    assert len(blob) == 12 and payload == ''
+    (again,) = cache.embed_text('hello', engine=engine)
+    assert again.tolist() == [0.5, -1.0, 2.0]
+
+
+def test_legacy_rewrite_survives_conflicting_insert(tmp_path, monkeypatch):
+    engine, _ = _engine(tmp_path)
+    cache.init_db(engine)
+    hello = cache.hashlib.sha256(b'hello').hexdigest()
+    world = cache.hashlib.sha256(b'world').hexdigest()
+    with engine.begin() as conn:
+        conn.execute(
+            text('INSERT INTO embedding_cache (text_hash, model, embedding) VALUES (:h, :m, :e)'),
+            {'h': hello, 'm': cache.provider.model_name(), 'e': json.dumps([1.0, 2.0])},
+        )
+
+    def racing_worker(texts):
+        # another process caches the same chunk while we call the provider
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO embedding_cache (text_hash, model, embedding) VALUES (:h, :m, '[3.0]')"),
+                {'h': world, 'm': cache.provider.model_name()},
+            )
+        return [[3.0] for _ in texts]
+
+    monkeypatch.setattr(cache, 'get_embeddings', racing_worker)
+    out = cache.embed_texts(['hello', 'world'], engine=engine)
+    assert [v.tolist() for v in out] == [[1.0, 2.0], [3.0]]
+    with engine.connect() as conn:
+        payload = conn.execute(
+            text('SELECT embedding FROM embedding_cache WHERE text_hash = :h'), {'h': hello}
+        ).scalar_one()
+    assert payload == ''
+
+
+def test_schema_is_versioned_by_cache_migrations(tmp_path):
+    engine, _ = _engine(tmp_path)
+    cache.init_db(engine)
+    with engine.connect() as conn:
+        version = conn.execute(text(f'SELECT version_num FROM {cache.VERSION_TABLE}')).scalar_one()
+    assert version == '0003_model_key'
+
+
+def test_leaves_the_application_embeddings_table_alone(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'get_embeddings', lambda texts: [[1.0] for _ in texts])
+    engine, _ = _engine(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE embeddings (id INTEGER PRIMARY KEY, doc_id VARCHAR NOT NULL, '
+            'chunk_index INTEGER NOT NULL, vector BLOB NOT NULL, text_span TEXT)'
+        ))
+    cache.embed_texts(['python'], engine=engine)
+    insp = inspect(engine)
+    assert {'embeddings', 'embedding_cache'} <= set(insp.get_table_names())
+    assert 'text_hash' not in {c['name'] for c in insp.get_columns('embeddings')}
+
+
+def test_renames_a_migrated_cache_table(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'get_embeddings', lambda texts: 1 / 0)
+    engine, _ = _engine(tmp_path)
+    digest = cache.hashlib.sha256(b'hello').hexdigest()
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE embeddings (id INTEGER PRIMARY KEY, text_hash VARCHAR NOT NULL, '
+            'embedding TEXT NOT NULL, vector BLOB, dtype VARCHAR(2), scale FLOAT, '
+            'model VARCHAR NOT NULL)'
+        ))
+        conn.execute(text(
+            'CREATE UNIQUE INDEX ix_embeddings_text_hash_model ON embeddings (text_hash, model)'
+        ))
+        conn.execute(text(f'CREATE TABLE {cache.VERSION_TABLE} (version_num VARCHAR(32))'))
+        conn.execute(text(f"INSERT INTO {cache.VERSION_TABLE} VALUES ('0003_model_key')"))
+        conn.execute(
+            text('INSERT INTO embeddings (text_hash, model, embedding) VALUES (:h, :m, :e)'),
+            {'h': digest, 'm': cache.provider.model_name(), 'e': '[0.5]'},
+        )
+    (vec,) = cache.embed_texts(['hello'], engine=engine)
+    assert vec.tolist() == [0.5]
+    insp = inspect(engine)
+    assert 'embeddings' not in insp.get_table_names()
+    indexes = {ix['name'] for ix in insp.get_indexes('embedding_cache')}
+    assert indexes == {'ix_embedding_cache_text_hash_model'}
+
+
+def test_works_without_a_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'get_embeddings', lambda texts: [[1.0, 2.0] for _ in texts])
+    engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'cache.db'}")
+    (vec,) = cache.embed_texts(['python'], engine=engine)
+    assert vec.tolist() == [1.0, 2.0]
+    monkeypatch.setattr(cache, 'get_embeddings', lambda texts: 1 / 0)
+    assert cache.embed_texts(['python'], engine=engine)[0] is vec
+
+
+def test_compact_modes_round_trip():
+    vec = np.array([0.25, -0.5, 1.0, 0.0], dtype=np.float32)
+    for mode, size in (('float32', 16), ('float16', 8), ('int8', 4)):
+        blob, code, scale = cache.encode_vector(vec, mode)
+        assert len(blob) == size
+        out = cache.decode_vector(blob, code, scale)
+        assert out.dtype == np.float32
+        assert np.allclose(out, vec, atol=1e-2)
@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+from app.embeddings import provider  # noqa: E402
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.calls = []
+
+    def create(self, model, input):
+        self.calls.append(list(input))
+        data = [SimpleNamespace(index=i, embedding=[float(len(t))]) for i, t in enumerate(input)]
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+def test_openai_batches_whole_list_and_reuses_client(monkeypatch):
+    fake = SimpleNamespace(embeddings=FakeEmbeddings())
+    monkeypatch.setattr(provider, 'PROVIDER', 'openai')
+    monkeypatch.setattr(provider, '_client', fake)
+    out = provider.get_embeddings(['a', 'bb', 'ccc'])
+    assert out == [[1.0], [2.0], [3.0]]
+    assert fake.embeddings.calls == [['a', 'bb', 'ccc']]
+    assert provider.get_embedding('dddd') == [4.0]
+    assert provider._get_client() is fake
+
+
+def test_openai_splits_at_input_limit(monkeypatch):
+    fake = SimpleNamespace(embeddings=FakeEmbeddings())
+    monkeypatch.setattr(provider, 'PROVIDER', 'openai')
+    monkeypatch.setattr(provider, '_client', fake)
+    monkeypatch.setattr(provider, 'OPENAI_MAX_INPUTS', 2)
+    out = provider.get_embeddings(['a', 'bb', 'ccc'])
+    assert out == [[1.0], [2.0], [3.0]]
+    assert fake.embeddings.calls == [['a', 'bb'], ['ccc']]
@@ -1,4 +1,7 @@
 from pathlib import Path
+
+import pytest
+
 __import__('sys').path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
 
 from app.scoring.explain import build_explanation  # noqa: E402
@@ -27,3 +30,12 @@ def test_best_fit_and_gaps_ordering():
     assert out['best_fit'][0]['skill'] == 'Python'
     gap_names = [g['skill'] for g in out['gaps']]
     assert gap_names[0] == 'SQL'
+
+def test_names_follow_document_spelling():
+    job = {'Python': 0.5, 'Build systems': 0.5}
+    resume = {'python': 0.6, 'build systems': 0.4}
+    evidence = {'python': {'years': 3}}
+    cluster = {'All': {'job': job, 'resume': resume, 'weight': 1.0}}
+    out = build_explanation(job, resume, [], (90, {}), evidence, cluster)
+    assert out['best_fit'][0] == {'skill': 'python', 'contribution': pytest.approx(0.3), 'evidence': {'years': 3}}
+    assert [g['skill'] for g in out['gaps']] == ['Build systems']
@@ -0,0 +1,55 @@
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+from app.scoring import features, kernel, vectors  # noqa: E402
+from app.scoring.clusters import cluster_map  # noqa: E402
+
+
+JOB = {
+    'title': 'Data Engineer',
+    'responsibilities': ['Build pipelines in Python and SQL'],
+    'required_skills': ['Python', 'SQL'],
+    'preferred_skills': ['Docker'],
+    'mentioned_skills': ['Kubernetes'],
+}
+RESUME = {
+    'skill_instances': [
+        {'name': 'Python', 'start': '2019-01', 'end': '2023-06'},
+        {'name': 'Docker', 'start': '2021-01', 'end': '2022-01'},
+        {'name': 'Scala', 'start': '2018-01', 'end': '2019-01'},
+    ]
+}
+
+
+def test_precomputed_features_match_direct_kernel():
+    ref = date(2024, 1, 15)
+    job_f = features.job_features(JOB)
+    resume_f = features.resume_features(RESUME, reference=ref)
+    got = features.run(resume_f, job_f)
+
+    job_vec = vectors.job_skill_weights(
+        features.posting_text(JOB), JOB['required_skills'], JOB['preferred_skills'] + JOB['mentioned_skills']
+    )
+    resume_vec, _ = vectors.resume_skill_weights(RESUME['skill_instances'], reference=ref)
+    want = kernel.run(resume_vec, job_vec, JOB['required_skills'], 0.0, cluster_map(job_vec, resume_vec))
+    assert got == want
+    assert job_f.required == ['Python', 'SQL']
+
+
+def test_reference_date_makes_weights_reproducible():
+    a = features.resume_features(RESUME, reference=date(2024, 1, 1))
+    b = features.resume_features(RESUME, reference=date(2024, 1, 31))
+    later = features.resume_features(RESUME, reference=date(2025, 1, 1))
+    assert a.vector.to_dict() == b.vector.to_dict()
+    assert a.evidence['Python']['months_since_last_use'] == 7
+    assert later.evidence['Python']['months_since_last_use'] == 19
+
+
+def test_bad_month_is_rejected():
+    with pytest.raises(ValueError):
+        vectors.resume_skill_weights([{'name': 'Python', 'start': '2020-13'}])
@@ -0,0 +1,132 @@
+import asyncio
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+from app.parsing.fetch import FetchError, JobFetcher  # noqa: E402
+
+PAGE = b'<html><body><article><h1>Data Engineer</h1><p>Python and SQL required.</p></article></body></html>'
+
+
+class _Stub(BaseHTTPRequestHandler):
+    hits = {}
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.hits[self.path] = cls.hits.get(self.path, 0) + 1
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            if self.path.startswith('/slow'):
+                time.sleep(0.1)
+            if self.path == '/etag' and self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            if self.path == '/big':
+                body = b'x' * 5000
+            elif self.path == '/missing':
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            else:
+                body = PAGE
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            if self.path == '/etag':
+                self.send_header('ETag', '"v1"')
+                self.send_header('Cache-Control', 'no-cache')
+            elif self.path == '/fresh':
+                self.send_header('Cache-Control', 'max-age=60')
+            else:
+                self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+
+@pytest.fixture(scope='module')
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Stub)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+
+
+def _run(coro_fn):
+    async def wrapper(fetcher):
+        try:
+            return await coro_fn(fetcher)
+        finally:
+            await fetcher.aclose()
+    return wrapper
+
+
+def test_etag_revalidation_skips_extraction(server):
+    extracted = []
+
+    async def extract(html):
+        extracted.append(html)
+        return 'Data Engineer'
+
+    async def scenario(fetcher):
+        first = await fetcher.fetch_text(server + '/etag')
+        second = await fetcher.fetch_text(server + '/etag')
+        return first, second
+
+    fetcher = JobFetcher(extract=extract)
+    assert asyncio.run(_run(scenario)(fetcher)) == ('Data Engineer', 'Data Engineer')
+    assert _Stub.hits['/etag'] == 2
+    assert len(extracted) == 1
+
+
+def test_fresh_responses_are_served_from_cache(server):
+    async def scenario(fetcher):
+        text = await fetcher.fetch_text(server + '/fresh')
+        assert 'Python and SQL' in text
+        return await fetcher.fetch_text(server + '/fresh')
+
+    assert 'Data Engineer' in asyncio.run(_run(scenario)(JobFetcher()))
+    assert _Stub.hits['/fresh'] == 1
+
+
+def test_size_limit_and_errors(server):
+    async def big(fetcher):
+        return await fetcher.fetch_text(server + '/big')
+
+    async def missing(fetcher):
+        return await fetcher.fetch_text(server + '/missing')
+
+    with pytest.raises(FetchError, match='too large'):
+        asyncio.run(_run(big)(JobFetcher(max_bytes=1000)))
+    with pytest.raises(FetchError, match='404'):
+        asyncio.run(_run(missing)(JobFetcher()))
+
+
+def test_per_host_concurrency_limit(server):
+    _Stub.peak = 0
+
+    async def scenario(fetcher):
+        return await asyncio.gather(*(fetcher.fetch_text(f'{server}/slow{i}') for i in range(6)))
+
+    texts = asyncio.run(_run(scenario)(JobFetcher(per_host=2)))
+    assert len(texts) == 6
+    assert _Stub.peak <= 2
@@ -0,0 +1,81 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+from app.scoring import engine  # noqa: E402
+from app.scoring.clusters import cluster_map  # noqa: E402
+from app.scoring.job_index import JobIndex  # noqa: E402
+from app.scoring.skill_vector import SkillVector  # noqa: E402
+
+SKILLS = ['Python', 'SQL', 'Docker', 'Kubernetes', 'Go', 'Rust', 'Scala', 'PyTorch', 'Excel', 'Tableau', 'Java', 'Spark']
+
+
+def _random_vec(rng, n_max=6):
+    picked = rng.sample(SKILLS, rng.randint(0, n_max))
+    return SkillVector.from_dict({s: rng.random() for s in picked})
+
+
+def _brute_force(resume, jobs, k):
+    scored = []
+    for job_id, (vec, required) in jobs.items():
+        if resume.dot(vec) <= 0:
+            continue
+        score, _ = engine.score_pair(resume, vec, required, 0.0, cluster_map(vec, resume))
+        scored.append((job_id, score))
+    scored.sort(key=lambda x: (-x[1], x[0]))
+    return scored[:k]
+
+
+def _build(rng, n):
+    index = JobIndex()
+    jobs = {}
+    for job_id in rng.sample(range(1, 10 * n), n):
+        vec = _random_vec(rng)
+        required = rng.sample(SKILLS, rng.randint(0, 3))
+        jobs[job_id] = (vec, required)
+        index.add(job_id, vec, required)
+    return index, jobs
+
+
+@pytest.mark.parametrize('k', [1, 3, 10])
+def test_top_k_matches_brute_force(k):
+    rng = random.Random(k)
+    index, jobs = _build(rng, 200)
+    for _ in range(20):
+        resume = _random_vec(rng)
+        got = index.top_k(resume, k)
+        want = _brute_force(resume, jobs, k)
+        assert [j for j, _ in got] == [j for j, _ in want]
+        assert [s for _, s in got] == pytest.approx([s for _, s in want])
+
+
+def test_remove_drops_job_from_results():
+    rng = random.Random(0)
+    index, jobs = _build(rng, 50)
+    resume = _random_vec(rng, 8)
+    best = index.top_k(resume, 1)[0][0]
+    index.remove(best)
+    del jobs[best]
+    assert best not in index
+    assert index.top_k(resume, 5) == _brute_force(resume, jobs, 5)
+
+
+def test_empty_resume_returns_nothing():
+    index, _ = _build(random.Random(1), 10)
+    assert index.top_k(SkillVector.from_dict({}), 5) == []
+
+
+def test_exact_scoring_runs_outside_the_lock(monkeypatch):
+    index, _ = _build(random.Random(2), 20)
+    score_pair = engine.score_pair
+
+    def unlocked_score_pair(*args, **kwargs):
+        assert not index._lock.locked()
+        return score_pair(*args, **kwargs)
+
+    monkeypatch.setattr(engine, 'score_pair', unlocked_score_pair)
+    assert index.top_k(SkillVector.from_dict({s: 1.0 for s in SKILLS}), 3)
@@ -24,3 +24,42 @@ def test_parse_job_deterministic():
     assert job1['required_skills'] == job2['required_skills'] == ['Machine Learning']
     assert job1['preferred_skills'] == job2['preferred_skills'] == ['R', 'SQL']
 
+
+def test_parse_job_collects_mentioned_skills():
+    posting = POSTING1 + "- Ship Docker images to Kubernetes\n"
+    job = parse_job(posting)
+    assert job['required_skills'] == ['Python', 'SQL']
+    assert job['mentioned_skills'] == ['Kubernetes']
+
+
+def test_parse_job_fields_and_bullets():
+    posting = (
+        "Senior Platform Engineer\nLocation: Berlin\nVisa sponsorship available\n"
+        "Requirements\n- Python\n* SQL\n5+ years of experience\n"
+        "Nice to have\n- Docker and Kubernetes\n"
+        "Responsibilities\n- Lead the platform\n- Ship Go services\n"
+    )
+    job = parse_job(posting, fetch=False)
+    assert job == {
+        'title': 'Senior Platform Engineer',
+        'level': 'Senior',
+        'years_required': 5,
+        'location': 'Berlin',
+        'work_auth': 'Visa sponsorship available',
+        'required_skills': ['Python', 'SQL'],
+        'preferred_skills': ['Docker and Kubernetes'],
+        'responsibilities': ['Lead the platform', 'Ship Go services'],
+        'mentioned_skills': [],
+    }
+
+
+def test_parse_job_level_and_years_span_lines():
+    posting = (
+        "Engineer\njunior-friendly team\n3\nyears in production\n"
+        "Work authorization required\n\n   \nPreferred\nmid\n- Terraform\n"
+    )
+    job = parse_job(posting, fetch=False)
+    assert (job['level'], job['years_required'], job['location']) == ('Junior', 3, None)
+    assert job['work_auth'] == 'Work authorization required'
+    assert job['required_skills'] == [] and job['preferred_skills'] == ['Terraform']
+    assert parse_job('', fetch=False) == {}
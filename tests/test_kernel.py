@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+from app.scoring import engine, explain, kernel  # noqa: E402
+from app.scoring.clusters import cluster_map  # noqa: E402
+
+
+def _pair():
+    job = {'Python': 0.3, 'SQL': 0.2, 'Docker': 0.2, 'Kubernetes': 0.1, 'Go': 0.1, 'Rust': 0.1}
+    resume = {'Python': 0.8, 'Docker': 0.5, 'Scala': 0.3}
+    return job, resume, ['Python', 'SQL', 'Kubernetes']
+
+
+def test_kernel_matches_thin_views():
+    job, resume, required = _pair()
+    clusters = cluster_map(job, resume)
+    result = kernel.run(resume, job, required, 0.0, clusters)
+    assert (result.score, result.terms) == engine.score_pair(resume, job, required, 0.0, clusters)
+    rendered = explain.render(result, {})
+    assert rendered == explain.build_explanation(
+        job, resume, required, (result.score, result.terms), {}, clusters
+    )
+    assert [g['skill'] for g in rendered['gaps']] == ['SQL', 'Kubernetes', 'Go', 'Rust']
+    assert [b['skill'] for b in rendered['best_fit']] == ['Python', 'Docker']
+    assert result.terms['pcrit'] == pytest.approx(0.5)
+
+
+def test_kernel_cluster_alignment():
+    job, resume, required = _pair()
+    result = kernel.run(resume, job, required, 0.0, cluster_map(job, resume))
+    by_name = {c.name: c for c in result.clusters}
+    ops = explain.render(result, {})['clusters']
+    ops = next(c for c in ops if c['cluster'] == 'Ops/MLOps')
+    assert ops['best_examples'] == ['Docker']
+    assert ops['gaps'] == ['Kubernetes']
+    assert 0.0 < by_name['Ops/MLOps'].align < 1.0
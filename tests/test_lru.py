@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+from app.lru import LRUCache  # noqa: E402
+
+
+def test_lru_evicts_least_recent_within_byte_budget():
+    lru = LRUCache(max_bytes=64)
+    a, b, c = (np.zeros(8, dtype=np.float32) for _ in range(3))  # 32 bytes each
+    lru.put('a', a)
+    lru.put('b', b)
+    assert lru.get('a') is a
+    lru.put('c', c)
+    assert lru.get('b') is None
+    assert lru.get('a') is a and lru.get('c') is c
+    stats = lru.stats()
+    assert stats['bytes'] == 64
+    assert stats['evictions'] == 1
+    assert stats['hits'] == 3 and stats['misses'] == 1
+
+
+def test_lru_skips_values_over_budget():
+    lru = LRUCache(max_bytes=16)
+    lru.put('big', np.zeros(8, dtype=np.float32))
+    assert len(lru) == 0 and lru.bytes == 0
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+os.environ.setdefault('DEV_MODE', '1')
+
+from app.parsing import cache as parse_cache_mod  # noqa: E402
+from app.parsing.cache import ParseCache, job_key, resume_key  # noqa: E402
+
+
+def test_keys_normalize_jobs_and_track_versions(monkeypatch):
+    assert job_key('Engineer\n- Python  \n\n') == job_key('  Engineer\r\n- Python')
+    assert job_key('Engineer') != job_key('Designer')
+    assert resume_key(b'x', 'a.pdf') != resume_key(b'x', 'a.docx')
+    before = resume_key(b'x', 'a.pdf')
+    monkeypatch.setattr(parse_cache_mod, 'PARSER_VERSION', 'next')
+    assert resume_key(b'x', 'a.pdf') != before
+
+
+def test_pdf_keys_track_extraction_settings(monkeypatch):
+    from app.parsing import pdf
+
+    docx, before = resume_key(b'x', 'a.docx'), resume_key(b'x', 'a.pdf')
+    monkeypatch.setattr(pdf, 'LAYOUT', 'none')
+    assert resume_key(b'x', 'a.pdf') != before
+    monkeypatch.setattr(pdf, 'LAYOUT', 'default')
+    monkeypatch.setattr(pdf, 'MAX_PAGES', pdf.MAX_PAGES + 1)
+    assert resume_key(b'x', 'a.pdf') != before
+    assert resume_key(b'x', 'a.docx') == docx
+
+
+def test_sqlite_tier_survives_new_instance(tmp_path):
+    path = str(tmp_path / 'parse.sqlite')
+    first = ParseCache(1024, path)
+    first.put('k', {'title': 'Engineer'})
+    first.close()
+    second = ParseCache(1024, path)
+    assert second.get('k') == {'title': 'Engineer'}
+    assert second.lru.get('k')[1] == {'title': 'Engineer'}
+    assert second.get('missing') is None
+    second.close()
+
+
+def test_get_or_parse_runs_once_for_concurrent_requests():
+    cache = ParseCache(1 << 20, None)
+    calls = []
+
+    async def parse():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {'title': 'Engineer'}
+
+    async def scenario():
+        a, b = await asyncio.gather(cache.get_or_parse('k', parse), cache.get_or_parse('k', parse))
+        assert a is b
+        assert await cache.get_or_parse('k', parse) is a
+
+    asyncio.run(scenario())
+    assert len(calls) == 1
+
+
+def test_failures_are_not_cached():
+    cache = ParseCache(1 << 20, None)
+
+    async def boom():
+        raise ValueError('bad file')
+
+    with pytest.raises(ValueError):
+        asyncio.run(cache.get_or_parse('k', boom))
+    assert cache.get('k') is None
+
+
+def test_api_shares_parsed_payload_between_doc_ids():
+    from app import main
+    from fastapi.testclient import TestClient
+
+    client = TestClient(main.app)
+    headers = {'X-Client-Id': 'cache-test'}
+    a = client.post('/v1/parse/job', json={'source': 'Cache Engineer\n- Python'}, headers=headers).json()
+    b = client.post('/v1/parse/job', json={'source': 'Cache Engineer\n- Python\n'}, headers=headers).json()
+    assert a['doc_id'] != b['doc_id']
+    assert a['data'] == b['data']
+    assert main._STORE.get(a['doc_id']).data is main._STORE.get(b['doc_id']).data
+
+
+def test_cancelled_first_caller_does_not_fail_waiters():
+    cache = ParseCache(1 << 20, None)
+    release = None
+
+    async def parse():
+        await release.wait()
+        return {'title': 'Engineer'}
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        first = asyncio.ensure_future(cache.get_or_parse('k', parse))
+        second = asyncio.ensure_future(cache.get_or_parse('k', parse))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await second == {'title': 'Engineer'}
+        assert first.cancelled()
+        assert cache.get('k') == {'title': 'Engineer'}
+        assert not cache._inflight
+
+    asyncio.run(scenario())
+
+
+def test_entries_expire_and_resumes_persist_only_with_consent(tmp_path):
+    path = str(tmp_path / 'parse.sqlite')
+    now = [1000.0]
+    cache = ParseCache(1 << 20, path, ttl=60, clock=lambda: now[0])
+    cache.put('private', {'skills': ['Python']}, owner='alice', persist=False)
+    cache.put('shared', {'skills': ['SQL']}, owner='bob', persist=True)
+    cache.close()
+
+    reopened = ParseCache(1 << 20, path, ttl=60, clock=lambda: now[0])
+    assert reopened.get('private') is None
+    assert reopened.get('shared') == {'skills': ['SQL']}
+    now[0] += 61
+    assert reopened.get('shared') is None
+    assert len(reopened.lru) == 0
+    reopened.close()
+
+
+def test_release_and_drop_owner_forget_client_keys(tmp_path):
+    cache = ParseCache(1 << 20, str(tmp_path / 'parse.sqlite'))
+    cache.put('a', {'n': 1}, owner='alice', persist=True)
+    cache.put('b', {'n': 2}, owner='alice', persist=False)
+    cache.put('b', {'n': 2}, owner='bob', persist=False)
+    cache.put('job', {'n': 3})
+
+    assert cache.release('b', 'alice') is False
+    assert cache.get('b') == {'n': 2}
+    cache.put('b', {'n': 2}, owner='alice', persist=False)
+    assert cache.drop_owner('alice') == 1
+    assert cache.get('a') is None
+    assert cache.get('b') == {'n': 2}
+    assert cache.drop_owner('bob') == 1
+    assert cache.get('b') is None
+    assert cache.get('job') == {'n': 3}
+    cache.close()
+
+
+def test_api_drops_resume_cache_entries_with_documents():
+    import base64
+
+    from app import main
+    from fastapi.testclient import TestClient
+
+    fixtures = Path(__file__).resolve().parents[1] / 'apps/api/tests/fixtures'
+    data = base64.b64decode((fixtures / 'resume2_docx.txt').read_text())
+    key = resume_key(data, 'resume.docx')
+    client = TestClient(main.app)
+    headers = {'X-Client-Id': 'retention-test', 'Content-Type': 'application/octet-stream'}
+    doc_id = client.post('/v1/parse/resume', content=data, headers=headers).json()['doc_id']
+    assert main.parse_cache.get(key) is not None
+
+    main._STORE.remove(doc_id)
+    assert main.parse_cache.get(key) is None
+
+    client.post('/v1/parse/resume', content=data, headers=headers)
+    assert client.request('DELETE', '/v1/user/data', headers=headers).status_code == 200
+    assert main.parse_cache.get(key) is None
@@ -0,0 +1,56 @@
+import base64
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+from app.parsing import pdf  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parents[1] / 'apps/api/tests/fixtures'
+
+
+@pytest.fixture(scope='module')
+def doc(tmp_path_factory):
+    path = tmp_path_factory.mktemp('pdf') / 'cv.pdf'
+    # four pages of five lines, made with scripts/bench_pdf.py's synthetic_pdf(4, lines=5)
+    path.write_bytes(base64.b64decode((FIXTURES / 'four_pages_pdf.txt').read_text()))
+    return path
+
+
+def test_default_layout_matches_pdfminer(doc):
+    from pdfminer.high_level import extract_text
+
+    result = pdf.extract(io.BytesIO(doc.read_bytes()), max_pages=0, layout='default')
+    assert result.text == extract_text(str(doc))
+    assert result.page_count == 4
+    assert [t.page for t in result.timings] == [0, 1, 2, 3]
+    assert all(t.seconds > 0 and t.chars == len(p) for t, p in zip(result.timings, result.pages))
+
+
+def test_page_cap(doc):
+    result = pdf.extract(str(doc), max_pages=2)
+    assert len(result.pages) == 2 and result.page_count == 4
+    assert 'Page 2 line 1' in result.text and 'Page 3' not in result.text
+
+
+def test_page_parallel_matches_serial(doc):
+    try:
+        parallel = pdf.extract(str(doc), max_pages=0, workers=2)
+    finally:
+        pdf.shutdown()
+    assert parallel.pages == pdf.extract(str(doc), max_pages=0).pages
+    assert [t.page for t in parallel.timings] == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize('layout', ['fast', 'none'])
+def test_fast_layouts_keep_lines(doc, layout):
+    lines = [l.strip() for l in pdf.extract(str(doc), layout=layout).text.splitlines()]
+    assert 'Page 1 line 3: Python, SQL and Machine Learning' in lines
+
+
+def test_unknown_layout_rejected(doc):
+    with pytest.raises(ValueError):
+        pdf.extract(str(doc), layout='fancy')
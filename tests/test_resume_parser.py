@@ -4,7 +4,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
 
-from app.parsing.resume_parser import parse_resume  # noqa: E402
+from app.parsing.resume_parser import parse_resume, parse_resume_lines  # noqa: E402
 
 FIXTURES = Path(__file__).resolve().parents[1] / 'apps/api/tests/fixtures'
 
@@ -28,3 +28,41 @@ def test_parse_docx_resume():
     assert any('Python' in s for s in result['skills'])
     assert any('MSc AI' in ed for ed in result['education'])
 
+
+def test_parse_lines_sections_and_dates():
+    lines = [
+        'Jane Doe', 'BSc Computer Science 2016-2020', 'Education', 'MSc AI at MIT 2021',
+        'Skills: Python, SQL; Docker', 'Experience',
+        'Data Scientist at Acme Corp Jan 2020 - Mar 2022',
+        'Engineer at Initech 2018 – Present',
+        'Built pipelines in Python and Kubernetes',
+        'Certifications: AWS', '  padded line  ', 'Key: value',
+    ]
+    assert parse_resume_lines(lines) == {
+        'experiences': [
+            {'role': 'Data Scientist', 'company': 'Acme Corp',
+             'start': '2020-01', 'end': '2022-03', 'bullets': []},
+            {'role': 'Engineer', 'company': 'Initech',
+             'start': '2018-01', 'end': None, 'bullets': []},
+        ],
+        # skills mentioned outside the skills section are appended
+        'skills': ['Python', 'SQL', 'Docker', 'Kubernetes'],
+        # the line before the heading counts; lines with " at " do not
+        'education': ['BSc Computer Science 2016-2020'],
+        'certifications': ['AWS', 'padded line', 'Key: value'],
+    }
+
+
+def test_parse_lines_headings_without_colon():
+    lines = ['Skills', 'Python, R', 'Projects', 'Master of Data', 'skill',
+             'Intern at Hooli 2016-2017']
+    assert parse_resume_lines(lines) == {
+        'experiences': [{'role': 'Intern', 'company': 'Hooli',
+                         'start': '2016-01', 'end': '2017-01', 'bullets': []}],
+        'skills': ['Python', 'R'],
+        'education': ['Master of Data'],
+        'certifications': [],
+    }
+    assert parse_resume_lines([]) == {
+        'experiences': [], 'skills': [], 'education': [], 'certifications': []
+    }
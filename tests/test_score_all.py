@@ -0,0 +1,57 @@
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api/scripts'))
+
+import score_all  # noqa: E402
+from app.scoring import batch  # noqa: E402
+from app.scoring.skill_vector import SkillVector  # noqa: E402
+
+SKILLS = ['Python', 'SQL', 'Docker', 'Kubernetes', 'Go', 'Rust', 'Scala', 'PyTorch', 'Excel', 'Tableau']
+PARAMS = {'delta': 0.35, 'eta': 0.15, 'eps': 0.05}
+
+
+def _corpus(seed, n):
+    rng = random.Random(seed)
+    vecs = [
+        SkillVector.from_dict({s: rng.random() for s in rng.sample(SKILLS, rng.randint(1, 5))})
+        for _ in range(n)
+    ]
+    required = [rng.sample(SKILLS, rng.randint(0, 2)) for _ in range(n)]
+    return vecs, required
+
+
+def test_block_shape_respects_budget():
+    rows, cols = score_all.block_shape(50_000, 5_000, 64)
+    assert cols == 5_000
+    assert rows * cols * score_all._BYTES_PER_CELL <= 64 * 1024 * 1024
+    assert score_all.block_shape(10, 10, 0) == (1, 1)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_blockwise_scores_match_single_block(workers):
+    resumes, _ = _corpus(1, 23)
+    jobs, required = _corpus(2, 17)
+    want = batch.score_many(resumes, jobs, required, **PARAMS).score
+    got = np.zeros_like(want)
+    # tiny budget forces many row and column blocks
+    for lo, block in score_all.score_all(
+        resumes, jobs, required, params=PARAMS, memory_mb=0.0003, workers=workers
+    ):
+        got[lo:lo + block.shape[0]] = block
+    assert got == pytest.approx(want, abs=1e-3)
+
+    top = {}
+    for lo, (scores, cols) in score_all.score_all(
+        resumes, jobs, required, params=PARAMS, memory_mb=0.0003, top_k=3
+    ):
+        for i in range(scores.shape[0]):
+            top[lo + i] = list(cols[i])
+    for row, cols in top.items():
+        order = sorted(range(len(jobs)), key=lambda c: (-want[row, c], c))
+        assert [want[row, c] for c in cols] == pytest.approx([want[row, c] for c in order[:3]])
@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+from app.taxonomy.automaton import SkillAutomaton, get_automaton  # noqa: E402
+from app.taxonomy.index import get_index  # noqa: E402
+
+
+def test_scan_word_boundaries_and_case():
+    ac = SkillAutomaton({'python': 1, 'sql': 2, 'c++': 3, 'go': 4}, ['', 'Python', 'SQL', 'C++', 'Go'])
+    text = 'PYTHON, NoSQL and c++; Pythonic. SQL! Go or go'
+    hits = ac.scan(text)
+    assert [(sid, text[s:e]) for sid, s, e in hits] == [
+        (1, 'PYTHON'),
+        (3, 'c++'),
+        (2, 'SQL'),
+        (4, 'Go'),
+    ]
+
+
+def test_scan_prefers_leftmost_longest():
+    ac = SkillAutomaton({'machine learning': 1, 'learning': 2, 'deep learning': 3})
+    hits = ac.scan('machine learning and deep learning')
+    assert [sid for sid, _, _ in hits] == [1, 3]
+
+
+def test_bundled_automaton_resolves_aliases():
+    idx = get_index()
+    ids = get_automaton().skill_ids('Shipped k8s clusters and NLP models with Docker')
+    assert [idx.names[i] for i in ids] == [
+        'Kubernetes',
+        'Natural Language Processing',
+        'Docker',
+    ]
+
+
+def test_short_aliases_need_exact_spelling_and_technical_context():
+    idx = get_index()
+    ac = get_automaton()
+
+    def names(text):
+        return [idx.names[i] for i in ac.skill_ids(text)]
+
+    assert names('Go to market strategy lead') == []
+    assert names('Worked at Go-Jek') == []
+    assert names('Worked at Go-Jek on Kubernetes') == ['Kubernetes']
+    assert names('CV') == []
+    assert names('Please find my cv attached') == []
+    assert names('Built ML and CV models in Python') == [
+        'Machine Learning',
+        'Computer Vision',
+        'Python',
+    ]
+    assert names('Services in Go, Docker\nGo live in May') == ['Go', 'Docker']
+    assert names('Services in GO and go with Docker') == ['Docker']
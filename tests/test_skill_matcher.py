@@ -17,8 +17,12 @@ def fake_embed(text: str):
     return vectors.get(text.lower(), [0, 0])
 
 
+def fake_embeddings(texts):
+    return [fake_embed(t) for t in texts]
+
+
 def test_skill_matcher_exact_alias_embedding():
-    matcher = SkillMatcher(embedding_fn=fake_embed)
+    matcher = SkillMatcher(embeddings_fn=fake_embeddings)
     cands = [
         {'text': 'Python', 'snippet': 'Python snippet'},
         {'text': 'ml', 'snippet': 'ml snippet', 'start': '2021-01', 'end': '2022-01'},
@@ -35,3 +39,30 @@ def test_skill_matcher_exact_alias_embedding():
     assert 0.72 <= dl_entry['confidence'] <= 1.0
     assert all(r['evidence']['snippet'] != 'randomstuff' for r in res)
 
+
+def test_skill_matcher_embeds_taxonomy_once_in_batches():
+    calls = []
+
+    def counting_embeddings(texts):
+        calls.append(list(texts))
+        return fake_embeddings(texts)
+
+    matcher = SkillMatcher(embeddings_fn=counting_embeddings)
+    matcher.match([{'text': 'deeplearning'}], 'resume')
+    assert calls == [matcher.taxonomy.names, ['deeplearning']]
+    res = matcher.match([{'text': 'deeplearning'}, {'text': 'randomstuff'}], 'job')
+    assert calls[2:] == [['deeplearning', 'randomstuff']]
+    assert [r['name'] for r in res] == ['Deep Learning']
+
+
+def test_skill_matcher_uses_taxonomy_mentions_before_embeddings():
+    calls = []
+
+    def counting_embeddings(texts):
+        calls.append(texts)
+        return fake_embeddings(texts)
+
+    matcher = SkillMatcher(embeddings_fn=counting_embeddings)
+    res = matcher.match([{'text': '5+ years of Python and SQL'}], 'job')
+    assert [r['name'] for r in res] == ['Python', 'SQL']
+    assert calls == []
@@ -0,0 +1,55 @@
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+from app.scoring.skill_vector import SkillVector, SkillVocabulary  # noqa: E402
+
+
+def test_vector_is_sorted_and_round_trips():
+    vocab = SkillVocabulary()
+    vocab.intern('SQL')
+    vec = SkillVector.from_dict({'Python': 0.6, 'SQL': 0.8}, vocab)
+    assert list(vec.ids) == sorted(vec.ids)
+    assert vec.ids.typecode == 'i' and vec.weights.typecode == 'f'
+    assert vec.to_dict(vocab) == pytest.approx({'Python': 0.6, 'SQL': 0.8})
+    assert vec.norm == pytest.approx(1.0)
+    assert vec.get(vocab.id_of('Docker')) == 0.0
+
+
+def test_merge_join_dot_and_cosine():
+    vocab = SkillVocabulary()
+    a = SkillVector.from_dict({'Python': 1.0, 'SQL': 2.0, 'Go': 3.0}, vocab)
+    b = SkillVector.from_dict({'SQL': 4.0, 'Rust': 1.0, 'Go': 1.0}, vocab)
+    assert a.dot(b) == pytest.approx(11.0)
+    assert a.cosine(b) == pytest.approx(11.0 / (math.sqrt(14) * math.sqrt(18)))
+    assert a.cosine(SkillVector.from_dict({}, vocab)) == 0.0
+
+
+def test_vocabulary_tracks_clusters():
+    vocab = SkillVocabulary()
+    assert vocab.cluster_name(vocab.intern('python')) == 'Programming'
+    assert vocab.cluster_name(vocab.intern('Build systems')) == 'Other'
+    assert vocab.intern('python') == vocab.intern('Python')
+    assert vocab.name(vocab.intern('python')) == 'Python'
+
+
+def test_unknown_skills_hash_into_a_fixed_id_space():
+    vocab = SkillVocabulary(buckets=64)
+    size = len(vocab)
+    ids = [vocab.intern(f'Free text skill {i}') for i in range(1000)]
+    assert len(vocab) == size
+    assert all(len(vocab.taxonomy) <= sid < size for sid in ids)
+    assert vocab.intern('Free text skill 1') == ids[1] == SkillVocabulary(buckets=64).intern('Free text skill 1')
+    assert vocab.name(ids[0]) is None
+    assert list(vocab.cluster_array([vocab.intern('SQL'), ids[0]])) == [
+        vocab.cluster(vocab.intern('SQL')),
+        len(vocab.cluster_names) - 1,
+    ]
+    labels = {}
+    vec = SkillVector.from_dict({'Build systems': 1.0, 'sql': 2.0}, vocab, labels)
+    assert vec.to_dict(vocab, labels) == {'Build systems': 1.0, 'sql': 2.0}
+    assert vec.to_dict(vocab) == {vocab.label(vocab.intern('Build systems')): 1.0, 'SQL': 2.0}
@@ -0,0 +1,65 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+from app.store import DocumentStore  # noqa: E402
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_expiry_is_lazy_and_swept():
+    clock = _Clock()
+    removed = []
+    store = DocumentStore(on_remove=lambda i, d: removed.append((i, d.kind)), clock=clock)
+    store.add(1, 'resume', {'skills': []}, 'alice')
+    store.add(2, 'job', {'title': 'Engineer'}, 'alice')
+    store.add(3, 'match', {}, 'bob')
+    store.expire([1, 2], 10)
+    store.expire([1], 60)  # a later deadline does not postpone expiry
+    store.expire([2], 5)
+    assert store.get(1, 'resume') is not None and store.get(1, 'job') is None
+
+    clock.now += 6
+    assert store.get(2) is None and 2 not in store
+    assert len(store) == 3
+    assert store.sweep() == 1 and removed == [(2, 'job')]
+
+    clock.now += 5
+    assert store.sweep() == 1 and removed[-1] == (1, 'resume')
+    assert store.get(3) is not None
+    store.close()
+
+
+def test_remove_owner_and_remove():
+    removed = []
+    store = DocumentStore(on_remove=lambda i, d: removed.append(i))
+    for i, owner in enumerate(['a', 'b', 'a']):
+        store.add(i, 'job', {}, owner)
+    assert store.remove_owner('a') == 2
+    assert sorted(removed) == [0, 2] and len(store) == 1
+    assert store.remove(1).owner == 'b' and store.remove(1) is None
+
+
+def test_single_sweeper_thread_under_load():
+    removed = []
+    store = DocumentStore(on_remove=lambda i, d: removed.append(i))
+    before = threading.active_count()
+    for i in range(2000):
+        store.add(i, 'match', {}, 'client')
+        store.expire([i], 0.05)
+    assert threading.active_count() <= before + 1
+    deadline = time.monotonic() + 5
+    while len(store) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(store) == 0 and len(removed) == 2000
+    store.close()
+    assert threading.active_count() <= before
@@ -0,0 +1,73 @@
+import json
+import sys
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+from app.scoring.clusters import cluster_map  # noqa: E402
+from app.taxonomy import index as taxonomy_index  # noqa: E402
+
+YAML = b"""
+Programming:
+  - name: Python
+    aliases: [py]
+  - name: SQL
+Ops:
+  - name: Docker
+"""
+
+
+def test_index_interns_names_and_aliases(tmp_path):
+    path = tmp_path / 'skills.yaml'
+    path.write_bytes(YAML)
+    idx = taxonomy_index.load_index(path, tmp_path / 'cache')
+    assert idx.names == ['Python', 'SQL', 'Docker']
+    assert idx.lookup('PY') == idx.lookup('python') == 0
+    assert idx.cluster_of('docker') == 'Ops'
+    assert idx.cluster_of('Fortran') == 'Other'
+
+
+def test_snapshot_reused_until_yaml_changes(tmp_path, monkeypatch):
+    path = tmp_path / 'skills.yaml'
+    path.write_bytes(YAML)
+    cache_dir = tmp_path / 'cache'
+    taxonomy_index.load_index(path, cache_dir)
+    assert len(list(cache_dir.glob('taxonomy-*.json'))) == 1
+
+    monkeypatch.setattr(yaml, 'safe_load', lambda *a: 1 / 0)
+    assert taxonomy_index.load_index(path, cache_dir).names == ['Python', 'SQL', 'Docker']
+    monkeypatch.undo()
+
+    path.write_bytes(YAML + b"  - name: Terraform\n")
+    idx = taxonomy_index.load_index(path, cache_dir)
+    assert idx.names[-1] == 'Terraform'
+    assert len(list(cache_dir.glob('taxonomy-*.json'))) == 1
+
+
+def test_snapshot_is_plain_validated_data(tmp_path):
+    path = tmp_path / 'skills.yaml'
+    path.write_bytes(YAML)
+    cache_dir = tmp_path / 'cache'
+    taxonomy_index.load_index(path, cache_dir)
+    (snapshot,) = cache_dir.glob('taxonomy-*.json')
+    data = json.loads(snapshot.read_text())
+    assert data['names'] == ['Python', 'SQL', 'Docker']
+
+    # a tampered snapshot is rebuilt from the YAML, never trusted
+    data['skill_cluster'] = [0, 0, 99]
+    snapshot.write_text(json.dumps(data))
+    assert taxonomy_index.load_index(path, cache_dir).cluster_of('docker') == 'Ops'
+    snapshot.write_bytes(b'\x80\x04not json')
+    assert taxonomy_index.load_index(path, cache_dir).names[-1] == 'Docker'
+
+
+def test_bundled_index_matches_yaml():
+    idx = taxonomy_index.get_index()
+    data = yaml.safe_load(taxonomy_index.SKILLS_PATH.read_text())
+    assert len(idx) == sum(len(v) for v in data.values())
+    clusters = cluster_map({'Python': 0.5, 'Build systems': 0.5}, {'python': 1.0})
+    assert clusters['Programming']['job'].to_dict() == {'Python': 0.5}
+    assert clusters['Programming']['resume'].to_dict() == {'Python': 1.0}
+    assert clusters['Other']['weight'] == 0.5
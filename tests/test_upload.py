@@ -0,0 +1,98 @@
+import asyncio
+import base64
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+os.environ.setdefault('DEV_MODE', '1')
+
+from app.parsing.cache import resume_key  # noqa: E402
+from app.parsing.upload import UploadError, receive_upload, sniff  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parents[1] / 'apps/api/tests/fixtures'
+
+
+def _load(name: str) -> bytes:
+    return base64.b64decode((FIXTURES / name).read_text())
+
+
+class _Request:
+    def __init__(self, chunks, content_type='application/octet-stream'):
+        self.headers = {'content-type': content_type}
+        self._chunks = chunks
+        self.consumed = 0
+
+    async def stream(self):
+        for chunk in self._chunks:
+            self.consumed += 1
+            yield chunk
+
+
+def _chunks(data: bytes, size: int = 100):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_sniff_uses_magic_bytes():
+    assert sniff(b'%PDF-1.4\n') == 'pdf'
+    assert sniff(b'\n\n%PDF-1.7') == 'pdf'
+    assert sniff(b'PK\x03\x04rest') == 'docx'
+    assert sniff(b'{\\rtf1') is None
+
+
+def test_raw_upload_is_spooled_and_keyed_like_bytes(tmp_path):
+    data = _load('resume2_docx.txt')
+    upload = asyncio.run(receive_upload(_Request(_chunks(data)), tmp_dir=str(tmp_path)))
+    assert upload.format == 'docx' and upload.filename == 'resume.docx'
+    assert upload.size == len(data)
+    assert Path(upload.path).read_bytes() == data
+    assert upload.key == resume_key(data, 'anything.docx')
+    upload.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_oversized_stream_stops_reading_and_cleans_up(tmp_path):
+    request = _Request(iter(lambda: b'%PDF-' + b'x' * 995, None))
+    with pytest.raises(UploadError, match='too large'):
+        asyncio.run(receive_upload(request, max_bytes=10_000, tmp_dir=str(tmp_path)))
+    assert request.consumed == 11
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_rejects_unsupported_and_fake_docx(tmp_path):
+    with pytest.raises(UploadError, match='Unsupported'):
+        asyncio.run(receive_upload(_Request([b'plain text resume']), tmp_dir=str(tmp_path)))
+    with pytest.raises(UploadError, match='Unsupported'):
+        asyncio.run(receive_upload(_Request([b'PK\x03\x04' + b'\0' * 2000]), tmp_dir=str(tmp_path)))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_multipart_upload_through_api():
+    from app.main import app
+    from fastapi.testclient import TestClient
+
+    client = TestClient(app)
+    headers = {'X-Client-Id': 'test'}
+    # the client-supplied name and type are ignored; the format is sniffed
+    res = client.post(
+        '/v1/parse/resume',
+        files={'file': ('cv.pdf', _load('resume2_docx.txt'), 'application/pdf')},
+        data={'note': 'hello'},
+        headers=headers,
+    )
+    assert res.status_code == 200
+    assert any('MSc AI' in ed for ed in res.json()['data']['education'])
+
+    res = client.post('/v1/parse/resume', files={'note': (None, 'no file')}, headers=headers)
+    assert res.status_code == 400
+
+    res = client.post(
+        '/v1/parse/resume',
+        content=b'%PDF-' + b'x' * 2_000_000,
+        headers={**headers, 'Content-Type': 'application/pdf'},
+    )
+    assert res.status_code == 400
+    assert res.json()['detail'] == 'File too large'
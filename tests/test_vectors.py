@@ -32,3 +32,18 @@ def test_resume_weights_decay(monkeypatch):
     assert ev['SQL']['months_since_last_use'] == 7
     assert w['Python'] > w['SQL']
 
+
+def test_term_counts_multiword_and_symbols():
+    text = 'Machine learning, C++ and machine-learning; C++ again. SQLite'
+    counts = vectors.term_counts(text, ['Machine Learning', 'C++', 'SQL', 'R'])
+    assert counts == [2, 2, 0, 0]
+
+
+def test_job_weights_idf_downweights_common_terms():
+    posting = 'Python and SQL. Python and SQL.'
+    plain = vectors.job_skill_weights(posting, [], ['Python', 'SQL'])
+    assert plain['Python'] == plain['SQL']
+    idf = vectors.IdfTable.fit(['python sql', 'python', 'python go'], ['Python', 'SQL'])
+    weighted = vectors.job_skill_weights(posting, [], ['Python', 'SQL'], idf=idf)
+    assert abs(sum(weighted.values()) - 1.0) < 1e-6
+    assert weighted['SQL'] > weighted['Python']
@@ -0,0 +1,72 @@
+import asyncio
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'apps/api'))
+
+os.environ.setdefault('DEV_MODE', '1')
+
+from app import workers  # noqa: E402
+from app.main import app  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+def test_bounded_pool_rejects_when_full():
+    pool = workers.BoundedPool('test', lambda: ThreadPoolExecutor(max_workers=1), limit=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(pool.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        assert pool.stats()['admitted'] == 1
+        with pytest.raises(workers.Overloaded):
+            await pool.run(sum, [1, 2])
+        release.set()
+        assert await first is True
+        assert await pool.run(sum, [1, 2]) == 3
+
+    asyncio.run(scenario())
+    assert pool.stats() == {'admitted': 0, 'limit': 1, 'rejected': 1}
+    pool.shutdown()
+
+
+def test_api_returns_503_when_parse_queue_full(monkeypatch):
+    client = TestClient(app)
+    monkeypatch.setattr(workers.parse_pool, 'limit', 0)
+    res = client.post('/v1/parse/job', json={'source': 'Engineer'}, headers={'X-Client-Id': 't'})
+    assert res.status_code == 503
+    assert res.headers['retry-after'] == '1'
+    health = client.get('/healthz').json()
+    assert health['queues']['parse']['rejected'] >= 1
+
+
+def test_crashed_worker_is_not_reported_as_overload():
+    from concurrent.futures import ProcessPoolExecutor
+
+    pool = workers.BoundedPool('test', lambda: ProcessPoolExecutor(max_workers=1), limit=2)
+
+    async def scenario():
+        with pytest.raises(workers.WorkerCrashed):
+            await pool.run(os._exit, 1)
+        # the broken pool was replaced
+        assert await pool.run(sum, [1, 2]) == 3
+
+    asyncio.run(scenario())
+    assert pool.stats() == {'admitted': 0, 'limit': 2, 'rejected': 0}
+    pool.shutdown()
+
+
+def test_api_returns_422_when_parser_crashes(monkeypatch):
+    async def crash(*args, **kwargs):
+        raise workers.WorkerCrashed('parse worker crashed')
+
+    client = TestClient(app)
+    monkeypatch.setattr(workers.parse_pool, 'run', crash)
+    res = client.post('/v1/parse/job', json={'source': 'Crash me'}, headers={'X-Client-Id': 't'})
+    assert res.status_code == 422
+    assert 'retry-after' not in res.headers